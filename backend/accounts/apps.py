@@ -8,5 +8,7 @@ class AccountsConfig(AppConfig):
     verbose_name = 'User Accounts'
     
     def ready(self):
-        """Import signals when app is ready."""
-        import accounts.signals  # noqa
\ No newline at end of file
+        """Import signals and warm the email template cache when app is ready."""
+        import accounts.signals  # noqa
+        from .email_rendering import warm_email_templates
+        warm_email_templates()
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""
+JWT authentication without a user query per request.
+
+simplejwt's JWTAuthentication loads the user from auth_user on every
+request. CachedJWTAuthentication reads it from a per-process dict
+(AUTH_USER_LOCAL_CACHE_TTL seconds), then the shared cache
+(AUTH_USER_CACHE_TTL seconds), and only then the database.
+
+Cached users carry every field except password and last_login, which are
+deferred and loaded on first access (e.g. by check_password).
+
+Tokens carry the user's token_version (simplejwt's CHECK_REVOKE_TOKEN,
+see accounts/tokens.py), so changing or resetting the password revokes
+every token issued before it, while rehashing it on login does not.
+Saving or deleting a user and logging out evict the user's cache entries; copies in other processes'
+local caches expire within AUTH_USER_LOCAL_CACHE_TTL.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# Fields kept in the cache; token_version is the version tokens are checked against
+_DEFERRED_FIELDS = {'password', 'last_login'}
+CACHED_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields if field.attname not in _DEFERRED_FIELDS
+)
+
+# Defaults for the AUTH_USER_CACHE_TTL and AUTH_USER_LOCAL_CACHE_TTL settings
+DEFAULT_CACHE_TTL = 300
+DEFAULT_LOCAL_CACHE_TTL = 5
+
+# The local cache is dropped wholesale when it grows past this
+LOCAL_CACHE_MAX_ENTRIES = 10000
+
+_local_cache = {}
+_local_lock = threading.Lock()
+
+
+def _cache_key(user_id):
+    # Bump the prefix when the entry layout (version or CACHED_FIELDS) changes
+    return f'auth_user:v2:{user_id}'
+
+
+def _get_local(user_id):
+    entry = _local_cache.get(user_id)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _set_local(user_id, entry):
+    ttl = getattr(settings, 'AUTH_USER_LOCAL_CACHE_TTL', DEFAULT_LOCAL_CACHE_TTL)
+    if ttl <= 0:
+        return
+    with _local_lock:
+        if len(_local_cache) >= LOCAL_CACHE_MAX_ENTRIES:
+            _local_cache.clear()
+        _local_cache[user_id] = (time.monotonic() + ttl, entry)
+
+
+def _load_entry(user_id):
+    """Return (token version, field values) for an active user, or None."""
+    user = User.objects.filter(pk=user_id, is_active=True).only(*CACHED_FIELDS).first()
+    if user is None:
+        return None
+    entry = (
+        user.token_version,
+        tuple(getattr(user, attname) for attname in CACHED_FIELDS),
+    )
+    try:
+        cache.set(_cache_key(user_id), entry, getattr(settings, 'AUTH_USER_CACHE_TTL', DEFAULT_CACHE_TTL))
+    except Exception as e:
+        logger.warning(f"Could not cache user {user_id}: {str(e)}")
+    return entry
+
+
+def get_cached_user(user_id, token_version=None):
+    """
+    Return the active user for a token's user id and version, or None.
+
+    A token_version of None skips the version check (CHECK_REVOKE_TOKEN
+    off). Falls back to the database when the cached entry holds another
+    version, so a token issued after a password change is not rejected
+    because of a stale entry.
+    """
+    def matches(entry):
+        return token_version is None or entry[0] == token_version
+
+    # Tokens hold the id as a string
+    user_id = str(user_id)
+    entry = _get_local(user_id)
+    if entry is None or not matches(entry):
+        try:
+            entry = cache.get(_cache_key(user_id))
+        except Exception as e:
+            # Authenticate from the database while the shared cache is down
+            logger.warning(f"User cache unavailable for user {user_id}: {str(e)}")
+            entry = None
+        if entry is None or not matches(entry):
+            entry = _load_entry(user_id)
+            if entry is None:
+                return None
+        _set_local(user_id, entry)
+    if not matches(entry):
+        return None
+    return User.from_db(DEFAULT_DB_ALIAS, CACHED_FIELDS, entry[1])
+
+
+def invalidate_cached_user(user_id):
+    """Evict a user from the shared cache and this process's local cache."""
+    try:
+        cache.delete(_cache_key(user_id))
+    except Exception as e:
+        # A cache outage must never block user writes or logouts
+        logger.warning(f"Could not invalidate cached user {user_id}: {str(e)}")
+    with _local_lock:
+        _local_cache.pop(str(user_id), None)
+
+
+def user_for_token(validated_token):
+    """Return the active user a validated access token belongs to, or None."""
+    try:
+        user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+    except KeyError:
+        return None
+    token_version = None
+    if jwt_settings.CHECK_REVOKE_TOKEN:
+        token_version = validated_token.get(jwt_settings.REVOKE_TOKEN_CLAIM)
+        if token_version is None:
+            # Issued before revocation was enabled; cannot be revoked
+            return None
+    return get_cached_user(user_id, token_version)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that resolves users through get_cached_user."""
+
+    def get_user(self, validated_token):
+        if jwt_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        user = user_for_token(validated_token)
+        if user is None:
+            raise AuthenticationFailed(
+                _('User not found or inactive, or the password has changed.'), code='user_not_found'
+            )
+        return user
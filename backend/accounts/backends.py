@@ -1,18 +1,23 @@
-from django.contrib.auth.backends import BaseBackend
+from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+
+from .hashing import hash_password
 
 User = get_user_model()
 
 
-class EmailAuthenticationBackend(BaseBackend):
+class EmailAuthenticationBackend(ModelBackend):
     """
     Custom authentication backend that allows users to log in using their email address.
     
     This backend supports:
-    - Case-insensitive email authentication
+    - Case-insensitive email authentication (indexed lower(email) lookup)
     - Active user checking
     - Email normalization
+    
+    Permission checks are inherited from ModelBackend, so it does not need
+    to be listed as a fallback (which made every failed login query and
+    hash twice).
     """
     
     def authenticate(self, request, username=None, password=None, **kwargs):
@@ -28,49 +33,21 @@ class EmailAuthenticationBackend(BaseBackend):
         Returns:
             User instance if authentication is successful, None otherwise
         """
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
         if username is None or password is None:
             return None
         
         try:
-            # Normalize email to lowercase for case-insensitive lookup
-            email = username.lower().strip()
-            
-            # Find user by email (case-insensitive)
-            user = User.objects.get(Q(email__iexact=email))
-            
-            # Check if the password is correct
-            if user.check_password(password) and self.user_can_authenticate(user):
-                return user
-                
+            user = User.objects.by_email(username).get()
         except User.DoesNotExist:
             # Run the default password hasher once to reduce the timing
             # difference between an existing and a non-existing user
-            User().set_password(password)
+            hash_password(password)
             return None
         
-        return None
-    
-    def user_can_authenticate(self, user):
-        """
-        Reject users with is_active=False. Custom user models that don't have
-        an 'is_active' field are allowed.
-        """
-        is_active = getattr(user, 'is_active', None)
-        return is_active or is_active is None
-    
-    def get_user(self, user_id):
-        """
-        Get a user instance by user ID.
+        # check_password rehashes outdated hashes
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
         
-        Args:
-            user_id: The user's primary key
-            
-        Returns:
-            User instance if found, None otherwise
-        """
-        try:
-            user = User.objects.get(pk=user_id)
-        except User.DoesNotExist:
-            return None
-        
-        return user if self.user_can_authenticate(user) else None
\ No newline at end of file
+        return None
@@ -0,0 +1,82 @@
+"""
+Email template rendering from compiled, cached templates.
+
+Every email has a plain text and an HTML template (``<name>.txt`` and
+``<name>.html``). render_to_string looks both up through the template
+loaders and builds a fresh Context on each call. EmailRenderer instead
+keeps the two compiled Template objects and a single Context, pushing
+each recipient's values onto it, which is what makes rendering the same
+email for thousands of users (render_many) cheap.
+
+Templates come from the cached loader configured in settings.TEMPLATES,
+which is warmed with EMAIL_TEMPLATES when the accounts app loads, so
+the first email a worker sends does not pay for reading and compiling
+the templates. The benchmark_email_rendering management command
+compares the approaches per template.
+"""
+
+import logging
+
+from django.template import Context, TemplateDoesNotExist, engines
+
+logger = logging.getLogger(__name__)
+
+# Emails sent by the app, as template paths without extension
+EMAIL_TEMPLATES = (
+    'emails/welcome',
+    'emails/password_reset',
+    'emails/password_changed',
+    'emails/email_verification',
+    'emails/deadline_digest',
+)
+
+
+def _compiled(template_name):
+    # The backend's get_template goes through the cached loader; keep the
+    # engine-level Template so it can be rendered with our own Context
+    return engines['django'].get_template(template_name).template
+
+
+class EmailRenderer:
+    """Render one email's text and HTML templates for many contexts."""
+
+    def __init__(self, name):
+        self.name = name
+        self.text_template = _compiled(f'{name}.txt')
+        self.html_template = _compiled(f'{name}.html')
+        self._context = Context(autoescape=engines['django'].engine.autoescape)
+
+    def render(self, context):
+        """
+        Render the email for one context.
+
+        Returns:
+            Tuple of (plain text body, HTML body)
+        """
+        with self._context.push(context):
+            return self.text_template.render(self._context), self.html_template.render(self._context)
+
+
+def render_email(name, context):
+    """Render one email; see EmailRenderer.render."""
+    return EmailRenderer(name).render(context)
+
+
+def render_many(name, contexts):
+    """
+    Render the same email for many contexts (e.g. one per recipient).
+
+    Returns:
+        List of (plain text body, HTML body) tuples in context order
+    """
+    renderer = EmailRenderer(name)
+    return [renderer.render(context) for context in contexts]
+
+
+def warm_email_templates():
+    """Load and compile every email template into the cached loader."""
+    for name in EMAIL_TEMPLATES:
+        try:
+            EmailRenderer(name)
+        except TemplateDoesNotExist as e:
+            logger.warning(f"Email template missing: {e}")
@@ -0,0 +1,64 @@
+"""
+Password hashing on a per-process thread pool.
+
+PBKDF2, bcrypt and argon2 release the GIL while hashing, so running them
+on a small pool caps how many hashes one worker computes at a time
+(PASSWORD_HASH_THREADS) and keeps a burst of logins from taking every
+CPU the worker's other requests need. With PASSWORD_HASH_THREADS = 0
+hashing runs inline.
+
+The hasher used for new hashes is the first entry of PASSWORD_HASHERS
+(chosen with the PASSWORD_HASHER setting); passwords stored with another
+hasher or work factor are rehashed on the next successful login.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+# Default for the PASSWORD_HASH_THREADS setting
+DEFAULT_HASH_THREADS = 2
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Return this process's pool, creating it after a fork (e.g. gunicorn --preload)."""
+    global _executor, _executor_pid
+    threads = getattr(settings, 'PASSWORD_HASH_THREADS', DEFAULT_HASH_THREADS)
+    if threads <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='password-hash')
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _run(func, *args):
+    executor = _get_executor()
+    if executor is None:
+        return func(*args)
+    return executor.submit(func, *args).result()
+
+
+def hash_password(raw_password):
+    """Hash a password with the preferred hasher."""
+    return _run(make_password, raw_password)
+
+
+def verify_password(raw_password, encoded):
+    """
+    Check a password against a stored hash.
+
+    Returns:
+        Tuple of (whether it matches, whether the hash should be upgraded)
+    """
+    outdated = []
+    valid = _run(check_password, raw_password, encoded, outdated.append)
+    return valid, bool(outdated)
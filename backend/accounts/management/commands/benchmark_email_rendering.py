@@ -0,0 +1,88 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+
+from accounts.email_rendering import EMAIL_TEMPLATES, render_email, render_many
+
+# Context values each email template expects, besides the user
+SAMPLE_CONTEXTS = {
+    'emails/welcome': {'site_name': 'Track', 'site_url': 'https://track.example.com'},
+    'emails/password_reset': {
+        'site_name': 'Track',
+        'reset_url': 'https://track.example.com/auth/reset-password?token=abc',
+        'reset_token': 'abc',
+        'expiry_hours': 1,
+    },
+    'emails/password_changed': {'site_name': 'Track', 'support_email': 'support@track.example.com'},
+    'emails/email_verification': {
+        'site_name': 'Track',
+        'verification_url': 'https://track.example.com/auth/verify-email?token=abc',
+        'verification_token': 'abc',
+    },
+    'emails/deadline_digest': {
+        'site_name': 'Track',
+        'site_url': 'https://track.example.com',
+        'date': '2025-01-15',
+        'overdue': 1,
+        'due_today': 2,
+        'due_soon': 0,
+        'tasks': [
+            {'title': f'Task {i}', 'end_date': '2025-01-15', 'priority': 'medium', 'overdue': i == 0}
+            for i in range(3)
+        ],
+        'more': 0,
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure email renders per second for each email template: two '
+        'render_to_string calls per mail, render_email, and render_many for '
+        'the same template sent to many users. Renders only, nothing is sent.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--template',
+            action='append',
+            choices=EMAIL_TEMPLATES,
+            help='Template to benchmark (repeatable, default all)'
+        )
+        parser.add_argument(
+            '--mails',
+            type=int,
+            default=2000,
+            help='Mails rendered per approach and template'
+        )
+
+    def handle(self, *args, **options):
+        if options['mails'] < 1:
+            raise CommandError('--mails must be at least 1.')
+
+        User = get_user_model()
+        users = [
+            User(id=i, email=f'user{i}@example.com', first_name=f'User {i}')
+            for i in range(options['mails'])
+        ]
+
+        self.stdout.write(f"{'template':<28} {'approach':<16} {'mails/s':>10} {'us/mail':>9}")
+        for name in options['template'] or EMAIL_TEMPLATES:
+            contexts = [{**SAMPLE_CONTEXTS[name], 'user': user} for user in users]
+            approaches = [
+                ('render_to_string', lambda: [
+                    (render_to_string(f'{name}.txt', c), render_to_string(f'{name}.html', c)) for c in contexts
+                ]),
+                ('render_email', lambda: [render_email(name, c) for c in contexts]),
+                ('render_many', lambda: render_many(name, contexts)),
+            ]
+            for label, run in approaches:
+                started = time.perf_counter()
+                run()
+                duration = time.perf_counter() - started
+                self.stdout.write(
+                    f"{name:<28} {label:<16} {len(contexts) / duration:>10.0f} "
+                    f"{duration / len(contexts) * 1e6:>9.1f}"
+                )
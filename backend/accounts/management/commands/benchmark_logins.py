@@ -0,0 +1,101 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure logins per second in this process (one worker) for successful, '
+        'wrong-password and unknown-email logins, using the configured '
+        'PASSWORD_HASHER and PASSWORD_HASH_THREADS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--email',
+            type=str,
+            required=True,
+            help='Email of an existing user to log in as'
+        )
+        parser.add_argument(
+            '--password',
+            type=str,
+            required=True,
+            help='Password of that user'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Concurrent login threads (request threads of one worker)'
+        )
+        parser.add_argument(
+            '--logins',
+            type=int,
+            default=50,
+            help='Logins per scenario'
+        )
+
+    def handle(self, *args, **options):
+        email, password = options['email'], options['password']
+        # Also upgrades an outdated hash before timing starts
+        if authenticate(username=email, password=password) is None:
+            raise CommandError(f'Could not log in as {email}.')
+
+        self.stdout.write(
+            f"hasher: {settings.PASSWORD_HASHERS[0].rsplit('.', 1)[-1]}, "
+            f"hash threads: {settings.PASSWORD_HASH_THREADS}, concurrency: {options['concurrency']}"
+        )
+        self.stdout.write(f"{'scenario':<16} {'logins/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+        scenarios = [
+            ('valid', email, password, True),
+            ('wrong password', email, password + '-wrong', False),
+            ('unknown email', 'nobody-' + email, password, False),
+        ]
+        for label, username, attempt, should_succeed in scenarios:
+            result = self._run(username, attempt, should_succeed, options['concurrency'], options['logins'])
+            self.stdout.write(
+                f"{label:<16} {result['throughput']:>9.1f} {result['p50']:>8.1f} {result['p95']:>8.1f}"
+            )
+
+    def _run(self, username, password, should_succeed, concurrency, total):
+        """Run ``total`` authenticate() calls over ``concurrency`` threads."""
+        latencies = []
+        lock = threading.Lock()
+        remaining = iter(range(total))
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        if next(remaining, None) is None:
+                            return
+                    started = time.perf_counter()
+                    user = authenticate(username=username, password=password)
+                    elapsed = (time.perf_counter() - started) * 1000
+                    if (user is not None) != should_succeed:
+                        raise CommandError(f'Unexpected login result for {username}.')
+                    with lock:
+                        latencies.append(elapsed)
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(worker) for _ in range(concurrency)]
+        for future in futures:
+            future.result()
+        duration = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'throughput': len(latencies) / duration if duration else 0.0,
+            'p50': statistics.median(latencies) if latencies else 0.0,
+            'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0,
+        }
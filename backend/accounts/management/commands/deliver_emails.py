@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.outbox import deliver_due_emails, prune_sent_emails
+
+
+class Command(BaseCommand):
+    help = (
+        'Send due emails from the outbox, batching over one connection per batch, '
+        'and delete old sent emails. Intended to run every minute from cron when '
+        'Celery beat is not delivering them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Emails sent per connection (default EMAIL_OUTBOX_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--prune-days',
+            type=int,
+            default=7,
+            help='Delete sent emails older than this many days (0 disables)'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] is not None and options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+        if options['prune_days'] < 0:
+            raise CommandError('--prune-days must be 0 or greater.')
+
+        sent = deliver_due_emails(batch_size=options['batch_size'])
+        self.stdout.write(f'Sent {sent} emails')
+
+        if options['prune_days']:
+            deleted = prune_sent_emails(options['prune_days'])
+            self.stdout.write(f'Deleted {deleted} sent emails older than {options["prune_days"]} days')
+        self.stdout.write(self.style.SUCCESS('Email delivery complete'))
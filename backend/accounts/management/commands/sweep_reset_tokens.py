@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.reset_tokens import sweep_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired and used password reset tokens in id-range chunks. '
+        'Intended to run hourly or daily from cron or a scheduler.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Tokens deleted per chunk'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report how many tokens would be deleted without deleting them'
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1.')
+
+        deleted = sweep_tokens(chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {deleted} expired or used password reset tokens'))
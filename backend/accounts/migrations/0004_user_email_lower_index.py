@@ -0,0 +1,20 @@
+# Generated by Django 4.2.17 on 2026-10-19 10:29
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0003_dataclearjob"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(
+                django.db.models.functions.text.Lower("email"),
+                name="auth_user_email_lower_idx",
+            ),
+        ),
+    ]
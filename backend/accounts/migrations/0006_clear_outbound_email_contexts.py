@@ -0,0 +1,24 @@
+"""
+Clear the contexts of sent and failed outbox emails.
+
+The outbox now empties an email's context once it is sent or given up
+on, since contexts can hold password reset and verification links.
+Rows written before that still hold theirs.
+"""
+
+from django.db import migrations
+
+
+def clear_finished_contexts(apps, schema_editor):
+    OutboundEmail = apps.get_model('accounts', 'OutboundEmail')
+    OutboundEmail.objects.exclude(status='pending').update(context={})
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_outbound_email"),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_finished_contexts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.17 on 2026-10-19 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0006_clear_outbound_email_contexts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dataclearjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Last time the running worker reported progress.",
+                null=True,
+                verbose_name="heartbeat at",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.17 on 2026-10-19 12:08
+
+from django.db import migrations, models
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def set_token_versions(apps, schema_editor):
+    """Start from the claim existing tokens carry, so none are revoked."""
+    User = apps.get_model("accounts", "CustomUser")
+    users = list(User.objects.only("pk", "password"))
+    for user in users:
+        user.token_version = get_md5_hash_password(user.password)
+    User.objects.bulk_update(users, ["token_version"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0007_data_clear_job_heartbeat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="token_version",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="JWT revocation claim; changes when the password is set, not when it is rehashed.",
+                max_length=32,
+                verbose_name="token version",
+            ),
+        ),
+        migrations.RunPython(set_token_versions, migrations.RunPython.noop),
+    ]
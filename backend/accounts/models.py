@@ -1,11 +1,17 @@
 import secrets
+import uuid
 from datetime import timedelta
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .hashing import hash_password, verify_password
 
 
 class CustomUserManager(BaseUserManager):
@@ -45,6 +51,10 @@ class CustomUserManager(BaseUserManager):
 
         return self.create_user(email, password, **extra_fields)
 
+    def by_email(self, email):
+        """Case-insensitive email lookup served by the lower(email) index."""
+        return self.alias(email_lower=Lower("email")).filter(email_lower=email.strip().lower())
+
 
 class CustomUser(AbstractUser):
     """Custom user model that uses email instead of username for authentication."""
@@ -82,6 +92,13 @@ class CustomUser(AbstractUser):
         null=True,
         help_text=_("When the email verification token was created."),
     )
+    token_version = models.CharField(
+        _("token version"),
+        max_length=32,
+        blank=True,
+        editable=False,
+        help_text=_("JWT revocation claim; changes when the password is set, not when it is rehashed."),
+    )
 
     # Set email as the unique identifier for authentication
     USERNAME_FIELD = "email"
@@ -95,6 +112,9 @@ class CustomUser(AbstractUser):
         verbose_name = _("User")
         verbose_name_plural = _("Users")
         db_table = "auth_user"  # Keep the same table name for compatibility
+        indexes = [
+            models.Index(Lower("email"), name="auth_user_email_lower_idx"),
+        ]
 
     def __str__(self):
         """Return string representation of user."""
@@ -115,23 +135,48 @@ class CustomUser(AbstractUser):
         # Normalize email to lowercase
         self.email = self.__class__.objects.normalize_email(self.email)
 
+    def set_password(self, raw_password):
+        """Hash the password on the hashing pool, revoking the user's tokens."""
+        self.password = hash_password(raw_password)
+        self._password = raw_password
+        # The claim simplejwt derives from the new hash, so its own tokens match too
+        self.token_version = get_md5_hash_password(self.password)
+
+    def set_unusable_password(self):
+        """Mark the password unusable, revoking the user's tokens."""
+        super().set_unusable_password()
+        self.token_version = get_md5_hash_password(self.password)
+
+    def check_password(self, raw_password):
+        """
+        Check the password on the hashing pool, upgrading an outdated hash.
+
+        The upgrade keeps token_version, so tokens issued before it stay valid.
+        """
+        valid, outdated = verify_password(raw_password, self.password)
+        if valid and outdated:
+            self.password = hash_password(raw_password)
+            self.save(update_fields=["password"])
+        return valid
+
 
 class PasswordResetTokenManager(models.Manager):
     """Manager for password reset tokens."""
     
     def create_token_for_user(self, user):
         """Create a new password reset token for user."""
-        # Deactivate any existing tokens for this user
-        self.filter(user=user, is_used=False).update(is_used=True)
+        now = timezone.now()
+
+        # Deactivate the user's live tokens; expired ones are left for the sweeper
+        self.filter(user=user, is_used=False, expires_at__gt=now).update(is_used=True)
         
         # Generate secure token
         token = secrets.token_urlsafe(32)
         
-        # Create new token with 1 hour expiry
         return self.create(
             user=user,
             token=token,
-            expires_at=timezone.now() + timedelta(hours=1)
+            expires_at=now + timedelta(hours=getattr(settings, 'PASSWORD_RESET_TOKEN_HOURS', 1))
         )
     
     def get_valid_token(self, token):
@@ -214,17 +259,209 @@ class PasswordResetToken(models.Model):
         return not self.is_used and self.expires_at > timezone.now()
     
     def mark_as_used(self, ip_address=None, user_agent=None):
-        """Mark token as used."""
+        """
+        Mark token as used.
+
+        Returns:
+            False if another request used the token first
+        """
         self.is_used = True
         self.used_at = timezone.now()
         if ip_address:
             self.ip_address = ip_address
         if user_agent:
             self.user_agent = user_agent
-        self.save()
+        # Conditional update so only one of concurrent requests can use the token
+        return bool(type(self).objects.filter(pk=self.pk, is_used=False).update(
+            is_used=True, used_at=self.used_at, ip_address=self.ip_address, user_agent=self.user_agent
+        ))
     
     def clean(self):
         """Validate token."""
         super().clean()
         if self.expires_at and self.created_at and self.expires_at <= self.created_at:
             raise ValidationError(_('Token expiry must be after creation time.'))
+
+
+class DataClearJob(models.Model):
+    """
+    Background job that deletes all of a user's data in chunks.
+
+    A running job touches heartbeat_at after every chunk. One whose
+    heartbeat is older than DATA_CLEAR_JOB_STALE_SECONDS belongs to a
+    worker that died: it is no longer reused by the clear-data endpoint
+    and can be claimed again by a worker.
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _('Pending')),
+        (STATUS_RUNNING, _('Running')),
+        (STATUS_COMPLETED, _('Completed')),
+        (STATUS_FAILED, _('Failed')),
+    ]
+    ACTIVE_STATUSES = (STATUS_PENDING, STATUS_RUNNING)
+
+    # Default for the DATA_CLEAR_JOB_STALE_SECONDS setting
+    DEFAULT_STALE_SECONDS = 600
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        'CustomUser',
+        on_delete=models.CASCADE,
+        related_name='data_clear_jobs',
+        help_text=_('User whose data is being cleared.')
+    )
+    status = models.CharField(
+        _('status'),
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING
+    )
+    progress = models.JSONField(
+        _('progress'),
+        default=dict,
+        blank=True,
+        help_text=_('Rows deleted so far, keyed by data type.')
+    )
+    error = models.TextField(
+        _('error'),
+        blank=True,
+        help_text=_('Error message if the job failed.')
+    )
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+    started_at = models.DateTimeField(_('started at'), blank=True, null=True)
+    heartbeat_at = models.DateTimeField(
+        _('heartbeat at'),
+        blank=True,
+        null=True,
+        help_text=_('Last time the running worker reported progress.')
+    )
+    finished_at = models.DateTimeField(_('finished at'), blank=True, null=True)
+
+    class Meta:
+        verbose_name = _('Data Clear Job')
+        verbose_name_plural = _('Data Clear Jobs')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'status']),
+        ]
+
+    def __str__(self):
+        """Return string representation."""
+        return f"Data clear job for user {self.user_id} ({self.status})"
+
+    @classmethod
+    def stale_seconds(cls):
+        """Seconds without a heartbeat after which a running job is considered dead."""
+        return getattr(settings, 'DATA_CLEAR_JOB_STALE_SECONDS', cls.DEFAULT_STALE_SECONDS)
+
+    @classmethod
+    def stale_cutoff(cls):
+        """Running jobs with no heartbeat since this time are considered dead."""
+        return timezone.now() - timedelta(seconds=cls.stale_seconds())
+
+    @classmethod
+    def stale_filter(cls):
+        """Filter for running jobs whose worker stopped reporting progress."""
+        return models.Q(status=cls.STATUS_RUNNING) & (
+            models.Q(heartbeat_at__lt=cls.stale_cutoff()) | models.Q(heartbeat_at__isnull=True)
+        )
+
+    @classmethod
+    def active_filter(cls):
+        """Filter for jobs that are waiting or being worked on."""
+        return models.Q(status__in=cls.ACTIVE_STATUSES) & ~cls.stale_filter()
+
+    @property
+    def is_stale(self):
+        """Whether the job is running but its worker stopped reporting progress."""
+        return self.status == self.STATUS_RUNNING and (
+            self.heartbeat_at is None or self.heartbeat_at < self.stale_cutoff()
+        )
+
+    @property
+    def is_active(self):
+        """Whether the job is still waiting or running."""
+        return self.status in self.ACTIVE_STATUSES and not self.is_stale
+
+    def mark_running(self):
+        """Mark the job as started."""
+        self.status = self.STATUS_RUNNING
+        self.started_at = self.heartbeat_at = timezone.now()
+        self.save(update_fields=['status', 'started_at', 'heartbeat_at'])
+
+    def record_progress(self, key, deleted_count):
+        """Store the running deleted count for one data type."""
+        self.progress[key] = deleted_count
+        self.heartbeat_at = timezone.now()
+        self.save(update_fields=['progress', 'heartbeat_at'])
+
+    def mark_completed(self):
+        """Mark the job as finished successfully."""
+        self.status = self.STATUS_COMPLETED
+        self.finished_at = timezone.now()
+        self.save(update_fields=['status', 'finished_at'])
+
+    def mark_failed(self, error):
+        """Mark the job as failed with an error message."""
+        self.status = self.STATUS_FAILED
+        self.error = str(error)
+        self.finished_at = timezone.now()
+        self.save(update_fields=['status', 'error', 'finished_at'])
+
+
+class OutboundEmail(models.Model):
+    """Email waiting in the outbox for background delivery (see accounts/outbox.py)."""
+
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _('Pending')),
+        (STATUS_SENT, _('Sent')),
+        (STATUS_FAILED, _('Failed')),
+    ]
+
+    user = models.ForeignKey(
+        'CustomUser',
+        on_delete=models.CASCADE,
+        related_name='outbound_emails',
+        blank=True,
+        null=True,
+        help_text=_('User passed to the templates as "user".')
+    )
+    recipient = models.EmailField(_('recipient'))
+    subject = models.CharField(_('subject'), max_length=255)
+    template = models.CharField(
+        _('template'),
+        max_length=100,
+        help_text=_('Template path without extension; .txt and .html variants are rendered.')
+    )
+    context = models.JSONField(_('context'), default=dict, blank=True)
+    status = models.CharField(
+        _('status'),
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(_('attempts'), default=0)
+    next_attempt_at = models.DateTimeField(_('next attempt at'), default=timezone.now)
+    last_error = models.TextField(_('last error'), blank=True)
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+    sent_at = models.DateTimeField(_('sent at'), blank=True, null=True)
+
+    class Meta:
+        verbose_name = _('Outbound Email')
+        verbose_name_plural = _('Outbound Emails')
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        """Return string representation."""
+        return f"{self.template} to {self.recipient} ({self.status})"
@@ -0,0 +1,234 @@
+"""
+Email outbox: transactional emails are queued as OutboundEmail rows and
+rendered and sent by a worker, so requests never wait on SMTP.
+
+queue_email() stores the template name and a JSON context and, once the
+surrounding transaction commits, asks Celery to run deliver_emails right
+away. Celery beat also runs deliver_emails every minute; that run sends
+emails whose retry backoff is over and emails queued while the broker
+was unreachable. No task reschedules itself, so an SMTP outage does not
+pile up task chains.
+The worker claims due emails in batches, renders them from compiled
+templates (see accounts/email_rendering.py), and sends each batch over
+one connection to EMAIL_BACKEND. Failed sends are retried with
+exponential backoff (EMAIL_OUTBOX_RETRY_SECONDS doubled per attempt)
+until EMAIL_OUTBOX_MAX_ATTEMPTS, then marked failed.
+
+Contexts can hold secrets (password reset and email verification
+links), so they are cleared once an email is sent or given up on; only
+pending emails keep theirs.
+
+Claiming pushes next_attempt_at forward by CLAIM_SECONDS, so emails
+claimed by a worker that dies are picked up again afterwards. The
+deliver_emails management command runs the same delivery for cron or
+when no Celery worker is running, and prunes old sent emails.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .email_rendering import EmailRenderer
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the EMAIL_OUTBOX_* settings
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_SECONDS = 60
+
+# Longest wait between two attempts
+MAX_RETRY_SECONDS = 3600
+
+# How long a claimed email is hidden from other workers
+CLAIM_SECONDS = 300
+
+
+def _setting(name, default):
+    return getattr(settings, f'EMAIL_OUTBOX_{name}', default)
+
+
+def queue_email(subject, template, recipient_list, context=None, user=None):
+    """
+    Queue an email to each recipient for background delivery.
+
+    Args:
+        subject: Email subject
+        template: Template path without extension (e.g. 'emails/welcome')
+        recipient_list: List of recipient email addresses
+        context: JSON-serializable template context
+        user: Optional user, passed to the templates as ``user``
+
+    Returns:
+        List of queued OutboundEmail instances
+    """
+    emails = OutboundEmail.objects.bulk_create([
+        OutboundEmail(
+            user=user,
+            recipient=recipient,
+            subject=str(subject),
+            template=template,
+            context=context or {},
+        )
+        for recipient in recipient_list
+    ])
+    transaction.on_commit(schedule_delivery)
+    return emails
+
+
+def queue_many(template, messages, batch_size=1000):
+    """
+    Queue many emails of one template, e.g. a digest per user.
+
+    Args:
+        template: Template path without extension
+        messages: Iterable of (subject, recipient, context, user id) tuples
+        batch_size: Rows inserted per statement
+
+    Returns:
+        Number of emails queued
+    """
+    queued = 0
+    batch = []
+    for subject, recipient, context, user_id in messages:
+        batch.append(OutboundEmail(
+            user_id=user_id, recipient=recipient, subject=str(subject), template=template, context=context,
+        ))
+        if len(batch) >= batch_size:
+            OutboundEmail.objects.bulk_create(batch)
+            queued += len(batch)
+            batch = []
+    if batch:
+        OutboundEmail.objects.bulk_create(batch)
+        queued += len(batch)
+    if queued:
+        transaction.on_commit(schedule_delivery)
+    return queued
+
+
+def schedule_delivery():
+    """Ask a Celery worker to deliver now; otherwise the next beat run sends the emails."""
+    from .tasks import deliver_emails
+    try:
+        deliver_emails.apply_async(retry=False)
+    except Exception as e:
+        logger.warning(f"Could not queue email delivery, emails stay in the outbox: {e}")
+
+
+def retry_delay(attempts):
+    """Seconds to wait after the given number of failed attempts."""
+    return min(_setting('RETRY_SECONDS', DEFAULT_RETRY_SECONDS) * 2 ** (attempts - 1), MAX_RETRY_SECONDS)
+
+
+def _claim(batch_size):
+    """Claim up to batch_size due emails for this worker."""
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .select_related('user')
+            .filter(status=OutboundEmail.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        OutboundEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(seconds=CLAIM_SECONDS),
+        )
+    for email in emails:
+        email.attempts += 1
+    return emails
+
+
+def _build_message(email, renderer, connection):
+    text, html = renderer.render({**email.context, 'user': email.user})
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=text,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[email.recipient],
+        connection=connection,
+    )
+    message.attach_alternative(html, 'text/html')
+    return message
+
+
+def _mark_failed_attempt(email, error):
+    if email.attempts >= _setting('MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS):
+        email.status = OutboundEmail.STATUS_FAILED
+        email.context = {}
+        logger.error(f"Giving up on email {email.pk} to {email.recipient} after {email.attempts} attempts: {error}")
+    else:
+        email.next_attempt_at = timezone.now() + timedelta(seconds=retry_delay(email.attempts))
+        logger.warning(f"Email {email.pk} to {email.recipient} failed, retrying at {email.next_attempt_at}: {error}")
+    email.last_error = str(error)
+    email.save(update_fields=['status', 'context', 'next_attempt_at', 'last_error'])
+
+
+def deliver_batch(batch_size=None):
+    """
+    Send one batch of due emails over a single connection.
+
+    Returns:
+        Tuple of (emails claimed, emails sent)
+    """
+    emails = _claim(batch_size or _setting('BATCH_SIZE', DEFAULT_BATCH_SIZE))
+    if not emails:
+        return 0, 0
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        for email in emails:
+            _mark_failed_attempt(email, e)
+        return len(emails), 0
+
+    sent = []
+    # One renderer per template, shared by the batch's emails
+    renderers = {}
+    try:
+        for email in emails:
+            try:
+                if email.template not in renderers:
+                    renderers[email.template] = EmailRenderer(email.template)
+                _build_message(email, renderers[email.template], connection).send()
+            except Exception as e:
+                _mark_failed_attempt(email, e)
+            else:
+                sent.append(email.pk)
+    finally:
+        connection.close()
+
+    OutboundEmail.objects.filter(pk__in=sent).update(
+        status=OutboundEmail.STATUS_SENT, sent_at=timezone.now(), last_error='', context={}
+    )
+    logger.info(f"Sent {len(sent)} of {len(emails)} emails")
+    return len(emails), len(sent)
+
+
+def deliver_due_emails(batch_size=None):
+    """Send due emails batch by batch until none are left; returns the number sent."""
+    batch_size = batch_size or _setting('BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    total = 0
+    while True:
+        claimed, sent = deliver_batch(batch_size)
+        total += sent
+        if claimed < batch_size:
+            return total
+
+
+def prune_sent_emails(days, chunk_size=1000):
+    """Delete sent emails older than the given number of days."""
+    from todos.retention import delete_in_pk_chunks
+    return delete_in_pk_chunks(
+        OutboundEmail.objects.filter(
+            status=OutboundEmail.STATUS_SENT, sent_at__lt=timezone.now() - timedelta(days=days)
+        ),
+        chunk_size=chunk_size,
+    )
@@ -0,0 +1,101 @@
+"""
+Password reset token storage.
+
+Tokens live in one of two stores, selected by PASSWORD_RESET_TOKEN_STORE:
+
+- ``database`` (default): PasswordResetToken rows, which keep an audit
+  trail (used_at, IP address, user agent). Expired and used rows are
+  purged by the sweep_reset_tokens management command.
+- ``cache``: the shared cache (Redis), with the token lifetime as TTL.
+  Reset storms from bots neither grow the table nor touch its indexes,
+  and nothing needs sweeping. Only a hash of each token is stored.
+
+Either way a user has at most one valid token: issuing a new one
+invalidates the previous one, and a token can be consumed once.
+Switching stores invalidates tokens issued by the other store.
+"""
+
+import hashlib
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import PasswordResetToken
+
+User = get_user_model()
+
+# Defaults for the PASSWORD_RESET_TOKEN_STORE and PASSWORD_RESET_TOKEN_HOURS settings
+DEFAULT_STORE = 'database'
+DEFAULT_TOKEN_HOURS = 1
+
+
+def token_lifetime():
+    """How long a newly issued token stays valid."""
+    return timedelta(hours=getattr(settings, 'PASSWORD_RESET_TOKEN_HOURS', DEFAULT_TOKEN_HOURS))
+
+
+def _use_cache():
+    return getattr(settings, 'PASSWORD_RESET_TOKEN_STORE', DEFAULT_STORE) == 'cache'
+
+
+def _token_key(token):
+    return f"password_reset:{hashlib.sha256(token.encode()).hexdigest()}"
+
+
+def _user_key(user_id):
+    return f"password_reset_user:{user_id}"
+
+
+def issue_token(user):
+    """Create a reset token for user, invalidating any earlier one, and return it."""
+    if not _use_cache():
+        return PasswordResetToken.objects.create_token_for_user(user).token
+
+    token = secrets.token_urlsafe(32)
+    timeout = int(token_lifetime().total_seconds())
+    token_key = _token_key(token)
+    # The per-user key names the user's current token; older tokens stop
+    # matching it, and expire on their own
+    cache.set_many({token_key: user.pk, _user_key(user.pk): token_key}, timeout)
+    return token
+
+
+def consume_token(token, ip_address=None, user_agent=None):
+    """
+    Use a reset token.
+
+    Returns:
+        The token's user, or None if the token is unknown, expired,
+        superseded or already used
+    """
+    if not _use_cache():
+        reset_token = PasswordResetToken.objects.get_valid_token(token)
+        if reset_token is None or not reset_token.mark_as_used(ip_address, user_agent):
+            return None
+        return reset_token.user
+
+    token_key = _token_key(token)
+    user_id = cache.get(token_key)
+    if user_id is None or cache.get(_user_key(user_id)) != token_key:
+        return None
+    # Deleting the key claims the token, so concurrent requests cannot both use it
+    if not cache.delete(token_key):
+        return None
+    cache.delete(_user_key(user_id))
+    return User.objects.filter(pk=user_id, is_active=True).first()
+
+
+def sweepable_tokens():
+    """Token rows that can no longer be used: expired or already used."""
+    return PasswordResetToken.objects.filter(Q(expires_at__lte=timezone.now()) | Q(is_used=True))
+
+
+def sweep_tokens(chunk_size=1000, dry_run=False):
+    """Delete expired and used token rows in id-range chunks."""
+    from todos.retention import delete_in_pk_chunks
+    return delete_in_pk_chunks(sweepable_tokens(), chunk_size=chunk_size, dry_run=dry_run)
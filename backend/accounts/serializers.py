@@ -44,7 +44,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         """Validate email is unique and properly formatted."""
         value = value.lower().strip()
         
-        if User.objects.filter(email=value).exists():
+        if User.objects.by_email(value).exists():
             raise serializers.ValidationError(
                 _('A user with this email address already exists.')
             )
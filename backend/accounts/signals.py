@@ -1,6 +1,10 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+
+from .authentication import invalidate_cached_user
 
 User = get_user_model()
 
@@ -11,4 +15,19 @@ def user_post_save(sender, instance, created, **kwargs):
     if created:
         # Perform any post-creation tasks here
         # For example, send welcome email, create user profile, etc.
-        pass
\ No newline at end of file
+        pass
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_cached_user(sender, instance, **kwargs):
+    """Drop the cached copy used by CachedJWTAuthentication once the change commits."""
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_user(user_id))
+
+
+@receiver(user_logged_out)
+def evict_logged_out_user(sender, request, user, **kwargs):
+    """Make the next request after logout load the user again."""
+    if user is not None:
+        invalidate_cached_user(user.pk)
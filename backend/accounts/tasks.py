@@ -0,0 +1,174 @@
+"""
+Background jobs for the accounts app.
+
+Clearing a user's data deletes rows in foreign-key order, one chunk of
+primary keys at a time, each chunk in its own short transaction. The
+high-volume todo tables are removed with raw set-based DELETEs, so no
+rows are loaded into memory and no per-row delete signals (activity
+logging, cache invalidation) fire.
+"""
+
+import logging
+
+from celery import shared_task
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import DataClearJob
+
+logger = logging.getLogger(__name__)
+
+# Primary keys deleted per statement / transaction
+CLEAR_CHUNK_SIZE = 1000
+
+
+def _chunked_pks(queryset, chunk_size):
+    """Yield lists of primary keys until the queryset is empty."""
+    while True:
+        pks = list(queryset.order_by().values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            return
+        yield pks
+
+
+def raw_delete_in_chunks(queryset, chunk_size=CLEAR_CHUNK_SIZE, on_progress=None):
+    """
+    Delete a queryset with raw DELETE statements, chunk by chunk.
+
+    Bypasses the ORM collector: no signals, no cascades. Callers must
+    delete dependent rows first.
+    """
+    model = queryset.model
+    manager = model._base_manager
+    deleted = 0
+    for pks in _chunked_pks(queryset, chunk_size):
+        with transaction.atomic():
+            deleted += manager.filter(pk__in=pks)._raw_delete(manager.db)
+        if on_progress:
+            on_progress(deleted)
+    return deleted
+
+
+def cascade_delete_in_chunks(queryset, chunk_size=CLEAR_CHUNK_SIZE, on_progress=None):
+    """
+    Delete a queryset through the ORM collector, chunk by chunk.
+
+    Used for models whose cascades (comments, attachments, M2M links)
+    are not worth hand-ordering. Returns the number of rows of the
+    queryset's own model that were deleted.
+    """
+    model = queryset.model
+    label = model._meta.label
+    deleted = 0
+    for pks in _chunked_pks(queryset, chunk_size):
+        with transaction.atomic():
+            _, per_model = model._base_manager.filter(pk__in=pks).delete()
+        deleted += per_model.get(label, 0)
+        if on_progress:
+            on_progress(deleted)
+    return deleted
+
+
+def _clear_steps(user):
+    """Return (progress key, queryset, delete function) in FK-safe order."""
+    from todos.models import TodoList, Task, Tombstone
+    from todos.activity_models import Activity
+
+    steps = [
+        # Tasks first: they reference todo lists. Include tasks of other
+        # users that sit in this user's lists so the list delete is safe.
+        ('tasks', Task.objects.filter(Q(user=user) | Q(todo_list__user=user)), raw_delete_in_chunks),
+        ('todo_lists', TodoList.objects.filter(user=user), raw_delete_in_chunks),
+        ('activities', Activity.objects.filter(user=user), raw_delete_in_chunks),
+        ('tombstones', Tombstone.objects.filter(user=user), raw_delete_in_chunks),
+    ]
+
+    try:
+        from workflow.models import WorkflowHistory
+        steps.append((
+            'workflow_history',
+            WorkflowHistory.objects.filter(changed_by=user),
+            raw_delete_in_chunks
+        ))
+    except ImportError:
+        # Workflow app might not be installed
+        pass
+
+    try:
+        from projects.models import Project
+        from features.models import Feature
+        steps.extend([
+            ('features', Feature.objects.filter(reporter=user), cascade_delete_in_chunks),
+            ('projects', Project.objects.filter(owner=user), cascade_delete_in_chunks),
+        ])
+    except ImportError:
+        # These apps might not be installed
+        pass
+
+    return steps
+
+
+def clear_user_data(job, chunk_size=CLEAR_CHUNK_SIZE):
+    """
+    Run a DataClearJob: delete all of the job user's data in chunks.
+
+    Progress is saved on the job after every chunk so clients can poll it.
+    """
+    user = job.user
+    if job.status != DataClearJob.STATUS_RUNNING:
+        job.mark_running()
+
+    try:
+        for key, queryset, delete in _clear_steps(user):
+            job.record_progress(key, 0)
+            delete(
+                queryset,
+                chunk_size=chunk_size,
+                on_progress=lambda count, key=key: job.record_progress(key, count)
+            )
+    except Exception as e:
+        logger.exception(f"Data clear job {job.id} failed for user {user.id}")
+        job.mark_failed(e)
+        return job
+
+    from todos.calendar_feed import invalidate_user_calendar
+    invalidate_user_calendar(user.id)
+
+    job.mark_completed()
+    logger.info(f"Data clear job {job.id} completed for user {user.id}: {job.progress}")
+    return job
+
+
+@shared_task(bind=True, max_retries=None)
+def run_data_clear_job(self, job_id):
+    """Celery entry point for a queued DataClearJob."""
+    # Claim the job atomically so a redelivered message cannot run it twice.
+    # Running jobs whose worker died (stale heartbeat) can be claimed again;
+    # the deletes are idempotent, so the new run finishes what is left.
+    now = timezone.now()
+    claimed = DataClearJob.objects.filter(
+        Q(status=DataClearJob.STATUS_PENDING) | DataClearJob.stale_filter(), pk=job_id
+    ).update(status=DataClearJob.STATUS_RUNNING, started_at=now, heartbeat_at=now)
+    if not claimed:
+        if DataClearJob.objects.filter(pk=job_id, status=DataClearJob.STATUS_RUNNING).exists():
+            # Another worker holds it; check back once its heartbeat could be stale
+            raise self.retry(countdown=DataClearJob.stale_seconds())
+        logger.info(f"Data clear job {job_id} is missing or already finished")
+        return
+
+    job = DataClearJob.objects.select_related('user').get(pk=job_id)
+    clear_user_data(job)
+
+
+@shared_task
+def deliver_emails():
+    """
+    Celery entry point for the email outbox, run after emails are queued
+    and every minute by beat (CELERY_BEAT_SCHEDULE).
+    """
+    from .outbox import deliver_due_emails
+
+    sent = deliver_due_emails()
+    if sent:
+        logger.info(f"Delivered {sent} queued emails")
@@ -0,0 +1,22 @@
+"""
+JWTs revoked by CustomUser.token_version.
+
+simplejwt's for_user puts a hash of the user's password hash in the
+CHECK_REVOKE_TOKEN claim, so upgrading a hash on login would revoke every
+token the user holds. These tokens carry token_version instead, which
+only changes when the password is set (see accounts/authentication.py).
+"""
+
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.settings import api_settings
+
+
+class RefreshToken(tokens.RefreshToken):
+    """Refresh token (and access tokens made from it) carrying the user's token_version."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        if api_settings.CHECK_REVOKE_TOKEN:
+            token[api_settings.REVOKE_TOKEN_CLAIM] = user.token_version
+        return token
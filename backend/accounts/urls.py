@@ -25,6 +25,7 @@ urlpatterns = [
     
     # Data management
     path('clear-data/', views.clear_user_data, name='clear-user-data'),
+    path('clear-data/<uuid:job_id>/', views.clear_user_data_status, name='clear-user-data-status'),
     
     # Health check
     path('health/', views.health_check, name='health-check'),
@@ -1,50 +1,37 @@
 import logging
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.conf import settings
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from .outbox import queue_email
+
 logger = logging.getLogger(__name__)
 
 
-def send_email(subject, message, recipient_list, html_message=None, fail_silently=False):
+def send_email(subject, template, recipient_list, context=None, user=None):
     """
-    Send email with error handling and logging.
+    Queue an email for background delivery through the outbox.
+    
+    Rendering and sending happen in a worker (see accounts/outbox.py),
+    so callers never wait on templates or SMTP.
     
     Args:
         subject: Email subject
-        message: Plain text message
+        template: Template path without extension, e.g. 'emails/welcome'
         recipient_list: List of recipient email addresses
-        html_message: HTML message (optional)
-        fail_silently: Whether to suppress exceptions
+        context: JSON-serializable template context
+        user: User instance passed to the templates as ``user`` (optional)
         
     Returns:
-        Boolean indicating success
+        Boolean indicating the email was queued
     """
     try:
-        sent = send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=recipient_list,
-            html_message=html_message,
-            fail_silently=fail_silently
-        )
-        
-        if sent:
-            logger.info(f"Email sent successfully to {recipient_list}")
-            return True
-        else:
-            logger.warning(f"Failed to send email to {recipient_list}")
-            return False
-            
+        queue_email(subject, template, recipient_list, context=context, user=user)
     except Exception as e:
-        logger.error(f"Error sending email to {recipient_list}: {str(e)}")
-        if not fail_silently:
-            raise
+        logger.error(f"Error queueing email to {recipient_list}: {str(e)}")
         return False
+    return True
 
 
 def send_welcome_email(user):
@@ -55,64 +42,53 @@ def send_welcome_email(user):
         user: User instance
         
     Returns:
-        Boolean indicating success
+        Boolean indicating the email was queued
     """
     subject = _("Welcome to Track!")
     
     context = {
-        'user': user,
         'site_name': 'Track',
         'site_url': getattr(settings, 'FRONTEND_URL', 'http://localhost:3000'),
     }
     
-    # Render email templates
-    html_message = render_to_string('emails/welcome.html', context)
-    plain_message = render_to_string('emails/welcome.txt', context)
-    
     return send_email(
         subject=subject,
-        message=plain_message,
+        template='emails/welcome',
         recipient_list=[user.email],
-        html_message=html_message,
-        fail_silently=True
+        context=context,
+        user=user
     )
 
 
-def send_password_reset_email(user, reset_token):
+def send_password_reset_email(user, token):
     """
     Send password reset email with reset link.
     
     Args:
         user: User instance
-        reset_token: PasswordResetToken instance
+        token: Reset token string (see accounts/reset_tokens.py)
         
     Returns:
-        Boolean indicating success
+        Boolean indicating the email was queued
     """
     subject = _("Reset your Track password")
     
     # Build reset URL
     frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')
-    reset_url = f"{frontend_url}/auth/reset-password?token={reset_token.token}"
+    reset_url = f"{frontend_url}/auth/reset-password?token={token}"
     
     context = {
-        'user': user,
         'reset_url': reset_url,
-        'reset_token': reset_token.token,
         'site_name': 'Track',
-        'expiry_hours': 1,  # Token expires in 1 hour
+        'expiry_hours': getattr(settings, 'PASSWORD_RESET_TOKEN_HOURS', 1),
     }
     
-    # Render email templates
-    html_message = render_to_string('emails/password_reset.html', context)
-    plain_message = render_to_string('emails/password_reset.txt', context)
-    
     return send_email(
         subject=subject,
-        message=plain_message,
+        template='emails/password_reset',
         recipient_list=[user.email],
-        html_message=html_message,
-        fail_silently=True
+        context=context,
+        user=user
     )
 
 
@@ -124,26 +100,21 @@ def send_password_changed_email(user):
         user: User instance
         
     Returns:
-        Boolean indicating success
+        Boolean indicating the email was queued
     """
     subject = _("Your Track password was changed")
     
     context = {
-        'user': user,
         'site_name': 'Track',
         'support_email': getattr(settings, 'SUPPORT_EMAIL', 'support@track.com'),
     }
     
-    # Render email templates
-    html_message = render_to_string('emails/password_changed.html', context)
-    plain_message = render_to_string('emails/password_changed.txt', context)
-    
     return send_email(
         subject=subject,
-        message=plain_message,
+        template='emails/password_changed',
         recipient_list=[user.email],
-        html_message=html_message,
-        fail_silently=True
+        context=context,
+        user=user
     )
 
 
@@ -156,7 +127,7 @@ def send_email_verification(user, verification_token):
         verification_token: Email verification token
         
     Returns:
-        Boolean indicating success
+        Boolean indicating the email was queued
     """
     subject = _("Verify your Track email address")
     
@@ -165,22 +136,17 @@ def send_email_verification(user, verification_token):
     verification_url = f"{frontend_url}/auth/verify-email?token={verification_token}"
     
     context = {
-        'user': user,
         'verification_url': verification_url,
         'verification_token': verification_token,
         'site_name': 'Track',
     }
     
-    # Render email templates
-    html_message = render_to_string('emails/email_verification.html', context)
-    plain_message = render_to_string('emails/email_verification.txt', context)
-    
     return send_email(
         subject=subject,
-        message=plain_message,
+        template='emails/email_verification',
         recipient_list=[user.email],
-        html_message=html_message,
-        fail_silently=True
+        context=context,
+        user=user
     )
 
 
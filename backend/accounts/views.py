@@ -2,14 +2,12 @@ from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from django.utils.decorators import method_decorator
 from django.views.decorators.cache import never_cache
-from django_ratelimit.decorators import ratelimit
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 
 from .serializers import (
@@ -21,7 +19,10 @@ from .serializers import (
     LogoutSerializer,
     ChangePasswordSerializer
 )
-from .models import PasswordResetToken
+from . import reset_tokens
+from .tokens import RefreshToken
+from .models import DataClearJob
+from .tasks import run_data_clear_job
 from .utils import (
     send_welcome_email,
     send_password_reset_email,
@@ -40,8 +41,8 @@ class UserRegistrationView(APIView):
     POST /api/auth/register/
     """
     permission_classes = [permissions.AllowAny]
+    throttle_scope = 'register'
     
-    @method_decorator(ratelimit(key='ip', rate='5/m', method='POST', block=True))
     def post(self, request):
         """Register a new user."""
         serializer = UserRegistrationSerializer(data=request.data)
@@ -80,8 +81,8 @@ class UserLoginView(APIView):
     POST /api/auth/login/
     """
     permission_classes = [permissions.AllowAny]
+    throttle_scope = 'login'
     
-    @method_decorator(ratelimit(key='ip', rate='5/m', method='POST', block=True))
     def post(self, request):
         """Authenticate user and return tokens."""
         serializer = UserLoginSerializer(
@@ -156,11 +157,7 @@ class CustomTokenRefreshView(TokenRefreshView):
     
     POST /api/auth/token/refresh/
     """
-    
-    @method_decorator(ratelimit(key='ip', rate='10/m', method='POST', block=True))
-    def post(self, request, *args, **kwargs):
-        """Refresh access token."""
-        return super().post(request, *args, **kwargs)
+    throttle_scope = 'token_refresh'
 
 
 class UserProfileView(generics.RetrieveUpdateAPIView):
@@ -176,7 +173,8 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     
     def get_object(self):
         """Return the current user."""
-        return self.request.user
+        # request.user may be a cached copy; save a fresh row instead
+        return User.objects.get(pk=self.request.user.pk)
     
     def update(self, request, *args, **kwargs):
         """Update user profile."""
@@ -201,8 +199,8 @@ class PasswordResetRequestView(APIView):
     POST /api/auth/password-reset/
     """
     permission_classes = [permissions.AllowAny]
+    throttle_scope = 'password_reset'
     
-    @method_decorator(ratelimit(key='ip', rate='3/h', method='POST', block=True))
     def post(self, request):
         """Request password reset email."""
         serializer = PasswordResetRequestSerializer(data=request.data)
@@ -211,13 +209,13 @@ class PasswordResetRequestView(APIView):
             email = serializer.validated_data['email']
             
             try:
-                user = User.objects.get(email=email)
+                user = User.objects.by_email(email).get()
                 
                 # Create reset token
-                reset_token = PasswordResetToken.objects.create_token_for_user(user)
+                token = reset_tokens.issue_token(user)
                 
                 # Send reset email
-                send_password_reset_email(user, reset_token)
+                send_password_reset_email(user, token)
                 
             except User.DoesNotExist:
                 # Don't reveal whether user exists for security
@@ -237,8 +235,8 @@ class PasswordResetConfirmView(APIView):
     POST /api/auth/password-reset/confirm/
     """
     permission_classes = [permissions.AllowAny]
+    throttle_scope = 'password_reset_confirm'
     
-    @method_decorator(ratelimit(key='ip', rate='5/h', method='POST', block=True))
     def post(self, request):
         """Confirm password reset with token."""
         serializer = PasswordResetConfirmSerializer(data=request.data)
@@ -247,22 +245,18 @@ class PasswordResetConfirmView(APIView):
             token = serializer.validated_data['token']
             new_password = serializer.validated_data['new_password']
             
-            # Get valid token
-            reset_token = PasswordResetToken.objects.get_valid_token(token)
+            # Use the token; fails if it is invalid, expired or already used
+            user = reset_tokens.consume_token(
+                token,
+                ip_address=get_client_ip(request),
+                user_agent=get_user_agent(request)
+            )
             
-            if reset_token:
-                user = reset_token.user
-                
+            if user:
                 # Update password
                 user.set_password(new_password)
                 user.save()
                 
-                # Mark token as used
-                reset_token.mark_as_used(
-                    ip_address=get_client_ip(request),
-                    user_agent=get_user_agent(request)
-                )
-                
                 # Send confirmation email
                 try:
                     send_password_changed_email(user)
@@ -287,8 +281,8 @@ class ChangePasswordView(APIView):
     POST /api/auth/change-password/
     """
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'change_password'
     
-    @method_decorator(ratelimit(key='user', rate='3/h', method='POST', block=True))
     def post(self, request):
         """Change user password."""
         serializer = ChangePasswordSerializer(
@@ -302,7 +296,7 @@ class ChangePasswordView(APIView):
             
             # Update password
             user.set_password(new_password)
-            user.save()
+            user.save(update_fields=['password', 'token_version'])
             
             # Send confirmation email
             try:
@@ -310,8 +304,12 @@ class ChangePasswordView(APIView):
             except Exception:
                 pass
             
+            # The new password revokes existing tokens, including this one
+            refresh = RefreshToken.for_user(user)
             return Response({
-                'message': _('Password changed successfully.')
+                'message': _('Password changed successfully.'),
+                'access': str(refresh.access_token),
+                'refresh': str(refresh),
             }, status=status.HTTP_200_OK)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -367,13 +365,15 @@ def clear_user_data(request):
     
     POST /api/auth/clear-data/
     
-    This endpoint will delete:
+    Queues a background job that will delete:
     - All todo lists and tasks
     - All activities 
     - All workflow history for the user
     - All projects and features (if they exist)
     
-    The user account itself is preserved.
+    The user account itself is preserved. Returns 202 with a job id;
+    poll GET /api/auth/clear-data/<job_id>/ for progress. If a job is
+    already queued or running for the user, that job is returned.
     """
     user = request.user
     
@@ -389,62 +389,56 @@ def clear_user_data(request):
             'error': 'Invalid password'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    # Track what we're deleting for the response
-    deleted_counts = {}
+    # Jobs whose worker died are given up on rather than handed back
+    DataClearJob.objects.filter(DataClearJob.stale_filter(), user=user).update(
+        status=DataClearJob.STATUS_FAILED,
+        error='The worker running this job stopped responding.',
+        finished_at=timezone.now(),
+    )
+    job = DataClearJob.objects.filter(DataClearJob.active_filter(), user=user).first()
     
-    try:
-        # Import models (do it here to avoid circular imports)
-        from todos.models import TodoList, Task
-        from todos.activity_models import Activity
-        
-        # Delete todo lists (this will cascade to tasks)
-        todo_lists_count = TodoList.objects.filter(user=user).count()
-        tasks_count = Task.objects.filter(user=user).count()
-        TodoList.objects.filter(user=user).delete()
-        
-        deleted_counts['todo_lists'] = todo_lists_count
-        deleted_counts['tasks'] = tasks_count
-        
-        # Delete activities
-        activities_count = Activity.objects.filter(user=user).count()
-        Activity.objects.filter(user=user).delete()
-        deleted_counts['activities'] = activities_count
-        
-        # Delete workflow history
-        try:
-            from workflow.models import WorkflowHistory
-            workflow_history_count = WorkflowHistory.objects.filter(changed_by=user).count()
-            WorkflowHistory.objects.filter(changed_by=user).delete()
-            deleted_counts['workflow_history'] = workflow_history_count
-        except ImportError:
-            # Workflow app might not be installed
-            deleted_counts['workflow_history'] = 0
-        
-        # Delete projects and features if they exist
+    if job is None:
+        job = DataClearJob.objects.create(user=user)
         try:
-            from projects.models import Project
-            from features.models import Feature
-            
-            projects_count = Project.objects.filter(created_by=user).count()
-            features_count = Feature.objects.filter(created_by=user).count()
-            
-            Project.objects.filter(created_by=user).delete()
-            Feature.objects.filter(created_by=user).delete()
-            
-            deleted_counts['projects'] = projects_count
-            deleted_counts['features'] = features_count
-        except ImportError:
-            # These apps might not be installed
-            deleted_counts['projects'] = 0
-            deleted_counts['features'] = 0
-        
-        return Response({
-            'message': 'All user data has been successfully cleared',
-            'deleted_counts': deleted_counts,
-            'user_preserved': True
-        }, status=status.HTTP_200_OK)
-        
-    except Exception as e:
+            run_data_clear_job.delay(str(job.id))
+        except Exception as e:
+            job.mark_failed(f'Could not queue job: {e}')
+            return Response({
+                'error': 'Data clearing is temporarily unavailable. Please try again later.'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    
+    return Response({
+        'message': 'Your data is being cleared in the background',
+        **_data_clear_job_payload(job),
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def clear_user_data_status(request, job_id):
+    """
+    Get progress of a data clearing job.
+    
+    GET /api/auth/clear-data/<job_id>/
+    """
+    try:
+        job = DataClearJob.objects.get(pk=job_id, user=request.user)
+    except DataClearJob.DoesNotExist:
         return Response({
-            'error': f'Error clearing data: {str(e)}'
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            'error': 'Job not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response(_data_clear_job_payload(job), status=status.HTTP_200_OK)
+
+
+def _data_clear_job_payload(job):
+    """Serialize a DataClearJob for the clear-data endpoints."""
+    return {
+        'job_id': str(job.id),
+        'status': job.status,
+        'deleted_counts': job.progress,
+        'error': job.error or None,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'user_preserved': True,
+    }
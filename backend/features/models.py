@@ -1,10 +1,13 @@
 from django.db import models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.core.validators import MinLengthValidator
 from django.core.exceptions import ValidationError
 import uuid
 
+from projects.access import get_project_role
 from projects.models import Project
 
 User = get_user_model()
@@ -285,9 +288,37 @@ class Feature(models.Model):
             parent = parent.parent
         return ' > '.join(path)
 
+    @property
+    def sub_features_count(self):
+        if hasattr(self, 'annotated_sub_features_count'):
+            return self.annotated_sub_features_count
+        return self.sub_features.count()
+
+    @property
+    def comments_count(self):
+        if hasattr(self, 'annotated_comments_count'):
+            return self.annotated_comments_count
+        return self.comments.count()
+
+    @property
+    def attachments_count(self):
+        if hasattr(self, 'annotated_attachments_count'):
+            return self.annotated_attachments_count
+        return self.attachments.count()
+
+    @property
+    def dependencies_count(self):
+        if hasattr(self, 'annotated_dependencies_count'):
+            return self.annotated_dependencies_count
+        return self.dependencies.count()
+
     @property
     def progress_percentage(self):
-        if not self.sub_features.exists():
+        if hasattr(self, 'annotated_sub_features_count'):
+            has_sub_features = self.annotated_sub_features_count > 0
+        else:
+            has_sub_features = self.sub_features.exists()
+        if not has_sub_features:
             # Leaf feature - calculate based on status
             status_progress = {
                 'idea': 0,
@@ -306,11 +337,40 @@ class Feature(models.Model):
         total_progress = sum(sub.progress_percentage for sub in sub_features)
         return round(total_progress / len(sub_features), 2)
 
+    @staticmethod
+    def annotate_counts(queryset):
+        """
+        Annotate a Feature queryset with the counts behind
+        sub_features_count, comments_count, attachments_count and
+        dependencies_count, so list views need no per-feature queries
+        and no prefetch of the related rows themselves.
+
+        Each count is a correlated subquery rather than a JOIN, so the
+        counts do not multiply each other.
+        """
+        def count(model, field):
+            return Coalesce(
+                Subquery(
+                    model.objects.filter(**{field: OuterRef('pk')}).order_by()
+                    .values(field).annotate(n=models.Count('pk')).values('n'),
+                    output_field=models.IntegerField(),
+                ),
+                0,
+            )
+
+        return queryset.annotate(
+            annotated_sub_features_count=count(Feature, 'parent'),
+            annotated_comments_count=count(FeatureComment, 'feature'),
+            annotated_attachments_count=count(FeatureAttachment, 'feature'),
+            # Auto-created through model, with from_feature and to_feature columns
+            annotated_dependencies_count=count(Feature.dependencies.through, 'from_feature'),
+        )
+
     def can_user_edit(self, user):
-        # Project owner, assignee, or reporter can edit
-        return (self.project.can_user_edit(user) or 
-                self.assignee == user or 
-                self.reporter == user)
+        # Project owner or team member, assignee, or reporter can edit
+        if user.pk is not None and user.pk in (self.assignee_id, self.reporter_id):
+            return True
+        return get_project_role(user, self.project_id) is not None
 
     def get_next_status(self):
         status_flow = ['idea', 'specification', 'development', 'testing', 'live']
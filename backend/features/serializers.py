@@ -78,10 +78,10 @@ class FeatureListSerializer(serializers.ModelSerializer):
     progress_percentage = serializers.ReadOnlyField()
     can_edit = serializers.SerializerMethodField()
     
-    sub_features_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
-    attachments_count = serializers.SerializerMethodField()
-    dependencies_count = serializers.SerializerMethodField()
+    sub_features_count = serializers.ReadOnlyField()
+    comments_count = serializers.ReadOnlyField()
+    attachments_count = serializers.ReadOnlyField()
+    dependencies_count = serializers.ReadOnlyField()
 
     class Meta:
         model = Feature
@@ -100,18 +100,6 @@ class FeatureListSerializer(serializers.ModelSerializer):
             return False
         return obj.can_user_edit(request.user)
 
-    def get_sub_features_count(self, obj):
-        return obj.sub_features.count()
-
-    def get_comments_count(self, obj):
-        return obj.comments.count()
-
-    def get_attachments_count(self, obj):
-        return obj.attachments.count()
-
-    def get_dependencies_count(self, obj):
-        return obj.dependencies.count()
-
 
 class FeatureSerializer(serializers.ModelSerializer):
     assignee = UserBasicSerializer(read_only=True)
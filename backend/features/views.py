@@ -6,8 +6,6 @@ from rest_framework.viewsets import ModelViewSet
 from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Count
-from django.utils.decorators import method_decorator
-from django_ratelimit.decorators import ratelimit
 from django.utils import timezone
 
 from .models import Feature, FeatureComment, FeatureAttachment
@@ -17,6 +15,9 @@ from .serializers import (
 )
 from .permissions import IsFeatureStakeholder
 from .filters import FeatureFilter
+from projects.access import get_accessible_project_ids
+from track_project.exports import stream_export, get_export_format, invalid_export_format_response
+from track_project.idempotency import idempotent
 
 
 class FeatureViewSet(ModelViewSet):
@@ -29,6 +30,27 @@ class FeatureViewSet(ModelViewSet):
         'updated_at', 'order', 'estimated_hours'
     ]
     ordering = ['order', '-created_at']
+    throttle_scopes = {'create': 'feature_create'}
+    export_fields = [
+        ('id', 'id'),
+        ('project', 'project_id'),
+        ('project_name', 'project__name'),
+        ('parent', 'parent_id'),
+        ('title', 'title'),
+        ('description', 'description'),
+        ('status', 'status'),
+        ('priority', 'priority'),
+        ('assignee_email', 'assignee__email'),
+        ('reporter_email', 'reporter__email'),
+        ('estimated_hours', 'estimated_hours'),
+        ('actual_hours', 'actual_hours'),
+        ('due_date', 'due_date'),
+        ('start_date', 'start_date'),
+        ('end_date', 'end_date'),
+        ('completed_date', 'completed_date'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    ]
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -40,13 +62,19 @@ class FeatureViewSet(ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         
-        # User can see features from projects they have access to
+        # User can see features from projects they have access to, or that
+        # they are assigned to or reported. The project ids are cached per
+        # user, so no join on team members (and no DISTINCT) is needed.
         queryset = Feature.objects.filter(
-            Q(project__owner=user) | Q(project__team_members=user) |
+            Q(project_id__in=get_accessible_project_ids(user)) |
             Q(assignee=user) | Q(reporter=user)
-        ).distinct().select_related(
-            'project', 'parent', 'assignee', 'reporter'
-        ).prefetch_related('comments', 'attachments', 'sub_features')
+        ).select_related('project', 'parent', 'assignee', 'reporter')
+
+        if self.get_serializer_class() is FeatureListSerializer:
+            # List serializers only show counts of the related rows
+            queryset = Feature.annotate_counts(queryset)
+        else:
+            queryset = queryset.prefetch_related('comments', 'attachments', 'sub_features')
         
         # Filter by project if specified
         project_id = self.request.query_params.get('project', None)
@@ -70,7 +98,7 @@ class FeatureViewSet(ModelViewSet):
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
 
-    @method_decorator(ratelimit(key='user', rate='20/m', method='POST'))
+    @idempotent
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
@@ -205,7 +233,7 @@ class FeatureViewSet(ModelViewSet):
         # Overdue features
         overdue_features = queryset.filter(
             Q(assignee=user) | Q(reporter=user)
-        ).filter(due_date__lt=timezone.now().date()).exclude(status='live').distinct()
+        ).filter(due_date__lt=timezone.now().date()).exclude(status='live')
         
         # Status distribution
         status_distribution = list(
@@ -225,6 +253,23 @@ class FeatureViewSet(ModelViewSet):
             'priority_distribution': priority_distribution,
         })
 
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream all matching features as a file download.
+
+        Accepts the same filters as the list endpoint.
+
+        Query parameters:
+        - export_format: 'csv' (default) or 'ndjson'
+        """
+        export_format = get_export_format(request)
+        if export_format is None:
+            return invalid_export_format_response()
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return stream_export(queryset, self.export_fields, 'features', export_format)
+
 
 class FeatureCommentViewSet(ModelViewSet):
     serializer_class = FeatureCommentSerializer
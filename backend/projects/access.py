@@ -0,0 +1,135 @@
+"""
+Per-user project access.
+
+A user's role in each project they can see (ROLE_OWNER or ROLE_MEMBER)
+is read in one query with Project.access_filter (EXISTS on the
+membership table, no JOIN or DISTINCT) and cached per user in the shared
+cache. Within a request the map is also kept on the user object, the
+way Django's ModelBackend keeps permissions in ``user._perm_cache``, so
+permission checks on every row of a list (can_edit) are dict lookups.
+
+Visibility filters on related models use the ids with
+``project_id IN (...)`` against their own index instead of joining
+projects and team members for every request.
+
+Cached roles are stored under a per-user generation. Project saves,
+deletes and team membership changes replace the generation of everyone
+affected once the transaction commits (see projects/signals.py). A
+reader takes the generation before querying the roles and stores them
+under it, so a reader that queried before the change committed files
+its stale map under a generation that is no longer read, instead of
+re-caching it for PROJECT_ACCESS_CACHE_TIMEOUT.
+"""
+
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Project
+
+logger = logging.getLogger(__name__)
+
+ROLE_OWNER = 'owner'
+ROLE_MEMBER = 'member'
+
+# Default for the PROJECT_ACCESS_CACHE_TIMEOUT setting
+DEFAULT_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Attribute holding the roles on a user object for the rest of the request
+_USER_ATTR = '_project_roles_cache'
+
+
+def _generation_key(user_id):
+    return f'projects:access_generation:{user_id}'
+
+
+def _cache_key(user_id, generation):
+    return f'projects:access:{user_id}:{generation}'
+
+
+def _new_generation():
+    return uuid.uuid4().hex
+
+
+def _current_generation(user_id):
+    """Return the user's cache generation, starting one if there is none."""
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        # add() so concurrent readers agree on one generation; it never
+        # expires, so roles cached under it stay reachable until replaced
+        cache.add(key, _new_generation(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def compute_project_roles(user):
+    """Return a dict of project id to user's role, for the projects user can see."""
+    projects = Project.objects.filter(Project.access_filter(user)).values_list('pk', 'owner_id')
+    return {
+        project_id: ROLE_OWNER if owner_id == user.pk else ROLE_MEMBER
+        for project_id, owner_id in projects
+    }
+
+
+def _load_project_roles(user):
+    try:
+        # Read before querying the roles, see the module docstring
+        generation = _current_generation(user.pk)
+        roles = cache.get(_cache_key(user.pk, generation)) if generation is not None else None
+    except Exception as e:
+        logger.warning(f"Could not read project access cache for user {user.pk}: {str(e)}")
+        return compute_project_roles(user)
+
+    if roles is None:
+        roles = compute_project_roles(user)
+        if generation is not None:
+            try:
+                cache.set(
+                    _cache_key(user.pk, generation),
+                    roles,
+                    getattr(settings, 'PROJECT_ACCESS_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT)
+                )
+            except Exception as e:
+                logger.warning(f"Could not cache project access for user {user.pk}: {str(e)}")
+    return roles
+
+
+def get_project_roles(user):
+    """
+    Return user's roles by project id, from the user object or the cache
+    when possible. Anonymous users have none.
+    """
+    if not user.is_authenticated:
+        return {}
+    roles = getattr(user, _USER_ATTR, None)
+    if roles is None:
+        roles = _load_project_roles(user)
+        setattr(user, _USER_ATTR, roles)
+    return roles
+
+
+def get_project_role(user, project_id):
+    """Return user's role in the project, or None if they cannot see it."""
+    return get_project_roles(user).get(project_id)
+
+
+def get_accessible_project_ids(user):
+    """Return the ids of the projects user owns or is a team member of."""
+    return get_project_roles(user).keys()
+
+
+def forget_project_roles(user):
+    """Drop the roles kept on a user object, e.g. after changing its memberships."""
+    user.__dict__.pop(_USER_ATTR, None)
+
+
+def invalidate_project_access(user_ids):
+    """Start a new cache generation for the given users, orphaning their cached roles."""
+    try:
+        cache.set_many({_generation_key(user_id): _new_generation() for user_id in set(user_ids)}, None)
+    except Exception as e:
+        # A cache outage must never block project writes
+        logger.warning(f"Could not invalidate project access for users {user_ids}: {str(e)}")
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Exists, ExpressionWrapper, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 import uuid
@@ -42,16 +44,26 @@ class Project(models.Model):
 
     @property
     def total_features(self):
+        if hasattr(self, 'annotated_total_features'):
+            return self.annotated_total_features
         if hasattr(self, 'features'):
             return self.features.count()
         return 0
 
     @property
     def completed_features(self):
+        if hasattr(self, 'annotated_completed_features'):
+            return self.annotated_completed_features
         if hasattr(self, 'features'):
             return self.features.filter(status='live').count()
         return 0
 
+    @property
+    def team_members_count(self):
+        if hasattr(self, 'annotated_team_members_count'):
+            return self.annotated_team_members_count
+        return self.team_members.count()
+
     @property
     def progress_percentage(self):
         if self.total_features == 0:
@@ -66,4 +78,50 @@ class Project(models.Model):
         return timezone.now().date() > self.deadline
 
     def can_user_edit(self, user):
-        return self.owner == user or self.team_members.filter(id=user.id).exists()
\ No newline at end of file
+        if self.owner_id == user.pk:
+            return True
+        from .access import get_project_role
+        return get_project_role(user, self.pk) is not None
+
+    @staticmethod
+    def access_filter(user):
+        """
+        Filter for the projects ``user`` owns or is a team member of.
+
+        Uses EXISTS on the membership table instead of joining it, so
+        querysets filtered with it need no DISTINCT.
+        """
+        # Auto-created through model, with project and customuser columns
+        membership = Project.team_members.through
+        return Q(owner=user) | Q(Exists(membership.objects.filter(project=OuterRef('pk'), customuser=user)))
+
+    @staticmethod
+    def annotate_stats(queryset, user):
+        """
+        Annotate a Project queryset with the counts behind total_features,
+        completed_features, progress_percentage and team_members_count, and
+        with annotated_is_member (owner or team member) for ``user``, so
+        none of them need per-project queries.
+
+        Each count is a correlated subquery rather than a JOIN, so the
+        feature and team member counts do not multiply each other.
+        """
+        feature_model = Project.features.rel.related_model
+        membership = Project.team_members.through
+
+        def count(subquery, field):
+            return Coalesce(
+                Subquery(
+                    subquery.order_by().values(field).annotate(n=models.Count('pk')).values('n'),
+                    output_field=models.IntegerField(),
+                ),
+                0,
+            )
+
+        features = feature_model.objects.filter(project=OuterRef('pk'))
+        return queryset.annotate(
+            annotated_total_features=count(features, 'project'),
+            annotated_completed_features=count(features.filter(status='live'), 'project'),
+            annotated_team_members_count=count(membership.objects.filter(project=OuterRef('pk')), 'project'),
+            annotated_is_member=ExpressionWrapper(Project.access_filter(user), output_field=models.BooleanField()),
+        )
\ No newline at end of file
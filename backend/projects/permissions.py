@@ -21,4 +21,4 @@ class IsProjectOwner(permissions.BasePermission):
     """
 
     def has_object_permission(self, request, view, obj):
-        return obj.owner == request.user
\ No newline at end of file
+        return obj.owner_id == request.user.pk
\ No newline at end of file
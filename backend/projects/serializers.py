@@ -41,6 +41,9 @@ class ProjectSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if not request or not request.user.is_authenticated:
             return False
+        # Set by Project.annotate_stats for the requesting user
+        if hasattr(obj, 'annotated_is_member'):
+            return obj.annotated_is_member
         return obj.can_user_edit(request.user)
 
     def validate_name(self, value):
@@ -89,7 +92,7 @@ class ProjectSerializer(serializers.ModelSerializer):
 
 class ProjectListSerializer(serializers.ModelSerializer):
     owner = UserBasicSerializer(read_only=True)
-    team_members_count = serializers.SerializerMethodField()
+    team_members_count = serializers.ReadOnlyField()
     total_features = serializers.ReadOnlyField()
     completed_features = serializers.ReadOnlyField()
     progress_percentage = serializers.ReadOnlyField()
@@ -105,11 +108,11 @@ class ProjectListSerializer(serializers.ModelSerializer):
             'is_overdue', 'can_edit'
         ]
 
-    def get_team_members_count(self, obj):
-        return obj.team_members.count()
-
     def get_can_edit(self, obj):
         request = self.context.get('request')
         if not request or not request.user.is_authenticated:
             return False
-        return obj.can_user_edit(request.user)
\ No newline at end of file
+        # Set by Project.annotate_stats for the requesting user
+        if hasattr(obj, 'annotated_is_member'):
+            return obj.annotated_is_member
+        return obj.can_user_edit(request.user)
@@ -0,0 +1,63 @@
+"""
+Django signals for the projects app.
+
+Project saves, deletes and team membership changes evict the cached
+dashboard summaries (see projects/summary.py) and project roles (see
+projects/access.py) of everyone who can see the project, after the
+transaction commits so requests starting later see the change.
+
+Roles are versioned per user, so a request that read them before the
+commit cannot store the old map where later requests look. Summaries
+are plain entries: such a request can re-cache old counts, which last
+until the next change to the user's projects or the next day.
+"""
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from .access import forget_project_roles, invalidate_project_access
+from .models import Project
+from .summary import invalidate_project_summaries
+
+
+def _invalidate(user_ids):
+    invalidate_project_summaries(user_ids)
+    invalidate_project_access(user_ids)
+
+
+def _invalidate_on_commit(user_ids):
+    user_ids = set(user_ids)
+    if user_ids:
+        transaction.on_commit(lambda: _invalidate(user_ids))
+
+
+def _project_user_ids(project):
+    return [project.owner_id, *project.team_members.values_list('pk', flat=True)]
+
+
+@receiver(post_save, sender=Project)
+def invalidate_summaries_on_save(sender, instance, **kwargs):
+    """Evict the summaries and access of the project's owner and members."""
+    _invalidate_on_commit(_project_user_ids(instance))
+
+
+@receiver(pre_delete, sender=Project)
+def invalidate_summaries_on_delete(sender, instance, **kwargs):
+    """Evict the owner's and members' caches, read before the memberships are deleted."""
+    _invalidate_on_commit(_project_user_ids(instance))
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def invalidate_summaries_on_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """Evict the summaries and access of users added to or removed from projects."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        # user.team_projects changed: only that user's project set moved
+        forget_project_roles(instance)
+        _invalidate_on_commit([instance.pk])
+    elif action == 'pre_clear':
+        _invalidate_on_commit(instance.team_members.values_list('pk', flat=True))
+    else:
+        _invalidate_on_commit(pk_set or ())
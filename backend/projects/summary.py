@@ -0,0 +1,72 @@
+"""
+Project dashboard summary.
+
+The totals are one conditional aggregate over the user's projects
+(Project.access_filter, no DISTINCT), cached per user and day: the day
+is part of the key because projects become overdue as dates pass.
+Changes to a project or its team members evict the summaries of the
+owner and every member once the change commits (see projects/signals.py).
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Project
+
+logger = logging.getLogger(__name__)
+
+# Default for the PROJECT_SUMMARY_CACHE_TIMEOUT setting
+DEFAULT_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def _cache_key(user_id, today):
+    return f'projects:summary:{user_id}:{today.isoformat()}'
+
+
+def compute_project_summary(user, today):
+    """Return the summary counts for user's projects in one query."""
+    return Project.objects.filter(Project.access_filter(user)).aggregate(
+        total_projects=Count('pk'),
+        active_projects=Count('pk', filter=Q(is_archived=False)),
+        archived_projects=Count('pk', filter=Q(is_archived=True)),
+        overdue_projects=Count('pk', filter=Q(deadline__lt=today)),
+    )
+
+
+def get_project_summary(user):
+    """
+    Return the user's project summary, from the cache when possible.
+
+    Returns:
+        Dict with total_projects, active_projects, archived_projects and
+        overdue_projects
+    """
+    today = timezone.now().date()
+    key = _cache_key(user.pk, today)
+    try:
+        summary = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Could not read project summary cache for user {user.pk}: {str(e)}")
+        return compute_project_summary(user, today)
+
+    if summary is None:
+        summary = compute_project_summary(user, today)
+        try:
+            cache.set(key, summary, getattr(settings, 'PROJECT_SUMMARY_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT))
+        except Exception as e:
+            logger.warning(f"Could not cache project summary for user {user.pk}: {str(e)}")
+    return summary
+
+
+def invalidate_project_summaries(user_ids):
+    """Drop the cached summaries of the given users."""
+    today = timezone.now().date()
+    try:
+        cache.delete_many([_cache_key(user_id, today) for user_id in set(user_ids)])
+    except Exception as e:
+        # A cache outage must never block project writes
+        logger.warning(f"Could not invalidate project summaries for users {user_ids}: {str(e)}")
@@ -4,13 +4,11 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
-from django.utils.decorators import method_decorator
-from django_ratelimit.decorators import ratelimit
 
 from .models import Project
 from .serializers import ProjectSerializer, ProjectListSerializer
 from .permissions import IsProjectOwnerOrTeamMember
+from .summary import get_project_summary
 
 
 class ProjectViewSet(ModelViewSet):
@@ -20,6 +18,7 @@ class ProjectViewSet(ModelViewSet):
     search_fields = ['name', 'description']
     ordering_fields = ['name', 'priority', 'deadline', 'created_at', 'updated_at']
     ordering = ['-created_at']
+    throttle_scopes = {'create': 'project_create'}
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -28,9 +27,12 @@ class ProjectViewSet(ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Project.objects.filter(
-            Q(owner=user) | Q(team_members=user)
-        ).distinct().select_related('owner').prefetch_related('team_members')
+        # Visibility comes from the membership annotation: no M2M join, no DISTINCT
+        queryset = Project.annotate_stats(
+            Project.objects.select_related('owner'), user
+        ).filter(annotated_is_member=True)
+        if self.action != 'list':
+            queryset = queryset.prefetch_related('team_members')
         
         # Filter by archived status
         archived = self.request.query_params.get('archived', None)
@@ -47,7 +49,6 @@ class ProjectViewSet(ModelViewSet):
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
 
-    @method_decorator(ratelimit(key='user', rate='10/m', method='POST'))
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -87,7 +88,7 @@ class ProjectViewSet(ModelViewSet):
             'completed_features': project.completed_features,
             'progress_percentage': project.progress_percentage,
             'is_overdue': project.is_overdue,
-            'team_members_count': project.team_members.count(),
+            'team_members_count': project.team_members_count,
             'created_at': project.created_at,
             'last_updated': project.updated_at,
         }
@@ -97,8 +98,9 @@ class ProjectViewSet(ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_projects(self, request):
         user = request.user
-        owned_projects = Project.objects.filter(owner=user, is_archived=False)
-        team_projects = Project.objects.filter(team_members=user, is_archived=False).exclude(owner=user)
+        projects = Project.annotate_stats(Project.objects.select_related('owner'), user)
+        owned_projects = projects.filter(owner=user, is_archived=False)
+        team_projects = projects.filter(annotated_is_member=True, is_archived=False).exclude(owner=user)
         
         return Response({
             'owned_projects': ProjectListSerializer(
@@ -115,18 +117,4 @@ class ProjectViewSet(ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def dashboard_summary(self, request):
-        user = request.user
-        user_projects = Project.objects.filter(
-            Q(owner=user) | Q(team_members=user)
-        ).distinct()
-        
-        total_projects = user_projects.count()
-        active_projects = user_projects.filter(is_archived=False).count()
-        overdue_projects = sum(1 for p in user_projects if p.is_overdue)
-        
-        return Response({
-            'total_projects': total_projects,
-            'active_projects': active_projects,
-            'archived_projects': total_projects - active_projects,
-            'overdue_projects': overdue_projects,
-        })
\ No newline at end of file
+        return Response(get_project_summary(request.user))
@@ -1,4 +1,12 @@
 #!/bin/bash
+# SERVER_MODE=asgi runs the same app under ASGI (uvicorn workers) with the
+# async read views enabled; the default is the sync WSGI deployment.
 cd /home/jimit/production-projects/track/backend
 export $(grep -v '^#' .env.production | xargs)
+
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    export ASYNC_READ_VIEWS=True
+    exec /tmp/track_venv/bin/gunicorn track_project.asgi:application --bind 127.0.0.1:8000 --workers 3 -k uvicorn.workers.UvicornWorker
+fi
+
 exec /tmp/track_venv/bin/gunicorn track_project.wsgi:application --bind 127.0.0.1:8000 --workers 3
@@ -1,10 +1,36 @@
+import os
 import pytest
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from unittest.mock import patch
+from django.conf import settings
+from django.core.management import call_command
+from django.core import mail
+from django.core.cache import cache
+from django.template import engines
+from django.template.loader import render_to_string
+from django.db import connection
+from django.contrib.auth import authenticate
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from accounts import authentication, outbox, reset_tokens
+from accounts.email_rendering import render_email, render_many
+from accounts.models import DataClearJob, OutboundEmail, PasswordResetToken
+from accounts.tasks import clear_user_data, deliver_emails, run_data_clear_job
+from accounts.utils import send_password_changed_email, send_password_reset_email
+from todos.models import TodoList, Task
+from todos.activity_models import Activity, ActivityType
+from track_project.ratelimit import LocalRateLimiter, get_rate_limiter
+from track_project.throttling import request_throttled
+
 User = get_user_model()
 
 
@@ -137,4 +163,576 @@ class AuthenticationAPITestCase(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['status'], 'healthy')
\ No newline at end of file
+        self.assertEqual(response.data['status'], 'healthy')
+
+
+class ClearUserDataTestCase(APITestCase):
+    """Test cases for the background clear-data job."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.password = 'SecurePassword123!'
+        self.user = User.objects.create_user(email='clear@example.com', password=self.password)
+        self.other_user = User.objects.create_user(email='keep@example.com', password=self.password)
+
+        for index in range(3):
+            todo_list = TodoList.objects.create(user=self.user, name=f'List {index}')
+            for task_index in range(4):
+                Task.objects.create(user=self.user, todo_list=todo_list, title=f'Task {task_index}')
+
+        other_list = TodoList.objects.create(user=self.other_user, name='Other list')
+        Task.objects.create(user=self.other_user, todo_list=other_list, title='Other task')
+
+        self.client.force_authenticate(user=self.user)
+
+    def test_clear_user_data_job_deletes_in_chunks(self):
+        """Test the job deletes the user's rows and records progress."""
+        job = DataClearJob.objects.create(user=self.user)
+        activity_count = Activity.objects.filter(user=self.user).count()
+
+        clear_user_data(job, chunk_size=5)
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, DataClearJob.STATUS_COMPLETED)
+        self.assertEqual(job.progress['tasks'], 12)
+        self.assertEqual(job.progress['todo_lists'], 3)
+        self.assertEqual(job.progress['activities'], activity_count)
+        self.assertIsNotNone(job.finished_at)
+
+        self.assertFalse(Task.objects.filter(user=self.user).exists())
+        self.assertFalse(TodoList.objects.filter(user=self.user).exists())
+        self.assertFalse(Activity.objects.filter(user=self.user).exists())
+        self.assertTrue(User.objects.filter(pk=self.user.pk).exists())
+
+        # Raw deletes bypass the per-row delete activity logging
+        self.assertFalse(Activity.objects.filter(activity_type=ActivityType.TASK_DELETED).exists())
+
+        # Other users' data is untouched
+        self.assertEqual(Task.objects.filter(user=self.other_user).count(), 1)
+        self.assertEqual(TodoList.objects.filter(user=self.other_user).count(), 1)
+
+    def test_clear_user_data_queues_job(self):
+        """Test the endpoint queues a job and returns 202."""
+        with patch('accounts.views.run_data_clear_job.delay') as delay:
+            response = self.client.post(
+                '/api/auth/clear-data/', {'password': self.password}, format='json'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertTrue(response.data['user_preserved'])
+        job = DataClearJob.objects.get(user=self.user)
+        self.assertEqual(response.data['job_id'], str(job.id))
+        self.assertEqual(response.data['status'], DataClearJob.STATUS_PENDING)
+        delay.assert_called_once_with(str(job.id))
+
+        # Nothing is deleted until the worker runs the job
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 12)
+
+    def test_clear_user_data_reuses_active_job(self):
+        """Test a second request returns the job already in progress."""
+        job = DataClearJob.objects.create(user=self.user)
+
+        with patch('accounts.views.run_data_clear_job.delay') as delay:
+            response = self.client.post(
+                '/api/auth/clear-data/', {'password': self.password}, format='json'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['job_id'], str(job.id))
+        delay.assert_not_called()
+
+    def test_clear_user_data_replaces_stale_job(self):
+        """Test a running job whose worker died is failed and replaced, not reused."""
+        stale = DataClearJob.objects.create(user=self.user)
+        stale.mark_running()
+        DataClearJob.objects.filter(pk=stale.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+
+        with patch('accounts.views.run_data_clear_job.delay') as delay:
+            response = self.client.post(
+                '/api/auth/clear-data/', {'password': self.password}, format='json'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertNotEqual(response.data['job_id'], str(stale.id))
+        delay.assert_called_once_with(response.data['job_id'])
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, DataClearJob.STATUS_FAILED)
+
+    def test_stale_job_is_reclaimed_by_worker(self):
+        """Test a redelivered job is run again once its heartbeat is stale."""
+        job = DataClearJob.objects.create(user=self.user)
+        job.mark_running()
+
+        # A live worker holds the job: check back later instead of running it twice
+        with patch.object(run_data_clear_job, 'retry', side_effect=RuntimeError('retry')) as retry:
+            with self.assertRaises(RuntimeError):
+                run_data_clear_job.run(str(job.id))
+        retry.assert_called_once_with(countdown=DataClearJob.stale_seconds())
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 12)
+
+        DataClearJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        run_data_clear_job.run(str(job.id))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, DataClearJob.STATUS_COMPLETED)
+        self.assertFalse(Task.objects.filter(user=self.user).exists())
+
+    def test_clear_user_data_wrong_password(self):
+        """Test a wrong password does not queue a job."""
+        with patch('accounts.views.run_data_clear_job.delay') as delay:
+            response = self.client.post(
+                '/api/auth/clear-data/', {'password': 'wrong'}, format='json'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(DataClearJob.objects.exists())
+        delay.assert_not_called()
+
+    def test_clear_user_data_status(self):
+        """Test polling a job's progress, scoped to its owner."""
+        job = DataClearJob.objects.create(user=self.user)
+        clear_user_data(job)
+
+        response = self.client.get(f'/api/auth/clear-data/{job.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], DataClearJob.STATUS_COMPLETED)
+        self.assertEqual(response.data['deleted_counts']['tasks'], 12)
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(f'/api/auth/clear-data/{job.id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CachedJWTAuthenticationTestCase(APITestCase):
+    """Test cases for the cached JWT user lookup."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        authentication._local_cache.clear()
+        self.client = APIClient()
+        self.password = 'SecurePassword123!'
+        self.user = User.objects.create_user(email='cached@example.com', password=self.password)
+        self.authenticate(RefreshToken.for_user(self.user))
+        self.url = '/api/todolists/summary/'
+
+    def authenticate(self, refresh):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [query for query in queries if '"auth_user"' in query['sql']]
+
+    def test_repeated_requests_skip_user_query(self):
+        """Test only the first request loads the user from the database."""
+        self.assertEqual(len(self.user_queries()), 1)
+        self.assertEqual(self.user_queries(), [])
+
+        # Another process (empty local cache) is served from the shared cache
+        authentication._local_cache.clear()
+        self.assertEqual(self.user_queries(), [])
+
+    def test_password_change_revokes_tokens(self):
+        """Test changing the password rejects old tokens and returns new ones."""
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/auth/change-password/', {
+                'old_password': self.password,
+                'new_password': 'EvenMoreSecure456!',
+                'new_password_confirm': 'EvenMoreSecure456!',
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.data["access"]}')
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_deactivation_evicts_cached_user(self):
+        """Test a deactivated user is rejected on the next request."""
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cache_outage_falls_back_to_database(self):
+        """Test requests still authenticate when the shared cache is down."""
+        broken_cache = mock.Mock()
+        broken_cache.get.side_effect = ConnectionError('cache down')
+        broken_cache.set.side_effect = ConnectionError('cache down')
+        broken_cache.delete.side_effect = ConnectionError('cache down')
+
+        with patch.object(authentication, 'cache', broken_cache):
+            response = self.client.get('/api/auth/profile/')
+            authentication.invalidate_cached_user(self.user.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], self.user.email)
+
+    def test_profile_update_keeps_password(self):
+        """Test saving the profile from a cached user does not touch deferred fields."""
+        self.client.get(self.url)
+        response = self.client.patch('/api/auth/profile/', {'first_name': 'Renamed'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'Renamed')
+        self.assertTrue(self.user.check_password(self.password))
+
+
+class LoginHashingTestCase(TestCase):
+    """Test cases for email lookup and password rehashing on login."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.password = 'SecurePassword123!'
+
+    def test_login_ignores_email_case(self):
+        """Test logins match stored emails case-insensitively."""
+        User.objects.create_user(email='Mixed.Case@Example.com', password=self.password)
+
+        user = authenticate(username='  mixed.case@EXAMPLE.com ', password=self.password)
+
+        self.assertIsNotNone(user)
+        self.assertEqual(user.email, 'Mixed.Case@example.com')
+
+    def test_unknown_email_and_wrong_password(self):
+        """Test failed logins return no user."""
+        User.objects.create_user(email='known@example.com', password=self.password)
+
+        self.assertIsNone(authenticate(username='unknown@example.com', password=self.password))
+        self.assertIsNone(authenticate(username='known@example.com', password='wrong-password'))
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        """Test a password stored with a non-preferred hasher is rehashed on login."""
+        with override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']):
+            user = User.objects.create_user(email='legacy@example.com', password=self.password)
+        self.assertTrue(user.password.startswith('md5$'))
+
+        with override_settings(PASSWORD_HASHERS=[
+            'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+            'django.contrib.auth.hashers.MD5PasswordHasher',
+        ]):
+            self.assertIsNotNone(authenticate(username='legacy@example.com', password=self.password))
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+
+    def test_rehash_on_login_keeps_existing_tokens(self):
+        """Test a login that upgrades the hash does not revoke the user's other sessions."""
+        with override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']):
+            user = User.objects.create_user(email='session@example.com', password=self.password)
+        access = RefreshToken.for_user(user).access_token
+
+        with override_settings(PASSWORD_HASHERS=[
+            'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+            'django.contrib.auth.hashers.MD5PasswordHasher',
+        ]):
+            response = self.client.post(
+                '/api/auth/login/', {'email': 'session@example.com', 'password': self.password},
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+
+        for token in (access, response.json()['access']):
+            response = self.client.get('/api/auth/profile/', HTTP_AUTHORIZATION=f'Bearer {token}')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(PASSWORD_HASH_THREADS=0)
+    def test_inline_hashing(self):
+        """Test hashing works without the thread pool."""
+        user = User.objects.create_user(email='inline@example.com', password=self.password)
+
+        self.assertTrue(user.check_password(self.password))
+
+
+@override_settings(RATE_LIMIT_URL='memory://')
+class RateLimitTestCase(APITestCase):
+    """Test cases for the sliding-window throttles."""
+
+    def setUp(self):
+        """Set up test data."""
+        get_rate_limiter().reset()
+        self.user = User.objects.create_user(email='limited@example.com', password='SecurePassword123!')
+        self.data = {'email': 'limited@example.com', 'password': 'wrong-password'}
+
+    def test_login_rate_limited(self):
+        """Test logins past the scope's rate get 429 with Retry-After."""
+        received = []
+
+        def handler(sender, scope, ident, **kwargs):
+            received.append((scope, ident))
+
+        request_throttled.connect(handler)
+        try:
+            for _ in range(5):
+                response = self.client.post('/api/auth/login/', self.data, format='json')
+                self.assertNotEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            response = self.client.post('/api/auth/login/', self.data, format='json')
+        finally:
+            request_throttled.disconnect(handler)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(received, [('login', 'ip:127.0.0.1')])
+        self.assertEqual(get_rate_limiter().rejection_counts(), {'login': 1})
+
+    def test_forwarded_for_cannot_reset_anonymous_limits(self):
+        """Test a client rotating X-Forwarded-For is still counted by the proxy's address."""
+        for attempt in range(6):
+            # The proxy appends the address it saw after whatever the client sent
+            response = self.client.post(
+                '/api/auth/login/', self.data, format='json',
+                HTTP_X_FORWARDED_FOR=f'10.0.0.{attempt}, 203.0.113.7'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_authenticated_requests_counted_per_user(self):
+        """Test throttled reads are counted per user, not per IP."""
+        other = User.objects.create_user(email='other@example.com', password='SecurePassword123!')
+        limiter = get_rate_limiter()
+        for _ in range(600):
+            limiter.hit('reads', f'user:{self.user.pk}', 600, 60)
+
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get('/api/sync/').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.client.force_authenticate(user=other)
+        self.assertNotEqual(self.client.get('/api/sync/').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_previous_window_weighs_on_current(self):
+        """Test requests from the previous window still count, scaled by overlap."""
+        limiter = LocalRateLimiter()
+        with patch('track_project.ratelimit.time.time', return_value=1000 * 60 + 59):
+            for _ in range(10):
+                self.assertTrue(limiter.hit('scope', 'key', 10, 60)[0])
+        # 15 seconds into the next window, 75% of the previous 10 still count
+        with patch('track_project.ratelimit.time.time', return_value=1001 * 60 + 15):
+            self.assertTrue(limiter.hit('scope', 'key', 10, 60)[0])
+            self.assertTrue(limiter.hit('scope', 'key', 10, 60)[0])
+            allowed, wait = limiter.hit('scope', 'key', 10, 60)
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+
+
+class PasswordResetTokenStoreTestCase(APITestCase):
+    """Test cases for the password reset token stores and sweeper."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        get_rate_limiter().reset()
+        self.user = User.objects.create_user(email='reset@example.com', password='SecurePassword123!')
+
+    def test_database_token_single_use_and_superseded(self):
+        """Test database tokens are invalidated by reuse and by newer tokens."""
+        first = reset_tokens.issue_token(self.user)
+        second = reset_tokens.issue_token(self.user)
+
+        self.assertIsNone(reset_tokens.consume_token(first))
+        self.assertEqual(reset_tokens.consume_token(second, ip_address='10.0.0.1'), self.user)
+        self.assertIsNone(reset_tokens.consume_token(second))
+        self.assertEqual(PasswordResetToken.objects.get(token=second).ip_address, '10.0.0.1')
+
+    @override_settings(PASSWORD_RESET_TOKEN_STORE='cache')
+    def test_cache_token_single_use_and_superseded(self):
+        """Test cache tokens behave like database tokens without creating rows."""
+        first = reset_tokens.issue_token(self.user)
+        second = reset_tokens.issue_token(self.user)
+
+        self.assertIsNone(reset_tokens.consume_token(first))
+        self.assertIsNone(reset_tokens.consume_token('unknown-token'))
+        self.assertEqual(reset_tokens.consume_token(second), self.user)
+        self.assertIsNone(reset_tokens.consume_token(second))
+        self.assertFalse(PasswordResetToken.objects.exists())
+
+    @override_settings(PASSWORD_RESET_TOKEN_STORE='cache')
+    @patch('accounts.views.send_password_reset_email')
+    def test_reset_flow_with_cache_store(self, mock_send):
+        """Test the reset endpoints work end to end with the cache store."""
+        response = self.client.post('/api/auth/password-reset/', {'email': self.user.email}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        token = mock_send.call_args[0][1]
+
+        data = {'token': token, 'new_password': 'NewSecurePassword123!', 'new_password_confirm': 'NewSecurePassword123!'}
+        response = self.client.post('/api/auth/password-reset/confirm/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('NewSecurePassword123!'))
+
+        response = self.client.post('/api/auth/password-reset/confirm/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_sweep_deletes_expired_and_used_tokens(self):
+        """Test the sweeper keeps only live tokens."""
+        used = reset_tokens.issue_token(self.user)
+        reset_tokens.consume_token(used)
+        expired = PasswordResetToken.objects.create_token_for_user(self.user)
+        PasswordResetToken.objects.filter(pk=expired.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+        other = User.objects.create_user(email='other-reset@example.com', password='SecurePassword123!')
+        live = reset_tokens.issue_token(other)
+
+        out = StringIO()
+        call_command('sweep_reset_tokens', '--chunk-size', '1', stdout=out)
+
+        self.assertIn('Deleted 2', out.getvalue())
+        self.assertEqual(list(PasswordResetToken.objects.values_list('token', flat=True)), [live])
+
+
+class EmailOutboxTestCase(TestCase):
+    """Test cases for background email delivery through the outbox."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(email='outbox@example.com', password='SecurePassword123!')
+
+    def test_emails_are_queued_not_sent(self):
+        """Test sending an email only queues it and schedules delivery after commit."""
+        with patch('accounts.tasks.deliver_emails.apply_async') as mock_apply:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertTrue(send_password_reset_email(self.user, 'reset-token'))
+                mock_apply.assert_not_called()
+
+        mock_apply.assert_called_once()
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.status, OutboundEmail.STATUS_PENDING)
+        self.assertEqual(email.template, 'emails/password_reset')
+        self.assertIn('reset-token', email.context['reset_url'])
+        self.assertNotIn('reset_token', email.context)
+
+    def test_finished_emails_drop_their_context(self):
+        """Test reset links are not kept in the outbox once an email is sent or failed."""
+        send_password_reset_email(self.user, 'sent-token')
+        outbox.deliver_due_emails()
+        self.assertIn('sent-token', mail.outbox[0].body)
+
+        send_password_reset_email(self.user, 'failed-token')
+        with override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=1):
+            with patch('accounts.outbox.EmailMultiAlternatives.send', side_effect=OSError('SMTP down')):
+                outbox.deliver_due_emails()
+
+        self.assertEqual(
+            sorted(OutboundEmail.objects.values_list('status', 'context')),
+            [(OutboundEmail.STATUS_FAILED, {}), (OutboundEmail.STATUS_SENT, {})],
+        )
+
+    def test_broker_down_keeps_emails_queued(self):
+        """Test a failure to reach the broker leaves the email in the outbox."""
+        with patch('accounts.tasks.deliver_emails.apply_async', side_effect=ConnectionError('refused')):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertTrue(send_password_changed_email(self.user))
+
+        self.assertEqual(OutboundEmail.objects.get().status, OutboundEmail.STATUS_PENDING)
+
+    def test_delivery_task_does_not_reschedule_itself(self):
+        """Test pending retries are left to the periodic run instead of a new task chain."""
+        send_password_changed_email(self.user)
+
+        with patch('accounts.outbox.EmailMultiAlternatives.send', side_effect=OSError('SMTP down')), \
+                patch('accounts.tasks.deliver_emails.apply_async') as mock_apply:
+            deliver_emails()
+
+        mock_apply.assert_not_called()
+        self.assertEqual(OutboundEmail.objects.get().status, OutboundEmail.STATUS_PENDING)
+        self.assertEqual(
+            settings.CELERY_BEAT_SCHEDULE['deliver-emails']['task'], 'accounts.tasks.deliver_emails'
+        )
+
+    def test_batch_is_sent_over_one_connection(self):
+        """Test due emails are rendered and sent over a single connection per batch."""
+        for _ in range(3):
+            send_password_changed_email(self.user)
+
+        with patch('accounts.outbox.get_connection', wraps=outbox.get_connection) as mock_connection:
+            sent = outbox.deliver_due_emails(batch_size=10)
+
+        self.assertEqual(sent, 3)
+        mock_connection.assert_called_once()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn('password for your Track account was just changed', mail.outbox[0].body)
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+        self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmail.STATUS_SENT).exists())
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_SECONDS=60)
+    def test_failed_sends_back_off_then_give_up(self):
+        """Test failed sends are retried later and marked failed after the last attempt."""
+        send_password_changed_email(self.user)
+
+        with patch('accounts.outbox.EmailMultiAlternatives.send', side_effect=OSError('SMTP down')):
+            self.assertEqual(outbox.deliver_due_emails(), 0)
+            email = OutboundEmail.objects.get()
+            self.assertEqual(email.status, OutboundEmail.STATUS_PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertEqual(email.last_error, 'SMTP down')
+            self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=50))
+
+            # Not due yet
+            self.assertEqual(outbox.deliver_due_emails(), 0)
+            self.assertEqual(OutboundEmail.objects.get().attempts, 1)
+
+            OutboundEmail.objects.update(next_attempt_at=timezone.now())
+            outbox.deliver_due_emails()
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.STATUS_FAILED)
+        self.assertEqual(email.attempts, 2)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_file_backend_and_command(self):
+        """Test the deliver_emails command with the file-based backend."""
+        send_password_changed_email(self.user)
+
+        with tempfile.TemporaryDirectory() as path:
+            with override_settings(
+                EMAIL_BACKEND='django.core.mail.backends.filebased.EmailBackend', EMAIL_FILE_PATH=path
+            ):
+                out = StringIO()
+                call_command('deliver_emails', stdout=out)
+                self.assertEqual(len(os.listdir(path)), 1)
+
+        self.assertIn('Sent 1 emails', out.getvalue())
+        self.assertEqual(OutboundEmail.objects.get().status, OutboundEmail.STATUS_SENT)
+
+
+class EmailRenderingTestCase(TestCase):
+    """Test cases for cached email template rendering."""
+
+    def test_email_templates_are_warmed(self):
+        """Test email templates are compiled into the cached loader at startup."""
+        loader = engines['django'].engine.template_loaders[0]
+
+        self.assertIn('emails/password_reset.html', loader.get_template_cache)
+
+    def test_render_matches_render_to_string(self):
+        """Test cached rendering produces the same output as render_to_string."""
+        context = {
+            'user': User(email='render@example.com', first_name='<Ada>'),
+            'site_name': 'Track',
+            'support_email': 'support@example.com',
+        }
+
+        text, html = render_email('emails/password_changed', context)
+
+        self.assertEqual(text, render_to_string('emails/password_changed.txt', context))
+        self.assertEqual(html, render_to_string('emails/password_changed.html', context))
+        self.assertIn('&lt;Ada&gt;', html)
+
+    def test_render_many_keeps_contexts_apart(self):
+        """Test values from one recipient's context do not leak into the next."""
+        contexts = [
+            {'user': User(email='first@example.com', first_name='First'), 'site_name': 'Track', 'site_url': 'https://a'},
+            {'user': User(email='second@example.com'), 'site_name': 'Track'},
+        ]
+
+        (first_text, _), (second_text, _) = render_many('emails/welcome', contexts)
+
+        self.assertIn('Hi First,', first_text)
+        self.assertIn('Hi second@example.com,', second_text)
+        self.assertNotIn('https://a', second_text)
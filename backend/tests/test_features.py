@@ -1,7 +1,9 @@
 import pytest
+from django.core.cache import cache
 from django.test import TestCase
 from django.contrib.auth import get_user_model
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
+from rest_framework.request import Request
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.utils import timezone
@@ -10,8 +12,10 @@ import uuid
 import tempfile
 from django.core.files.uploadedfile import SimpleUploadedFile
 
+from projects.access import get_accessible_project_ids
 from projects.models import Project
 from features.models import Feature, FeatureComment, FeatureAttachment
+from features.views import FeatureViewSet
 
 User = get_user_model()
 
@@ -256,6 +260,23 @@ class FeatureAPITestCase(APITestCase):
         self.assertEqual(response.data['reporter']['id'], self.user1.id)
         self.assertEqual(response.data['assignee']['id'], self.user2.id)
 
+    def test_list_queryset_uses_cached_project_access(self):
+        """Test the list queryset filters on cached project ids and annotates counts."""
+        cache.clear()
+        self.project.team_members.add(self.user2)
+        view = FeatureViewSet(action='list', format_kwarg=None)
+        view.request = Request(APIRequestFactory().get('/api/features/'))
+        view.request.user = self.user2
+
+        view.get_queryset()
+        # The project ids come from the cache once read
+        with self.assertNumQueries(0):
+            sql = str(view.get_queryset().query)
+        self.assertNotIn('DISTINCT', sql)
+        self.assertNotIn('team_members', sql)
+        self.assertIn('annotated_comments_count', sql)
+        self.assertEqual(get_accessible_project_ids(self.user2), {self.project.pk})
+
     def test_create_feature_invalid_title(self):
         """Test feature creation with invalid title."""
         self.authenticate_user(self.user1)
@@ -1,5 +1,9 @@
 import pytest
+from unittest.mock import patch
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
@@ -8,6 +12,8 @@ from django.utils import timezone
 from datetime import date, timedelta
 import uuid
 
+from projects import access
+from projects.access import ROLE_MEMBER, ROLE_OWNER, get_accessible_project_ids, get_project_roles
 from projects.models import Project
 
 User = get_user_model()
@@ -18,6 +24,7 @@ class ProjectModelTestCase(TestCase):
 
     def setUp(self):
         """Set up test data."""
+        cache.clear()
         self.user1 = User.objects.create_user(
             email='owner@example.com',
             password='testpass123',
@@ -90,6 +97,7 @@ class ProjectAPITestCase(APITestCase):
 
     def setUp(self):
         """Set up test data."""
+        cache.clear()
         self.client = APIClient()
         self.user1 = User.objects.create_user(
             email='owner@example.com',
@@ -175,6 +183,31 @@ class ProjectAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 2)
 
+    def test_list_projects_annotations(self):
+        """Test list rows read counts and can_edit from annotations, not per-row queries."""
+        self.authenticate_user(self.user1)
+        project = Project.objects.create(name='Counted', owner=self.user2)
+        project.team_members.add(self.user1, self.user3)
+
+        url = '/api/projects/'
+        self.client.get(url)  # Caches the authenticated user
+        with CaptureQueriesContext(connection) as one_project:
+            response = self.client.get(url)
+
+        row = response.data['results'][0]
+        self.assertEqual(row['total_features'], 0)
+        self.assertEqual(row['progress_percentage'], 0)
+        self.assertEqual(row['team_members_count'], 2)
+        self.assertTrue(row['can_edit'])
+
+        for i in range(3):
+            Project.objects.create(name=f'Owned {i}', owner=self.user1).team_members.add(self.user2)
+        with CaptureQueriesContext(connection) as four_projects:
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertEqual(len(four_projects), len(one_project))
+
     def test_retrieve_project(self):
         """Test retrieving a specific project."""
         self.authenticate_user(self.user1)
@@ -313,6 +346,91 @@ class ProjectAPITestCase(APITestCase):
         self.assertEqual(response.data['active_projects'], 1)
         self.assertEqual(response.data['archived_projects'], 1)
 
+    def test_dashboard_summary_cached_until_projects_change(self):
+        """Test the summary is one aggregate query, cached until a project or its team changes."""
+        self.authenticate_user(self.user1)
+        Project.objects.create(name='Overdue Project', owner=self.user1, deadline=date.today() - timedelta(days=1))
+        shared = Project.objects.create(name='Shared Project', owner=self.user2, is_archived=True)
+        shared.team_members.add(self.user1, self.user3)
+        Project.objects.create(name='Not Mine', owner=self.user3)
+
+        url = '/api/projects/dashboard_summary/'
+        with CaptureQueriesContext(connection) as miss:
+            response = self.client.get(url)
+        self.assertEqual(response.data, {
+            'total_projects': 2, 'active_projects': 1, 'archived_projects': 1, 'overdue_projects': 1,
+        })
+
+        with CaptureQueriesContext(connection) as hit:
+            self.client.get(url)
+        def project_queries(context):
+            return [query for query in context.captured_queries if 'projects_project' in query['sql']]
+
+        self.assertEqual(len(project_queries(miss)), 1)
+        self.assertEqual(project_queries(hit), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            shared.team_members.remove(self.user1)
+        self.assertEqual(self.client.get(url).data['total_projects'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(name='New Project', owner=self.user1)
+        self.assertEqual(self.client.get(url).data['active_projects'], 2)
+
+    def test_accessible_project_ids_cached_until_team_changes(self):
+        """Test a user's accessible project ids are cached and evicted on team changes."""
+        owned = Project.objects.create(name='Owned Project', owner=self.user1)
+        shared = Project.objects.create(name='Shared Project', owner=self.user2)
+        Project.objects.create(name='Not Mine', owner=self.user3)
+        with self.captureOnCommitCallbacks(execute=True):
+            shared.team_members.add(self.user1)
+
+        self.assertEqual(get_project_roles(self.user1), {owned.pk: ROLE_OWNER, shared.pk: ROLE_MEMBER})
+        # Later requests get a fresh user object and read the shared cache
+        user = User.objects.get(pk=self.user1.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_accessible_project_ids(user), {owned.pk, shared.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user1.team_projects.remove(shared)
+        self.assertEqual(get_accessible_project_ids(self.user1), {owned.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            owned.delete()
+        self.assertEqual(get_accessible_project_ids(User.objects.get(pk=self.user1.pk)), set())
+
+    def test_roles_read_before_a_removal_commits_are_not_cached(self):
+        """Test a reader racing a membership removal cannot cache the old roles."""
+        shared = Project.objects.create(name='Shared Project', owner=self.user2)
+        with self.captureOnCommitCallbacks(execute=True):
+            shared.team_members.add(self.user1)
+        real_compute = access.compute_project_roles
+
+        def compute_then_remove(user):
+            # The removal commits after the reader queried, before it caches
+            roles = real_compute(user)
+            with self.captureOnCommitCallbacks(execute=True):
+                shared.team_members.remove(self.user1)
+            return roles
+
+        with patch.object(access, 'compute_project_roles', compute_then_remove):
+            self.assertIn(shared.pk, get_project_roles(User.objects.get(pk=self.user1.pk)))
+
+        self.assertFalse(shared.can_user_edit(User.objects.get(pk=self.user1.pk)))
+
+    def test_can_user_edit_is_a_role_lookup(self):
+        """Test can_user_edit reads the user's roles once, then needs no queries."""
+        projects = [Project.objects.create(name=f'Team Project {i}', owner=self.user2) for i in range(3)]
+        for project in projects[:2]:
+            project.team_members.add(self.user1)
+        other = Project.objects.create(name='Other Project', owner=self.user3)
+
+        with self.assertNumQueries(1):
+            self.assertEqual([p.can_user_edit(self.user1) for p in projects], [True, True, False])
+        with self.assertNumQueries(0):
+            self.assertFalse(other.can_user_edit(self.user1))
+            self.assertTrue(other.can_user_edit(self.user3))
+
     def test_project_filtering(self):
         """Test project filtering by priority and archived status."""
         self.authenticate_user(self.user1)
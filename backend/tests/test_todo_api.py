@@ -2,15 +2,38 @@
 Test cases for Todo API endpoints.
 """
 
+import csv
+import io
+import json
+import os
+import tempfile
 from datetime import date, timedelta
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from todos.models import TodoList, Task, TaskPriority, TaskStatus
+from todos.models import TodoList, Task, TaskPriority, TaskStatus, Tombstone, IdempotencyRecord
+from todos.sync import make_sync_token
+from todos.activity_models import Activity, ActivityType
+from todos import async_views
+from todos.importers import ImportFormatError, import_tasks, iter_rows
+from todos import reminders
+from todos.reminders import iter_due_tasks, send_deadline_digests
+from accounts.models import OutboundEmail
+from accounts.outbox import deliver_due_emails
+from track_project import idempotency
 
 User = get_user_model()
 
@@ -156,8 +179,22 @@ class TodoListAPITest(TestCase):
         }
         
         response = self.client.post(url, data, format='json')
-        
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('name', response.json())
+        self.assertEqual(TodoList.objects.filter(user=self.user1, name='Work Tasks').count(), 1)
+
+    def test_update_todo_list_duplicate_name(self):
+        """Test renaming a todo list to a name the user already uses."""
+        self.authenticate_user1()
+        url = reverse('todolist-detail', args=[self.todo_list2.id])
+
+        response = self.client.patch(url, {'name': 'Work Tasks'}, format='json')
+
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('name', response.json())
+        self.todo_list2.refresh_from_db()
+        self.assertEqual(self.todo_list2.name, 'Personal Tasks')
 
     def test_retrieve_todo_list(self):
         """Test retrieving a specific todo list."""
@@ -242,6 +279,54 @@ class TodoListAPITest(TestCase):
         # Verify the todo list was deleted
         self.assertFalse(TodoList.objects.filter(id=self.todo_list2.id).exists())
 
+    def test_delete_todo_list_summarizes_tasks(self):
+        """Test deleting a list logs one summary activity instead of one per task."""
+        self.authenticate_user1()
+        for index in range(5):
+            Task.objects.create(user=self.user1, todo_list=self.todo_list2, title=f'Cascade {index}')
+        task_count = self.todo_list2.tasks.count()
+
+        url = reverse('todolist-detail', args=[self.todo_list2.id])
+        response = self.client.delete(url)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Task.objects.filter(todo_list_id=self.todo_list2.id).exists())
+        self.assertFalse(Activity.objects.filter(activity_type=ActivityType.TASK_DELETED).exists())
+
+        summary = Activity.objects.get(activity_type=ActivityType.TASKS_DELETED)
+        self.assertEqual(summary.user, self.user1)
+        self.assertEqual(summary.todo_list_id, self.todo_list2.id)
+        self.assertEqual(summary.context['count'], task_count)
+        self.assertEqual(len(summary.context['tasks']), task_count)
+        self.assertTrue(
+            Activity.objects.filter(
+                activity_type=ActivityType.TODO_LIST_DELETED, todo_list_id=self.todo_list2.id
+            ).exists()
+        )
+
+    def test_delete_todo_list_query_count_independent_of_tasks(self):
+        """Test the number of queries for a list delete does not grow with its tasks."""
+        small = TodoList.objects.create(user=self.user1, name='Small')
+        large = TodoList.objects.create(user=self.user1, name='Large')
+        Task.objects.create(user=self.user1, todo_list=small, title='Only task')
+        for index in range(25):
+            Task.objects.create(user=self.user1, todo_list=large, title=f'Task {index}')
+
+        with CaptureQueriesContext(connection) as small_queries:
+            small.delete()
+        with CaptureQueriesContext(connection) as large_queries:
+            large.delete()
+
+        self.assertEqual(len(large_queries), len(small_queries))
+
+        # Deleting a single task afterwards is logged individually again
+        task = Task.objects.create(user=self.user1, todo_list=self.todo_list1, title='Single')
+        task_id = task.id
+        task.delete()
+        self.assertTrue(
+            Activity.objects.filter(activity_type=ActivityType.TASK_DELETED, task_id=task_id).exists()
+        )
+
     def test_delete_other_user_todo_list(self):
         """Test deleting todo list owned by different user."""
         self.authenticate_user1()
@@ -277,6 +362,18 @@ class TodoListAPITest(TestCase):
         self.assertEqual(data['count'], 1)
         self.assertEqual(data['results'][0]['name'], 'Work Tasks')
 
+    def test_filter_todo_lists_by_name_prefix(self):
+        """Test case-insensitive prefix filtering on todo list names."""
+        self.authenticate_user1()
+        url = reverse('todolist-list')
+        response = self.client.get(url, {'name_prefix': 'pers'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['results'][0]['name'], 'Personal Tasks')
+
     def test_ordering_todo_lists(self):
         """Test ordering todo lists by creation date."""
         self.authenticate_user1()
@@ -462,4 +559,952 @@ class TaskAPITest(TestCase):
         data = response.json()
         
         self.assertEqual(data['count'], 1)
-        self.assertEqual(data['results'][0]['title'], 'Important Task')
\ No newline at end of file
+        self.assertEqual(data['results'][0]['title'], 'Important Task')
+
+    def test_export_tasks_csv(self):
+        """Test streaming a CSV export of the user's tasks."""
+        self.authenticate_user1()
+        url = reverse('task-export')
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment;', response['Content-Disposition'])
+
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual({row['title'] for row in rows}, {'Important Task', 'Completed Task'})
+        self.assertEqual({row['todo_list_name'] for row in rows}, {'Work List'})
+
+    def test_export_tasks_ndjson_with_filters(self):
+        """Test NDJSON export honours the list filters."""
+        self.authenticate_user1()
+        url = reverse('task-export')
+        response = self.client.get(url, {'export_format': 'ndjson', 'status': 'done'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        records = [json.loads(line) for line in lines]
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['title'], 'Completed Task')
+        self.assertEqual(records[0]['id'], str(self.task2.id))
+
+    def test_export_tasks_invalid_format(self):
+        """Test unsupported export formats are rejected."""
+        self.authenticate_user1()
+        url = reverse('task-export')
+        response = self.client.get(url, {'export_format': 'xlsx'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_activities(self):
+        """Test streaming the activity history only includes the user's rows."""
+        self.authenticate_user1()
+        url = reverse('activity-export')
+        response = self.client.get(url, {'export_format': 'ndjson'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        records = [json.loads(line) for line in lines]
+
+        task_ids = {record['task_id'] for record in records if record['task_id']}
+        self.assertEqual(task_ids, {str(self.task1.id), str(self.task2.id)})
+
+class TaskCalendarAPITest(TestCase):
+    """Test cases for the task calendar feed endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            email='calendar@example.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            email='other@example.com',
+            password='testpass123'
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        )
+
+        self.todo_list = TodoList.objects.create(name='Calendar List', user=self.user)
+        other_list = TodoList.objects.create(name='Other List', user=self.other_user)
+
+        self.spanning_task = Task.objects.create(
+            title='Spanning Task',
+            start_date=date(2025, 8, 30),
+            end_date=date(2025, 9, 2),
+            todo_list=self.todo_list,
+            user=self.user
+        )
+        self.due_only_task = Task.objects.create(
+            title='Due Only Task',
+            end_date=date(2025, 9, 10),
+            todo_list=self.todo_list,
+            user=self.user
+        )
+        Task.objects.create(
+            title='Outside Window',
+            start_date=date(2025, 10, 5),
+            end_date=date(2025, 10, 6),
+            todo_list=self.todo_list,
+            user=self.user
+        )
+        Task.objects.create(title='Undated Task', todo_list=self.todo_list, user=self.user)
+        Task.objects.create(
+            title='Other User Task',
+            end_date=date(2025, 9, 10),
+            todo_list=other_list,
+            user=self.other_user
+        )
+
+        self.url = reverse('task-calendar')
+
+    def test_calendar_buckets_overlapping_tasks(self):
+        """Test tasks overlapping the window are bucketed per day."""
+        response = self.client.get(self.url, {'from': '2025-09-01', 'to': '2025-09-30'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+
+        spanning_id = str(self.spanning_task.id)
+        due_only_id = str(self.due_only_task.id)
+        self.assertEqual(set(data['tasks']), {spanning_id, due_only_id})
+        self.assertEqual(data['days'], {
+            '2025-09-01': [spanning_id],
+            '2025-09-02': [spanning_id],
+            '2025-09-10': [due_only_id],
+        })
+
+    def test_calendar_reflects_task_changes(self):
+        """Test cached months are invalidated when a task changes."""
+        params = {'from': '2025-09-01', 'to': '2025-09-30'}
+        self.client.get(self.url, params)
+
+        self.due_only_task.end_date = date(2025, 9, 12)
+        self.due_only_task.save()
+
+        data = self.client.get(self.url, params).json()
+        self.assertEqual(data['days']['2025-09-12'], [str(self.due_only_task.id)])
+        self.assertNotIn('2025-09-10', data['days'])
+
+    def test_calendar_rejects_invalid_range(self):
+        """Test invalid or oversized windows are rejected."""
+        response = self.client.get(self.url, {'from': '2025-09-30', 'to': '2025-09-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(self.url, {'from': '2025-01-01', 'to': '2025-12-31'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(self.url, {'from': 'not-a-date'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskImportAPITest(TestCase):
+    """Test cases for bulk task import."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            email='importer@example.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            email='other@example.com',
+            password='testpass123'
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        )
+
+        self.todo_list = TodoList.objects.create(name='Inbox', user=self.user)
+        self.other_list = TodoList.objects.create(name='Other Inbox', user=self.other_user)
+        self.url = reverse('task-import-tasks')
+
+    def upload(self, name, content, **data):
+        data['file'] = SimpleUploadedFile(name, content.encode())
+        return self.client.post(self.url, data, format='multipart')
+
+    def test_import_csv_reports_row_errors(self):
+        """Test valid CSV rows are created and invalid rows reported."""
+        content = (
+            'title,priority,status,start_date,end_date,todo_list\n'
+            f'First,high,todo,2025-09-01,2025-09-03,{self.todo_list.id}\n'
+            f'Bad dates,low,todo,2025-09-05,2025-09-01,{self.todo_list.id}\n'
+            f'Finished,,done,,,{self.todo_list.id}\n'
+            f'Not mine,,,,,{self.other_list.id}\n'
+        )
+        response = self.upload('tasks.csv', content)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = response.json()
+        self.assertEqual(data['created'], 2)
+        self.assertEqual(data['error_count'], 2)
+        self.assertEqual([error['row'] for error in data['errors']], [2, 4])
+
+        tasks = Task.objects.filter(user=self.user)
+        self.assertEqual(set(tasks.values_list('title', flat=True)), {'First', 'Finished'})
+        self.assertIsNotNone(tasks.get(title='Finished').completed_at)
+
+        activities = Activity.objects.filter(user=self.user)
+        self.assertFalse(activities.filter(activity_type=ActivityType.TASK_CREATED).exists())
+        imported = activities.get(activity_type=ActivityType.TASKS_IMPORTED)
+        self.assertEqual(imported.context['count'], 2)
+
+    def test_import_ndjson_with_list_names_and_default_list(self):
+        """Test NDJSON rows can target lists by name or fall back to a default."""
+        TodoList.objects.create(name='Work', user=self.user)
+        content = (
+            '{"title": "Named list", "todo_list_name": "Work"}\n'
+            '\n'
+            '{"title": "Default list"}\n'
+        )
+        response = self.upload('tasks.ndjson', content, todo_list=str(self.todo_list.id))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['created'], 2)
+        self.assertEqual(Task.objects.get(title='Named list').todo_list.name, 'Work')
+        self.assertEqual(Task.objects.get(title='Default list').todo_list, self.todo_list)
+
+    def test_import_dry_run_creates_nothing(self):
+        """Test dry runs validate without inserting tasks or activities."""
+        content = f'title,todo_list\nOnly checked,{self.todo_list.id}\n'
+        response = self.upload('tasks.csv', content, dry_run='true')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['created'], 1)
+        self.assertFalse(Task.objects.filter(user=self.user).exists())
+        self.assertFalse(
+            Activity.objects.filter(activity_type=ActivityType.TASKS_IMPORTED).exists()
+        )
+
+    def test_import_invalid_json(self):
+        """Test malformed files are rejected."""
+        response = self.upload('tasks.json', '{"title": "not an array"}')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('file', response.json())
+
+    def test_import_parse_error_rolls_back_earlier_batches(self):
+        """Test a malformed line after committed-size batches leaves nothing behind."""
+        content = '{"title": "First"}\n{"title": "Second"}\nnot json\n'
+
+        with self.assertRaises(ImportFormatError):
+            import_tasks(
+                self.user, iter_rows(io.StringIO(content), 'ndjson'),
+                default_todo_list=self.todo_list, batch_size=1
+            )
+
+        self.assertFalse(Task.objects.filter(user=self.user).exists())
+        self.assertFalse(
+            Activity.objects.filter(activity_type=ActivityType.TASKS_IMPORTED).exists()
+        )
+
+    def test_import_tasks_command(self):
+        """Test the import_tasks management command."""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write('title\nFrom command\n')
+        self.addCleanup(os.remove, handle.name)
+
+        out = io.StringIO()
+        call_command(
+            'import_tasks', handle.name,
+            user_email=self.user.email, todo_list='Inbox', stdout=out
+        )
+
+        self.assertIn('Imported 1 tasks', out.getvalue())
+        self.assertTrue(Task.objects.filter(title='From command', todo_list=self.todo_list).exists())
+
+
+class ActivityFeedAPITest(TestCase):
+    """Test cases for activity coalescing and daily rollups."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            email='feed@example.com',
+            password='testpass123'
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        )
+
+        self.todo_list = TodoList.objects.create(name='Feed', user=self.user)
+        self.task = Task.objects.create(title='Draft', todo_list=self.todo_list, user=self.user)
+
+    def updates(self):
+        return Activity.objects.filter(task_id=self.task.id, activity_type=ActivityType.TASK_UPDATED)
+
+    def test_repeated_updates_are_coalesced(self):
+        """Test repeated updates within the window merge into one activity."""
+        for index in range(5):
+            self.task.title = f'Draft {index}'
+            self.task.save()
+        self.task.priority = TaskPriority.HIGH
+        self.task.save()
+
+        self.assertEqual(self.updates().count(), 1)
+        activity = self.updates().get()
+        self.assertEqual(activity.task_title, 'Draft 4')
+        self.assertEqual(activity.context['changes'], ['title', 'priority'])
+        self.assertEqual(activity.context['update_count'], 6)
+        self.assertEqual(activity.context['priority'], TaskPriority.HIGH)
+
+    def test_updates_outside_window_are_not_coalesced(self):
+        """Test updates separated by the window or another activity get their own rows."""
+        self.task.title = 'First edit'
+        self.task.save()
+        self.updates().update(timestamp=timezone.now() - timedelta(hours=1))
+
+        self.task.title = 'Second edit'
+        self.task.save()
+        self.assertEqual(self.updates().count(), 2)
+
+        # A completion in between starts a new update activity afterwards
+        self.task.status = TaskStatus.DONE
+        self.task.save()
+        self.task.title = 'Third edit'
+        self.task.save()
+        self.assertEqual(self.updates().count(), 3)
+
+    def test_daily_rollups(self):
+        """Test the daily endpoint counts activities per day and type."""
+        self.task.title = 'Edited'
+        self.task.save()
+        Activity.objects.create(
+            user=self.user,
+            activity_type=ActivityType.TASK_CREATED,
+            title='Old',
+            timestamp=timezone.now() - timedelta(days=2)
+        )
+        Activity.objects.create(
+            user=self.user,
+            activity_type=ActivityType.TASK_CREATED,
+            title='Too old',
+            timestamp=timezone.now() - timedelta(days=30)
+        )
+
+        response = self.client.get(reverse('activity-daily'), {'days': 7})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual(len(results), 2)
+        today = results[0]
+        self.assertEqual(today['date'], timezone.localdate())
+        self.assertEqual(today['counts'][ActivityType.TASK_UPDATED], 1)
+        self.assertEqual(today['counts'][ActivityType.TASK_CREATED], 1)
+        self.assertEqual(today['total'], sum(today['counts'].values()))
+        self.assertEqual(results[1]['counts'], {ActivityType.TASK_CREATED: 1})
+
+
+@override_settings(EVENT_BUS_URL='memory://')
+class EventStreamTest(TestCase):
+    """Test cases for live change events and the SSE stream."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email='events@example.com',
+            password='testpass123'
+        )
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.todo_list = TodoList.objects.create(name='Live', user=self.user)
+
+    def test_task_changes_publish_events_after_commit(self):
+        """Test saving a task publishes created/updated events on commit."""
+        with patch('track_project.events.get_event_bus') as get_bus:
+            with self.captureOnCommitCallbacks(execute=True):
+                task = Task.objects.create(title='Live task', todo_list=self.todo_list, user=self.user)
+            with self.captureOnCommitCallbacks(execute=True):
+                task.title = 'Renamed'
+                task.save()
+
+        events = [json.loads(call.args[1]) for call in get_bus.return_value.publish.call_args_list]
+        self.assertCountEqual(
+            [event['type'] for event in events],
+            ['task.created', 'activity.created', 'task.updated', 'activity.created']
+        )
+        updated = next(event for event in events if event['type'] == 'task.updated')
+        self.assertEqual(updated['id'], str(task.id))
+        self.assertEqual(updated['changes'], ['title'])
+        for call in get_bus.return_value.publish.call_args_list:
+            self.assertEqual(call.args[0], self.user.id)
+
+    def test_redis_publish_times_out(self):
+        """Test the Redis publish client is bounded by PUBLISH_TIMEOUT."""
+        from track_project.events import PUBLISH_TIMEOUT, RedisEventBus
+
+        with patch('redis.Redis.from_url') as from_url:
+            RedisEventBus('redis://127.0.0.1:6379/1').publish(self.user.id, '{}')
+
+        self.assertEqual(from_url.call_args.kwargs['socket_timeout'], PUBLISH_TIMEOUT)
+        self.assertEqual(from_url.call_args.kwargs['socket_connect_timeout'], PUBLISH_TIMEOUT)
+
+    def test_stream_requires_asgi(self):
+        """Test the stream refuses to run under WSGI."""
+        response = self.client.get(reverse('event-stream'), {'token': self.token})
+        self.assertEqual(response.status_code, 501)
+
+    async def test_stream_rejects_invalid_token(self):
+        """Test the stream requires a valid access token."""
+        response = await self.async_client.get(reverse('event-stream'), {'token': 'invalid'})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_delivers_published_events(self):
+        """Test published events reach the user's open stream."""
+        from track_project.events import get_event_bus
+
+        response = await self.async_client.get(reverse('event-stream'), {'token': self.token})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        content = response.streaming_content
+        self.assertIn(b'retry:', await content.__anext__())
+
+        get_event_bus().publish(self.user.id, json.dumps({'type': 'task.updated'}))
+        self.assertEqual(await content.__anext__(), b'data: {"type": "task.updated"}\n\n')
+        await content.aclose()
+
+
+class AsyncReadViewsTest(TestCase):
+    """Test the async read views match the DRF actions they replace."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.factory = AsyncRequestFactory()
+
+        self.user = User.objects.create_user(
+            email='async@example.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            email='async-other@example.com',
+            password='testpass123'
+        )
+        token = str(RefreshToken.for_user(self.user).access_token)
+        self.auth_header = f'Bearer {token}'
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth_header)
+
+        today = date.today()
+        self.todo_list = TodoList.objects.create(name='Async', user=self.user)
+        TodoList.objects.create(name='Empty', user=self.user)
+        other_list = TodoList.objects.create(name='Other', user=self.other_user)
+        for index, (end_date, task_status) in enumerate([
+            (today, TaskStatus.TODO),
+            (today - timedelta(days=2), TaskStatus.ONGOING),
+            (today + timedelta(days=3), TaskStatus.TODO),
+            (today - timedelta(days=1), TaskStatus.DONE),
+            (None, TaskStatus.TODO),
+        ]):
+            Task.objects.create(
+                title=f'Task {index}', todo_list=self.todo_list, user=self.user,
+                end_date=end_date, status=task_status
+            )
+        Task.objects.create(title='Not mine', todo_list=other_list, user=self.other_user, end_date=today)
+
+    async def call(self, view, path, data=None, authenticated=True):
+        headers = {'Authorization': self.auth_header} if authenticated else {}
+        response = await view(self.factory.get(path, data or {}, headers=headers))
+        return response.status_code, json.loads(response.content)
+
+    def assert_matches_sync(self, view, path, data=None):
+        status_code, async_data = async_to_sync(self.call)(view, path, data)
+        sync_response = self.client.get(path, data or {})
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual(sync_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_data, json.loads(sync_response.content))
+        return async_data
+
+    def test_dashboard_matches_sync(self):
+        """Test the async dashboard returns the same payload as the DRF action."""
+        data = self.assert_matches_sync(async_views.task_dashboard, '/api/tasks/dashboard/')
+        self.assertEqual(data['summary_stats']['total_tasks'], 5)
+        self.assertEqual(data['summary_stats']['overdue_tasks'], 1)
+        self.assertEqual(data['summary_stats']['today_tasks_count'], 1)
+        self.assertEqual(data['summary_stats']['upcoming_tasks_count'], 1)
+
+    def test_summaries_match_sync(self):
+        """Test the async task and todo list summaries match the DRF actions."""
+        data = self.assert_matches_sync(async_views.todo_list_summary, '/api/todolists/summary/')
+        self.assertEqual(len(data), 2)
+        tasks = self.assert_matches_sync(
+            async_views.task_summary, '/api/tasks/summary/', {'status': 'todo', 'ordering': 'title'}
+        )
+        self.assertEqual([task['title'] for task in tasks], ['Task 0', 'Task 2', 'Task 4'])
+
+    def test_recent_activities_match_sync(self):
+        """Test the async recent activity feed matches the DRF action."""
+        data = self.assert_matches_sync(async_views.recent_activities, '/api/activities/recent/', {'limit': 3})
+        self.assertEqual(data['count'], 3)
+
+    async def test_async_views_require_authentication(self):
+        """Test the async views reject requests without a valid token."""
+        status_code, _ = await self.call(async_views.task_dashboard, '/api/tasks/dashboard/', authenticated=False)
+        self.assertEqual(status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_task_summary_invalid_filter(self):
+        """Test invalid filter values are rejected with 400 like the DRF action."""
+        status_code, errors = await self.call(async_views.task_summary, '/api/tasks/summary/', {'status': 'bogus'})
+        self.assertEqual(status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('status', errors)
+
+
+@override_settings(SYNC_TOKEN_OVERLAP_SECONDS=0)
+class SyncAPITest(TestCase):
+    """Test cases for the delta sync endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            email='sync@example.com',
+            password='testpass123'
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        )
+
+        self.todo_list = TodoList.objects.create(name='Synced', user=self.user)
+        self.other_list = TodoList.objects.create(name='Doomed', user=self.user)
+        self.kept_task = Task.objects.create(title='Kept', todo_list=self.todo_list, user=self.user)
+        self.edited_task = Task.objects.create(title='Edited', todo_list=self.todo_list, user=self.user)
+        self.deleted_task = Task.objects.create(title='Deleted', todo_list=self.todo_list, user=self.user)
+        self.cascaded_task = Task.objects.create(title='Cascaded', todo_list=self.other_list, user=self.user)
+        self.url = reverse('sync')
+
+    def test_full_sync(self):
+        """Test a first sync returns everything and a token."""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['reset'])
+        self.assertTrue(response.data['token'])
+        self.assertEqual(len(response.data['todo_lists']), 2)
+        self.assertEqual(len(response.data['tasks']), 4)
+
+    def test_delta_sync(self):
+        """Test a sync with a token returns only changes and deletions since then."""
+        token = self.client.get(self.url).data['token']
+
+        self.edited_task.title = 'Edited again'
+        self.edited_task.save()
+        new_task = Task.objects.create(title='New', todo_list=self.todo_list, user=self.user)
+        deleted_task_id = self.deleted_task.id
+        self.deleted_task.delete()
+        other_list_id, cascaded_task_id = self.other_list.id, self.cascaded_task.id
+        self.other_list.delete()
+
+        response = self.client.get(self.url, {'since': token})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['reset'])
+        self.assertEqual(
+            {task['id'] for task in response.data['tasks']},
+            {str(self.edited_task.id), str(new_task.id)}
+        )
+        # The list is resent because its task counts changed
+        self.assertEqual([todo_list['id'] for todo_list in response.data['todo_lists']], [str(self.todo_list.id)])
+        self.assertEqual(response.data['deleted']['todo_lists'], [other_list_id])
+        self.assertCountEqual(response.data['deleted']['tasks'], [deleted_task_id, cascaded_task_id])
+
+        # Nothing changed since the latest token
+        response = self.client.get(self.url, {'since': response.data['token']})
+        self.assertEqual(response.data['tasks'], [])
+        self.assertEqual(response.data['todo_lists'], [])
+        self.assertEqual(response.data['deleted'], {'todo_lists': [], 'tasks': []})
+
+    def test_invalid_token(self):
+        """Test tokens not issued by the server are rejected."""
+        response = self.client.get(self.url, {'since': 'not-a-token'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_token_resets(self):
+        """Test tokens older than the tombstone retention force a full resync."""
+        token = make_sync_token(timezone.now() - timedelta(days=365))
+        response = self.client.get(self.url, {'since': token})
+
+        self.assertTrue(response.data['reset'])
+        self.assertEqual(len(response.data['tasks']), 4)
+
+    def test_cleared_data_resets(self):
+        """Test a completed clear-data job forces a full resync."""
+        from accounts.models import DataClearJob
+        from accounts.tasks import clear_user_data
+
+        token = self.client.get(self.url).data['token']
+        clear_user_data(DataClearJob.objects.create(user=self.user))
+
+        response = self.client.get(self.url, {'since': token})
+        self.assertTrue(response.data['reset'])
+        self.assertEqual(response.data['tasks'], [])
+        self.assertFalse(Tombstone.objects.filter(user=self.user).exists())
+
+
+class BatchAPITest(TestCase):
+    """Test cases for the batched mutation endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            email='batch@example.com',
+            password='testpass123'
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        )
+
+        self.todo_list = TodoList.objects.create(name='Queued', user=self.user)
+        self.task = Task.objects.create(title='Existing', todo_list=self.todo_list, user=self.user)
+        self.url = reverse('batch')
+
+    def test_batch_applies_operations_in_order(self):
+        """Test creates, updates and deletes apply in order and refs resolve."""
+        response = self.client.post(self.url, {
+            'operations': [
+                {'op': 'create', 'resource': 'todo_list', 'ref': 'new', 'data': {'name': 'Offline'}},
+                {'op': 'create', 'resource': 'task', 'data': {'title': 'Milk', 'todo_list': {'$ref': 'new'}}},
+                {'op': 'update', 'resource': 'task', 'id': str(self.task.id), 'data': {'status': 'done'}},
+                {'op': 'delete', 'resource': 'todo_list', 'id': {'$ref': 'new'}},
+            ]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['committed'])
+        self.assertEqual([result['status'] for result in response.data['results']], [201, 201, 200, 204])
+        self.assertEqual(response.data['results'][2]['data']['status'], TaskStatus.DONE)
+        self.assertFalse(TodoList.objects.filter(name='Offline').exists())
+        self.assertFalse(Task.objects.filter(title='Milk').exists())
+        self.task.refresh_from_db()
+        self.assertIsNotNone(self.task.completed_at)
+
+    def test_atomic_batch_rolls_back_on_failure(self):
+        """Test one failing operation rolls back the whole atomic batch."""
+        response = self.client.post(self.url, {
+            'operations': [
+                {'op': 'update', 'resource': 'task', 'id': str(self.task.id), 'data': {'title': 'Renamed'}},
+                {'op': 'update', 'resource': 'task', 'id': str(self.todo_list.id), 'data': {}},
+                {'op': 'create', 'resource': 'todo_list', 'data': {'name': 'Never'}},
+            ]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.data['committed'])
+        self.assertEqual([result['status'] for result in response.data['results']], [424, 404, 424])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, 'Existing')
+        self.assertFalse(TodoList.objects.filter(name='Never').exists())
+
+    def test_non_atomic_batch_keeps_successful_operations(self):
+        """Test failures in a non-atomic batch leave other operations applied."""
+        response = self.client.post(self.url, {
+            'atomic': False,
+            'operations': [
+                {'op': 'create', 'resource': 'todo_list', 'data': {'name': 'Queued'}},
+                {'op': 'update', 'resource': 'task', 'id': str(self.task.id), 'data': {'title': 'Renamed'}},
+                {'op': 'archive', 'resource': 'task'},
+            ]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result['status'] for result in response.data['results']], [400, 200, 400])
+        self.assertIn('name', response.data['results'][0]['errors'])
+        self.assertIn('op', response.data['results'][2]['errors'])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, 'Renamed')
+
+    def test_rejects_non_string_refs(self):
+        """Test an operation whose ref is not a non-empty string fails with 400."""
+        response = self.client.post(self.url, {
+            'atomic': False,
+            'operations': [
+                {'op': 'create', 'resource': 'todo_list', 'ref': ['x'], 'data': {'name': 'Listed'}},
+                {'op': 'create', 'resource': 'todo_list', 'ref': '', 'data': {'name': 'Blank'}},
+            ]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result['status'] for result in response.data['results']], [400, 400])
+        self.assertIn('ref', response.data['results'][0]['errors'])
+        self.assertIn('ref', response.data['results'][1]['errors'])
+        self.assertFalse(TodoList.objects.filter(name__in=['Listed', 'Blank']).exists())
+
+    def test_replayed_operations_are_not_reapplied(self):
+        """Test operations with a known idempotency key return the stored result."""
+        payload = {
+            'operations': [
+                {'op': 'create', 'resource': 'task', 'idempotency_key': 'create-1',
+                 'data': {'title': 'Once', 'todo_list': str(self.todo_list.id)}},
+            ]
+        }
+        first = self.client.post(self.url, payload, format='json')
+        replay = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(Task.objects.filter(title='Once').count(), 1)
+        self.assertTrue(replay.data['results'][0]['replayed'])
+        self.assertEqual(replay.data['results'][0]['data']['id'], first.data['results'][0]['data']['id'])
+
+    def test_failed_operations_do_not_store_keys(self):
+        """Test a rolled-back operation's idempotency key can be retried."""
+        response = self.client.post(self.url, {
+            'operations': [
+                {'op': 'delete', 'resource': 'task', 'id': str(self.task.id), 'idempotency_key': 'delete-1'},
+                {'op': 'delete', 'resource': 'task', 'id': str(self.task.id)},
+            ]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(IdempotencyRecord.objects.filter(key='delete-1').exists())
+        self.assertTrue(Task.objects.filter(pk=self.task.pk).exists())
+
+    def test_cannot_modify_other_users_objects(self):
+        """Test operations only see the authenticated user's objects."""
+        other = User.objects.create_user(email='other-batch@example.com', password='testpass123')
+        other_task = Task.objects.create(
+            title='Theirs', todo_list=TodoList.objects.create(name='Theirs', user=other), user=other
+        )
+
+        response = self.client.post(self.url, {
+            'operations': [{'op': 'delete', 'resource': 'task', 'id': str(other_task.id)}]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Task.objects.filter(pk=other_task.pk).exists())
+
+    @override_settings(BATCH_MAX_OPERATIONS=2)
+    def test_rejects_oversized_batches(self):
+        """Test batches over BATCH_MAX_OPERATIONS are rejected."""
+        operation = {'op': 'delete', 'resource': 'task', 'id': str(self.task.id)}
+        response = self.client.post(self.url, {'operations': [operation] * 3}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class IdempotencyKeyTest(TestCase):
+    """Test cases for Idempotency-Key replay on task POSTs."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            email='retry@example.com',
+            password='testpass123'
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        )
+
+        self.todo_list = TodoList.objects.create(name='Retried', user=self.user)
+        self.url = reverse('task-list')
+        self.data = {'title': 'Only once', 'todo_list': str(self.todo_list.id)}
+
+    def test_retried_create_is_replayed(self):
+        """Test a retried create returns the first response without a duplicate."""
+        first = self.client.post(self.url, self.data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        retry = self.client.post(self.url, self.data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(Task.objects.filter(title='Only once').count(), 1)
+
+    def test_requests_without_key_are_not_deduplicated(self):
+        """Test creates without the header behave as before."""
+        self.client.post(self.url, self.data, format='json')
+        self.client.post(self.url, self.data, format='json')
+
+        self.assertEqual(Task.objects.filter(title='Only once').count(), 2)
+
+    def test_key_reused_with_different_body(self):
+        """Test reusing a key for a different request is rejected."""
+        self.client.post(self.url, self.data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        response = self.client.post(
+            self.url, {**self.data, 'title': 'Something else'}, format='json', HTTP_IDEMPOTENCY_KEY='abc'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertFalse(Task.objects.filter(title='Something else').exists())
+
+    def test_keys_are_scoped_per_user(self):
+        """Test another user's request with the same key is not replayed."""
+        self.client.post(self.url, self.data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+
+        other = User.objects.create_user(email='other-retry@example.com', password='testpass123')
+        other_list = TodoList.objects.create(name='Theirs', user=other)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(other).access_token}')
+        response = self.client.post(
+            self.url, {**self.data, 'todo_list': str(other_list.id)}, format='json', HTTP_IDEMPOTENCY_KEY='abc'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('Idempotent-Replayed', response)
+
+    def test_retried_mark_complete_is_replayed(self):
+        """Test a retried mark_complete returns the first success, not 'already completed'."""
+        task = Task.objects.create(title='Finish', todo_list=self.todo_list, user=self.user)
+        url = reverse('task-mark-complete', kwargs={'pk': task.id})
+
+        first = self.client.post(url, HTTP_IDEMPOTENCY_KEY='done-1')
+        retry = self.client.post(url, HTTP_IDEMPOTENCY_KEY='done-1')
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+
+    def test_concurrent_duplicate_gets_conflict(self):
+        """Test a retry arriving while the first request is in flight gets 409."""
+        # cache.add fails when another request holds the in-flight marker
+        with patch.object(cache, 'add', return_value=False):
+            response = self.client.post(self.url, self.data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Task.objects.filter(title='Only once').exists())
+
+    def test_cache_outage_runs_view_without_deduplication(self):
+        """Test requests with a key still succeed when the cache is down."""
+        with patch.object(idempotency, 'cache', **{'get.side_effect': ConnectionError('cache down')}):
+            response = self.client.post(self.url, self.data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Task.objects.filter(title='Only once').count(), 1)
+
+    def test_cache_write_failure_still_returns_response(self):
+        """Test a failure storing the response or releasing the key does not fail the request."""
+        with patch.object(idempotency, 'cache', **{
+            'get.return_value': None,
+            'add.return_value': True,
+            'set.side_effect': ConnectionError('cache down'),
+            'delete.side_effect': ConnectionError('cache down'),
+        }):
+            response = self.client.post(self.url, self.data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class DeadlineReminderTest(TestCase):
+    """Test cases for the deadline reminder digests."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.today = date(2025, 3, 10)
+        self.user = User.objects.create_user(email='due@example.com', password='testpass123', first_name='Dee')
+        self.other = User.objects.create_user(email='other-due@example.com', password='testpass123')
+        self.todo_list = TodoList.objects.create(name='Work', user=self.user)
+        self.other_list = TodoList.objects.create(name='Home', user=self.other)
+
+    def _task(self, title, days, status=TaskStatus.TODO, user=None):
+        user = user or self.user
+        todo_list = self.todo_list if user == self.user else self.other_list
+        return Task.objects.create(
+            title=title, todo_list=todo_list, user=user, status=status,
+            end_date=self.today + timedelta(days=days)
+        )
+
+    @override_settings(DEADLINE_REMINDER_DAYS_AHEAD=1, DEADLINE_REMINDER_OVERDUE_DAYS=7)
+    def test_one_digest_per_user(self):
+        """Test open due and overdue tasks are grouped into one email per user."""
+        self._task('Overdue', -2)
+        self._task('Due today', 0, status=TaskStatus.ONGOING)
+        self._task('Due tomorrow', 1)
+        self._task('Done', 0, status=TaskStatus.DONE)
+        self._task('Long overdue', -30)
+        self._task('Next week', 7)
+        self._task('Theirs', 0, user=self.other)
+
+        result = send_deadline_digests(today=self.today, chunk_size=2)
+
+        self.assertEqual(result, {'tasks': 4, 'users': 2, 'emails': 2})
+        email = OutboundEmail.objects.get(user=self.user)
+        self.assertEqual(email.template, 'emails/deadline_digest')
+        self.assertEqual(email.subject, '3 tasks are due or overdue')
+        self.assertEqual(
+            [task['title'] for task in email.context['tasks']], ['Overdue', 'Due today', 'Due tomorrow']
+        )
+        self.assertEqual((email.context['overdue'], email.context['due_today'], email.context['due_soon']), (1, 1, 1))
+
+        deliver_due_emails()
+        body = next(message.body for message in mail.outbox if message.to == ['due@example.com'])
+        self.assertIn('Hi Dee,', body)
+        self.assertIn('Overdue (overdue since 2025-03-08', body)
+
+    def test_keyset_chunks_cover_every_task(self):
+        """Test chunked reads return each task once across chunk boundaries."""
+        tasks = [
+            self._task(f'Task {i}', i % 2, status=TaskStatus.TODO if i % 3 else TaskStatus.ONGOING)
+            for i in range(11)
+        ]
+
+        rows = list(iter_due_tasks(self.today, self.today + timedelta(days=1), chunk_size=3))
+
+        self.assertEqual(sorted(row[0] for row in rows), sorted(task.id for task in tasks))
+        self.assertEqual(rows, sorted(rows, key=lambda row: (row[1], row[2], row[0])))
+
+    @override_settings(DEADLINE_DIGEST_MAX_TASKS=2)
+    def test_digest_lists_most_urgent_tasks(self):
+        """Test long digests list the earliest tasks and count the rest."""
+        for days in (1, 0, -1, -3):
+            self._task(f'Task {days}', days)
+
+        send_deadline_digests(today=self.today)
+
+        context = OutboundEmail.objects.get().context
+        self.assertEqual([task['title'] for task in context['tasks']], ['Task -3', 'Task -1'])
+        self.assertEqual(context['more'], 2)
+
+    def test_inactive_users_and_repeat_runs_are_skipped(self):
+        """Test inactive users get no digest and a second run the same day sends nothing."""
+        self._task('Mine', 0)
+        self._task('Theirs', 0, user=self.other)
+        User.objects.filter(pk=self.other.pk).update(is_active=False)
+
+        self.assertEqual(send_deadline_digests(today=self.today)['emails'], 1)
+        self.assertIsNone(send_deadline_digests(today=self.today))
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+
+        out = io.StringIO()
+        call_command('send_deadline_reminders', '--date', '2025-03-10', '--force', stdout=out)
+        self.assertIn('Queued 1 digests', out.getvalue())
+
+    def test_failed_run_queues_nothing(self):
+        """Test a run failing part-way keeps no digests, so its retry sends each once."""
+        self._task('Mine', 0)
+        self._task('Theirs', 0, user=self.other)
+
+        def failing_messages(digests, today):
+            yield next(real_messages(digests, today))
+            raise RuntimeError('database went away')
+
+        real_messages = reminders._digest_messages
+        real_queue_many = reminders.queue_many
+        with patch.object(reminders, '_digest_messages', failing_messages), \
+                patch.object(reminders, 'queue_many', lambda *args: real_queue_many(*args, batch_size=1)):
+            with self.assertRaises(RuntimeError):
+                send_deadline_digests(today=self.today)
+        self.assertFalse(OutboundEmail.objects.exists())
+
+        self.assertEqual(send_deadline_digests(today=self.today)['emails'], 2)
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+
+    def test_benchmark_leaves_real_run_alone(self):
+        """Test the benchmark rolls back its data and does not mark the day as sent."""
+        out = io.StringIO()
+        call_command('benchmark_deadline_reminders', '--users', '3', '--tasks', '30', stdout=out)
+
+        self.assertIn('Rolled back', out.getvalue())
+        self.assertFalse(User.objects.filter(email__startswith='reminder-bench-').exists())
+        self.assertIsNone(cache.get(f'deadline_digest:{date.today().isoformat()}'))
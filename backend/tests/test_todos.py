@@ -2,14 +2,22 @@
 Test cases for Todo models, views, and serializers.
 """
 
+import gzip
+import io
+import json
+import os
+import tempfile
 import uuid
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from django.core.management import call_command
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 
 from todos.models import TodoList, Task, TaskPriority, TaskStatus
+from todos.activity_models import Activity, ActivityType
 
 User = get_user_model()
 
@@ -294,6 +302,57 @@ class TaskModelTest(TestCase):
         self.assertEqual(task.status, TaskStatus.DONE)
         self.assertIsNotNone(task.completed_at)
 
+    def test_task_change_tracking(self):
+        """Test loaded tasks report exactly the fields changed since loading."""
+        task = Task.objects.create(title='Tracked', todo_list=self.todo_list, user=self.user)
+        task = Task.objects.get(pk=task.pk)
+        self.assertEqual(task.get_changes(), {})
+
+        task.title = 'Renamed'
+        task.priority = TaskPriority.URGENT
+        self.assertEqual(
+            task.get_changes(),
+            {'title': ('Tracked', 'Renamed'), 'priority': (TaskPriority.MEDIUM, TaskPriority.URGENT)}
+        )
+
+        task.save()
+        self.assertEqual(task.get_changes(), {})
+        activity = Activity.objects.filter(task_id=task.pk).first()
+        self.assertEqual(activity.activity_type, ActivityType.TASK_UPDATED)
+        self.assertEqual(activity.context['changes'], ['title', 'priority'])
+
+    def test_task_noop_save_skips_write_and_activity(self):
+        """Test saving an unchanged task issues no queries and logs nothing."""
+        task = Task.objects.create(title='Unchanged', todo_list=self.todo_list, user=self.user)
+        task = Task.objects.get(pk=task.pk)
+        activity_count = Activity.objects.count()
+
+        with CaptureQueriesContext(connection) as queries:
+            task.save()
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(Activity.objects.count(), activity_count)
+
+    def test_task_completion_activity_from_status_change(self):
+        """Test completion is logged on the status change, not a completed_at threshold."""
+        task = Task.objects.create(title='Finish', todo_list=self.todo_list, user=self.user)
+
+        task.status = TaskStatus.DONE
+        task.save()
+        self.assertEqual(
+            Activity.objects.filter(task_id=task.pk, activity_type=ActivityType.TASK_COMPLETED).count(), 1
+        )
+
+        # Editing a completed task is an update, not another completion
+        task.title = 'Finish today'
+        task.save()
+        self.assertEqual(
+            Activity.objects.filter(task_id=task.pk, activity_type=ActivityType.TASK_COMPLETED).count(), 1
+        )
+        self.assertEqual(
+            Activity.objects.filter(task_id=task.pk).first().activity_type, ActivityType.TASK_UPDATED
+        )
+
     def test_task_date_validation(self):
         """Test task date validation (start date <= end date)."""
         # Valid dates (start before end)
@@ -343,4 +402,64 @@ class TaskModelTest(TestCase):
         
         # Verify tasks are deleted
         self.assertEqual(Task.objects.count(), 0)
-        self.assertEqual(TodoList.objects.count(), 0)
\ No newline at end of file
+        self.assertEqual(TodoList.objects.count(), 0)
+
+
+class ActivityRetentionTest(TestCase):
+    """Test cases for chunked activity retention."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(email='retention@example.com', password='testpass123')
+        self.other_user = User.objects.create_user(email='other@example.com', password='testpass123')
+        now = datetime.now(timezone.utc)
+        for index in range(7):
+            self._activity(self.user, now - timedelta(days=200 + index), f'Old {index}')
+        for index in range(3):
+            self._activity(self.user, now - timedelta(days=index), f'Recent {index}')
+        for index in range(2):
+            self._activity(self.other_user, now - timedelta(days=index), f'Other {index}')
+
+    def _activity(self, user, timestamp, title):
+        return Activity.objects.create(
+            user=user,
+            activity_type=ActivityType.TASK_UPDATED,
+            title=title,
+            timestamp=timestamp
+        )
+
+    def test_cleanup_old_activities_returns_count(self):
+        """Test cleanup_old_activities deletes old rows and returns how many."""
+        self.assertEqual(Activity.cleanup_old_activities(days=90), 7)
+        self.assertEqual(Activity.objects.filter(user=self.user).count(), 3)
+
+    def test_prune_command_archives_before_deleting(self):
+        """Test old activities are archived to gzipped NDJSON and deleted in chunks."""
+        with tempfile.TemporaryDirectory() as archive_dir:
+            call_command(
+                'prune_activities', days=90, archive_dir=archive_dir, chunk_size=2,
+                stdout=io.StringIO()
+            )
+            archives = os.listdir(archive_dir)
+            self.assertEqual(len(archives), 1)
+            with gzip.open(os.path.join(archive_dir, archives[0]), 'rt') as archive:
+                rows = [json.loads(line) for line in archive]
+
+        self.assertEqual(len(rows), 7)
+        self.assertEqual({row['title'] for row in rows}, {f'Old {index}' for index in range(7)})
+        self.assertEqual(Activity.objects.count(), 5)
+
+    def test_prune_command_keep_per_user(self):
+        """Test per-user caps keep only each user's most recent activities."""
+        call_command('prune_activities', days=0, keep_per_user=2, chunk_size=3, stdout=io.StringIO())
+
+        self.assertEqual(
+            set(Activity.objects.filter(user=self.user).values_list('title', flat=True)),
+            {'Recent 0', 'Recent 1'}
+        )
+        self.assertEqual(Activity.objects.filter(user=self.other_user).count(), 2)
+
+    def test_prune_command_dry_run(self):
+        """Test a dry run deletes nothing."""
+        call_command('prune_activities', days=90, keep_per_user=1, dry_run=True, stdout=io.StringIO())
+        self.assertEqual(Activity.objects.count(), 12)
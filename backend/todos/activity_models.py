@@ -5,12 +5,20 @@ This module contains models for tracking user activities such as creating,
 updating, and completing tasks and todo lists.
 """
 
+from django.conf import settings
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 User = get_user_model()
 
+# Upper bound on task ids/titles kept in a bulk deletion summary
+MAX_SUMMARIZED_TASKS = 100
+
+# Repeated updates to the same object within this many seconds are merged
+# into a single activity (0 disables coalescing)
+DEFAULT_COALESCE_WINDOW = 300
+
 
 class ActivityType(models.TextChoices):
     """Activity type choices."""
@@ -21,6 +29,8 @@ class ActivityType(models.TextChoices):
     TASK_UPDATED = 'task_updated', 'Task Updated'
     TASK_COMPLETED = 'task_completed', 'Task Completed'
     TASK_DELETED = 'task_deleted', 'Task Deleted'
+    TASKS_IMPORTED = 'tasks_imported', 'Tasks Imported'
+    TASKS_DELETED = 'tasks_deleted', 'Tasks Deleted'
 
 
 class Activity(models.Model):
@@ -126,28 +136,35 @@ class Activity(models.Model):
     
     @classmethod
     def log_todo_list_updated(cls, user, todo_list, changes=None):
-        """Log when a todo list is updated."""
-        description = f"Updated todo list: {todo_list.name}"
-        if changes:
-            description += f" (Changed: {', '.join(changes)})"
-        
-        return cls.objects.create(
+        """Log when a todo list is updated, merging into a recent update."""
+        return cls._log_update(
             user=user,
             activity_type=ActivityType.TODO_LIST_UPDATED,
-            title=f"Updated todo list '{todo_list.name}'",
-            description=description,
-            todo_list_id=todo_list.id,
-            todo_list_name=todo_list.name,
-            context={
-                'changes': changes or [],
-                'color': todo_list.color,
-            }
+            lookup={'todo_list_id': todo_list.id, 'task_id': None},
+            changes=changes,
+            build=lambda all_changes: dict(
+                title=f"Updated todo list '{todo_list.name}'",
+                description=cls._update_description(f"Updated todo list: {todo_list.name}", all_changes),
+                todo_list_id=todo_list.id,
+                todo_list_name=todo_list.name,
+                context={
+                    'changes': all_changes,
+                    'color': todo_list.color,
+                }
+            )
         )
     
     @classmethod
-    def log_todo_list_deleted(cls, user, todo_list_name, todo_list_id):
-        """Log when a todo list is deleted."""
-        return cls.objects.create(
+    def log_todo_list_deleted(cls, user, todo_list_name, todo_list_id, deleted_tasks=()):
+        """
+        Log when a todo list is deleted.
+        
+        deleted_tasks are (id, title, user_id) tuples for the tasks removed
+        with the list. They are summarized in one "deleted N tasks" activity
+        per task owner, written together with the list activity in a single
+        bulk_create instead of one activity per task.
+        """
+        activity = cls(
             user=user,
             activity_type=ActivityType.TODO_LIST_DELETED,
             title=f"Deleted todo list '{todo_list_name}'",
@@ -155,6 +172,35 @@ class Activity(models.Model):
             todo_list_id=todo_list_id,
             todo_list_name=todo_list_name,
         )
+        if not deleted_tasks:
+            activity.save()
+            return activity
+        
+        tasks_by_user = {}
+        for task_id, task_title, task_user_id in deleted_tasks:
+            tasks_by_user.setdefault(task_user_id, []).append((task_id, task_title))
+        
+        activities = [activity]
+        for task_user_id, tasks in tasks_by_user.items():
+            count = len(tasks)
+            activities.append(cls(
+                user_id=task_user_id,
+                activity_type=ActivityType.TASKS_DELETED,
+                title=f"Deleted {count} tasks",
+                description=f"Deleted {count} tasks with todo list '{todo_list_name}'",
+                todo_list_id=todo_list_id,
+                todo_list_name=todo_list_name,
+                timestamp=activity.timestamp,
+                context={
+                    'count': count,
+                    'tasks': [
+                        {'id': str(task_id), 'title': task_title}
+                        for task_id, task_title in tasks[:MAX_SUMMARIZED_TASKS]
+                    ],
+                }
+            ))
+        cls.objects.bulk_create(activities)
+        return activity
     
     @classmethod
     def log_task_created(cls, user, task):
@@ -177,27 +223,77 @@ class Activity(models.Model):
     
     @classmethod
     def log_task_updated(cls, user, task, changes=None):
-        """Log when a task is updated."""
-        description = f"Updated task '{task.title}' in '{task.todo_list.name}'"
-        if changes:
-            description += f" (Changed: {', '.join(changes)})"
-        
-        return cls.objects.create(
+        """Log when a task is updated, merging into a recent update."""
+        return cls._log_update(
             user=user,
             activity_type=ActivityType.TASK_UPDATED,
-            title=f"Updated task '{task.title}'",
-            description=description,
-            todo_list_id=task.todo_list.id,
-            todo_list_name=task.todo_list.name,
-            task_id=task.id,
-            task_title=task.title,
-            context={
-                'changes': changes or [],
-                'priority': task.priority,
-                'status': task.status,
-            }
+            lookup={'task_id': task.id},
+            changes=changes,
+            build=lambda all_changes: dict(
+                title=f"Updated task '{task.title}'",
+                description=cls._update_description(
+                    f"Updated task '{task.title}' in '{task.todo_list.name}'", all_changes
+                ),
+                todo_list_id=task.todo_list.id,
+                todo_list_name=task.todo_list.name,
+                task_id=task.id,
+                task_title=task.title,
+                context={
+                    'changes': all_changes,
+                    'priority': task.priority,
+                    'status': task.status,
+                }
+            )
         )
     
+    @staticmethod
+    def _update_description(description, changes):
+        if changes:
+            description += f" (Changed: {', '.join(changes)})"
+        return description
+    
+    @classmethod
+    def _log_update(cls, user, activity_type, lookup, changes, build):
+        """
+        Create an update activity, or coalesce it into the previous one.
+        
+        If the user's latest activity for the same object is an update of
+        the same type logged within ACTIVITY_COALESCE_WINDOW seconds, that
+        row is rewritten with the union of both change lists and a bumped
+        update_count instead of inserting a new row.
+        """
+        changes = list(changes or [])
+        now = timezone.now()
+        window = getattr(settings, 'ACTIVITY_COALESCE_WINDOW', DEFAULT_COALESCE_WINDOW)
+        
+        previous = None
+        if window:
+            previous = cls.objects.filter(user=user, **lookup).order_by('-timestamp').first()
+            if (
+                previous is not None and (
+                    previous.activity_type != activity_type or
+                    previous.timestamp < now - timezone.timedelta(seconds=window)
+                )
+            ):
+                previous = None
+        
+        if previous is None:
+            fields = build(changes)
+            fields['context']['update_count'] = 1
+            return cls.objects.create(
+                user=user, activity_type=activity_type, timestamp=now, **fields
+            )
+        
+        merged_changes = list(previous.context.get('changes', []))
+        merged_changes += [change for change in changes if change not in merged_changes]
+        fields = build(merged_changes)
+        fields['context']['update_count'] = previous.context.get('update_count', 1) + 1
+        for name, value in fields.items():
+            setattr(previous, name, value)
+        previous.timestamp = now
+        previous.save(update_fields=[*fields, 'timestamp'])
+        return previous
+    
     @classmethod
     def log_task_completed(cls, user, task):
         """Log when a task is completed."""
@@ -230,6 +326,29 @@ class Activity(models.Model):
             task_title=task_title,
         )
     
+    @classmethod
+    def log_tasks_imported(cls, user, count, todo_lists):
+        """Log a bulk task import as a single activity."""
+        todo_lists = list(todo_lists)
+        single_list = todo_lists[0] if len(todo_lists) == 1 else None
+        if single_list:
+            description = f"Imported {count} tasks into '{single_list.name}'"
+        else:
+            description = f"Imported {count} tasks into {len(todo_lists)} todo lists"
+        
+        return cls.objects.create(
+            user=user,
+            activity_type=ActivityType.TASKS_IMPORTED,
+            title=f"Imported {count} tasks",
+            description=description,
+            todo_list_id=single_list.id if single_list else None,
+            todo_list_name=single_list.name if single_list else '',
+            context={
+                'count': count,
+                'todo_list_ids': [str(todo_list.id) for todo_list in todo_lists],
+            }
+        )
+    
     @classmethod
     def get_recent_for_user(cls, user, limit=10):
         """Get recent activities for a user."""
@@ -237,7 +356,6 @@ class Activity(models.Model):
     
     @classmethod
     def cleanup_old_activities(cls, days=90):
-        """Clean up activities older than specified days."""
-        cutoff_date = timezone.now() - timezone.timedelta(days=days)
-        deleted_count, _ = cls.objects.filter(timestamp__lt=cutoff_date).delete()
-        return deleted_count
\ No newline at end of file
+        """Clean up activities older than specified days, in id-range chunks."""
+        from .retention import prune_activities_older_than
+        return prune_activities_older_than(days)
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+Async versions of the read-heavy todos endpoints.
+
+Served in place of the DRF actions at the same URLs when
+ASYNC_READ_VIEWS is enabled, i.e. when the app runs under ASGI
+(``SERVER_MODE=asgi ./start_gunicorn.sh``). Queries use Django's async
+ORM, so one worker can keep many slow dashboard requests in flight
+instead of blocking a sync worker per request. Responses match the DRF
+actions they replace.
+
+Endpoints:
+- GET /api/tasks/dashboard/
+- GET /api/tasks/summary/
+- GET /api/todolists/summary/
+- GET /api/activities/recent/
+"""
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.http import HttpResponseNotAllowed, JsonResponse
+
+from track_project.async_auth import get_jwt_user, authentication_failed_response
+from track_project.throttling import check_scope
+from .models import TodoList, Task
+from .activity_models import Activity
+from .dashboard import dashboard_querysets, dashboard_stat_aggregates
+from .filters import TaskFilter
+from .serializers import TaskSummarySerializer, TodoListSummarySerializer, ActivitySerializer
+
+# Mirrors TaskViewSet.ordering_fields
+TASK_ORDERING_FIELDS = {
+    'title', 'priority', 'status', 'start_date', 'end_date',
+    'created_at', 'updated_at', 'completed_at',
+}
+
+
+def async_read_view(view):
+    """
+    Restrict an async view to GET, apply the 'reads' throttle scope and
+    pass the view the JWT-authenticated user.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return HttpResponseNotAllowed(['GET'])
+        user = await get_jwt_user(request)
+        if user is None:
+            return authentication_failed_response()
+        allowed, wait = await sync_to_async(check_scope)('reads', f'user:{user.pk}')
+        if not allowed:
+            response = JsonResponse(
+                {'detail': f'Request was throttled. Expected available in {wait} seconds.'}, status=429
+            )
+            response['Retry-After'] = str(wait)
+            return response
+        return await view(request, user, *args, **kwargs)
+    return wrapper
+
+
+async def _fetch(queryset):
+    return [obj async for obj in queryset]
+
+
+@async_read_view
+async def task_dashboard(request, user):
+    """Async TaskViewSet.dashboard."""
+    querysets = dashboard_querysets(user)
+    today_tasks = await _fetch(querysets['today_tasks'])
+    recent_activity = await _fetch(querysets['recent_activity'])
+    upcoming_tasks = await _fetch(querysets['upcoming_tasks'])
+    summary_stats = await querysets['tasks'].order_by().aaggregate(**dashboard_stat_aggregates())
+
+    return JsonResponse({
+        'today_tasks': TaskSummarySerializer(today_tasks, many=True).data,
+        'recent_activity': TaskSummarySerializer(recent_activity, many=True).data,
+        'upcoming_tasks': TaskSummarySerializer(upcoming_tasks, many=True).data,
+        'summary_stats': summary_stats,
+    })
+
+
+def _filtered_tasks(request, user):
+    """
+    Apply TaskFilter, search and ordering like TaskViewSet.filter_queryset.
+
+    Returns (queryset, filter errors or None).
+    """
+    queryset = Task.objects.filter(user=user).select_related('todo_list')
+    filterset = TaskFilter(request.GET, queryset=queryset, request=request)
+    if not filterset.is_valid():
+        return None, filterset.errors
+    queryset = filterset.qs
+
+    search = request.GET.get('search', '').strip()
+    for term in search.split():
+        queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+
+    ordering = [
+        field for field in request.GET.get('ordering', '').split(',')
+        if field.strip().lstrip('-') in TASK_ORDERING_FIELDS
+    ]
+    return queryset.order_by(*[field.strip() for field in ordering] or ['-created_at']), None
+
+
+@async_read_view
+async def task_summary(request, user):
+    """Async TaskViewSet.summary."""
+    # Filter form validation may query (e.g. todo_list choices), so run it sync
+    queryset, errors = await sync_to_async(_filtered_tasks)(request, user)
+    if errors:
+        return JsonResponse(errors, status=400)
+    tasks = await _fetch(queryset)
+    return JsonResponse(TaskSummarySerializer(tasks, many=True).data, safe=False)
+
+
+@async_read_view
+async def todo_list_summary(request, user):
+    """Async TodoListViewSet.summary."""
+    queryset = TodoList.annotate_task_stats(TodoList.objects.filter(user=user)).order_by('-created_at')
+    todo_lists = await _fetch(queryset)
+    return JsonResponse(TodoListSummarySerializer(todo_lists, many=True).data, safe=False)
+
+
+@async_read_view
+async def recent_activities(request, user):
+    """Async ActivityViewSet.recent."""
+    try:
+        limit = int(request.GET.get('limit', 10))
+        limit = min(limit, 50)  # Cap at 50 activities
+    except (ValueError, TypeError):
+        limit = 10
+
+    activities = await _fetch(Activity.objects.filter(user=user).order_by('-timestamp')[:limit])
+    data = ActivitySerializer(activities, many=True).data
+    return JsonResponse({
+        'results': data,
+        'count': len(data),
+    })
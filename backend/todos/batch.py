@@ -0,0 +1,236 @@
+"""
+Batched task and todo list mutations for offline clients.
+
+POST /api/batch/ runs an ordered list of operations in one transaction
+(one request, one authentication pass):
+
+    {
+        "atomic": true,
+        "operations": [
+            {"op": "create", "resource": "todo_list", "ref": "groceries",
+             "data": {"name": "Groceries"}, "idempotency_key": "c1"},
+            {"op": "create", "resource": "task", "idempotency_key": "c2",
+             "data": {"title": "Milk", "todo_list": {"$ref": "groceries"}}},
+            {"op": "update", "resource": "task", "id": "<uuid>", "data": {"status": "done"}},
+            {"op": "delete", "resource": "todo_list", "id": "<uuid>"}
+        ]
+    }
+
+Updates are partial. ``{"$ref": name}`` in an id or top-level data value
+stands for the id of an object created earlier in the batch under that
+``ref``. Each operation gets a result with its HTTP-style status and the
+serialized object or errors. With ``atomic`` (the default) the first
+failure rolls back the whole batch; otherwise each operation runs in its
+own savepoint and failures leave the others applied.
+
+Successful results of operations with an ``idempotency_key`` are stored in
+the same transaction, so a replayed operation returns its original result
+(``replayed: true``) without being applied again. Keys are remembered for
+IDEMPOTENCY_KEY_RETENTION_HOURS.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+
+from .models import TodoList, Task, IdempotencyRecord
+from .serializers import TodoListSerializer, TaskSerializer, TaskCreateSerializer
+
+OPERATIONS = ('create', 'update', 'delete')
+
+# resource -> (queryset for the acting user, create serializer, serializer)
+RESOURCES = {
+    'todo_list': (
+        lambda user: TodoList.objects.filter(user=user),
+        TodoListSerializer,
+        TodoListSerializer,
+    ),
+    'task': (
+        lambda user: Task.objects.filter(user=user).select_related('todo_list'),
+        TaskCreateSerializer,
+        TaskSerializer,
+    ),
+}
+
+# Defaults for the BATCH_MAX_OPERATIONS and IDEMPOTENCY_KEY_RETENTION_HOURS settings
+DEFAULT_MAX_OPERATIONS = 100
+DEFAULT_KEY_RETENTION_HOURS = 24
+
+MAX_KEY_LENGTH = 255
+
+
+class OperationFailed(Exception):
+    """An operation could not be applied; carries its result status and errors."""
+
+    def __init__(self, status_code, errors):
+        super().__init__(errors)
+        self.status_code = status_code
+        self.errors = errors
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _resolve(value, refs):
+    if isinstance(value, dict) and set(value) == {'$ref'}:
+        try:
+            return refs[value['$ref']]
+        except (KeyError, TypeError):
+            raise OperationFailed(
+                status.HTTP_400_BAD_REQUEST,
+                {'$ref': f"No object was created earlier in this batch with ref '{value['$ref']}'."}
+            )
+    return value
+
+
+def _parse(operation, refs):
+    """Validate an operation's shape; return (op, resource, object id, data)."""
+    if not isinstance(operation, dict):
+        raise OperationFailed(status.HTTP_400_BAD_REQUEST, {'detail': 'Each operation must be an object.'})
+
+    errors = {}
+    op = operation.get('op')
+    if op not in OPERATIONS:
+        errors['op'] = f"Must be one of: {', '.join(OPERATIONS)}."
+    resource = operation.get('resource')
+    if resource not in RESOURCES:
+        errors['resource'] = f"Must be one of: {', '.join(RESOURCES)}."
+    data = operation.get('data', {})
+    if not isinstance(data, dict):
+        errors['data'] = 'Must be an object.'
+    if op in ('update', 'delete') and not operation.get('id'):
+        errors['id'] = f'Required for {op}.'
+    ref = operation.get('ref')
+    if ref is not None and (not isinstance(ref, str) or not ref):
+        errors['ref'] = 'Must be a non-empty string.'
+    if errors:
+        raise OperationFailed(status.HTTP_400_BAD_REQUEST, errors)
+
+    object_id = _resolve(operation.get('id'), refs)
+    data = {field: _resolve(value, refs) for field, value in data.items()}
+    return op, resource, object_id, data
+
+
+def _apply(request, op, resource, object_id, data):
+    """Apply one operation; return (status code, response body)."""
+    get_queryset, create_serializer_class, serializer_class = RESOURCES[resource]
+    context = {'request': request}
+
+    if op == 'create':
+        serializer = create_serializer_class(data=data, context=context)
+        serializer.is_valid(raise_exception=True)
+        instance = serializer.save(user=request.user)
+        return status.HTTP_201_CREATED, serializer_class(instance, context=context).data
+
+    try:
+        instance = get_queryset(request.user).get(pk=object_id)
+    except (ObjectDoesNotExist, DjangoValidationError, ValueError):
+        raise OperationFailed(status.HTTP_404_NOT_FOUND, {'detail': 'Not found.'})
+
+    if op == 'delete':
+        instance.delete()
+        return status.HTTP_204_NO_CONTENT, None
+
+    serializer = serializer_class(instance, data=data, partial=True, context=context)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    return status.HTTP_200_OK, serializer.data
+
+
+def _run_operation(request, operation, refs, stored):
+    try:
+        op, resource, object_id, data = _parse(operation, refs)
+        key = operation.get('idempotency_key')
+        if key is not None and (not isinstance(key, str) or not 0 < len(key) <= MAX_KEY_LENGTH):
+            raise OperationFailed(
+                status.HTTP_400_BAD_REQUEST,
+                {'idempotency_key': f'Must be a string of 1 to {MAX_KEY_LENGTH} characters.'}
+            )
+
+        if key in stored:
+            record = stored[key]
+            result = {'status': record.status_code, 'data': record.response, 'replayed': True}
+        else:
+            # Savepoint, so a failed operation leaves no partial writes
+            with transaction.atomic():
+                status_code, body = _apply(request, op, resource, object_id, data)
+                if key is not None:
+                    try:
+                        with transaction.atomic():
+                            stored[key] = IdempotencyRecord.objects.create(
+                                user=request.user, key=key, status_code=status_code, response=body
+                            )
+                    except IntegrityError:
+                        raise OperationFailed(
+                            status.HTTP_409_CONFLICT,
+                            {'idempotency_key': 'Another request with this key is in progress; retry it.'}
+                        )
+            result = {'status': status_code, 'data': body}
+    except OperationFailed as e:
+        return {'status': e.status_code, 'errors': e.errors}
+    except serializers.ValidationError as e:
+        return {'status': status.HTTP_400_BAD_REQUEST, 'errors': e.detail}
+
+    if op == 'create' and operation.get('ref') is not None:
+        refs[operation['ref']] = result['data']['id']
+    return result
+
+
+def run_batch(request, operations, atomic=True):
+    """
+    Apply a batch of operations as request.user.
+
+    Args:
+        request: Authenticated DRF request (serializer context)
+        operations: List of operation dicts, applied in order
+        atomic: Roll back every operation if one fails
+
+    Returns:
+        Tuple of (list of per-operation results, whether the batch was committed)
+    """
+    keys = [
+        operation['idempotency_key'] for operation in operations
+        if isinstance(operation, dict) and isinstance(operation.get('idempotency_key'), str)
+    ]
+    stored = {}
+    if keys:
+        stored = {
+            record.key: record
+            for record in IdempotencyRecord.objects.filter(user=request.user, key__in=keys)
+        }
+
+    refs = {}
+    results = []
+    try:
+        with transaction.atomic():
+            for index, operation in enumerate(operations):
+                results.append(_run_operation(request, operation, refs, stored))
+                if atomic and results[-1]['status'] >= 400:
+                    raise _Rollback()
+    except _Rollback:
+        failed = len(results) - 1
+        rolled_back = {
+            'status': status.HTTP_424_FAILED_DEPENDENCY,
+            'errors': {'detail': f'Not applied because operation {failed} failed.'},
+        }
+        results = [rolled_back] * failed + [results[failed]] + [rolled_back] * (len(operations) - failed - 1)
+        return results, False
+    return results, True
+
+
+def idempotency_cutoff():
+    hours = getattr(settings, 'IDEMPOTENCY_KEY_RETENTION_HOURS', DEFAULT_KEY_RETENTION_HOURS)
+    return timezone.now() - timedelta(hours=hours)
+
+
+def prune_idempotency_records(chunk_size=5000):
+    """Delete idempotency records past the retention window in id-range chunks."""
+    from .retention import delete_in_pk_chunks
+    return delete_in_pk_chunks(
+        IdempotencyRecord.objects.filter(created_at__lt=idempotency_cutoff()), chunk_size=chunk_size
+    )
@@ -0,0 +1,162 @@
+"""
+Calendar feed for the todos app.
+
+Builds a compact, per-day bucketed view of the tasks that overlap a date
+window. Task rows are fetched one calendar month at a time and cached per
+user and month; any task or todo list change for the user bumps a version
+key so stale months are never served.
+"""
+
+import logging
+import uuid
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+# Largest window (in days) a single calendar request may cover
+MAX_CALENDAR_RANGE_DAYS = 93
+
+CALENDAR_FIELDS = (
+    'id', 'title', 'status', 'priority', 'start_date', 'end_date',
+    'todo_list_id', 'todo_list__color',
+)
+
+
+def _cache_timeout():
+    return getattr(settings, 'TODO_CALENDAR_CACHE_TIMEOUT', 60 * 60)
+
+
+def _version_key(user_id):
+    return f'todos:calendar:version:{user_id}'
+
+
+def _month_key(user_id, version, year, month):
+    return f'todos:calendar:{user_id}:{version}:{year:04d}-{month:02d}'
+
+
+def invalidate_user_calendar(user_id):
+    """Invalidate every cached calendar month for a user."""
+    try:
+        cache.set(_version_key(user_id), uuid.uuid4().hex, None)
+    except Exception as e:
+        # A cache outage must never block task writes
+        logger.warning(f"Could not invalidate calendar cache for user {user_id}: {str(e)}")
+
+
+def _get_version(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(_version_key(user_id), version, None)
+    return version
+
+
+def _month_bounds(year, month):
+    first = date(year, month, 1)
+    if month == 12:
+        next_first = date(year + 1, 1, 1)
+    else:
+        next_first = date(year, month + 1, 1)
+    return first, next_first - timedelta(days=1)
+
+
+def _iter_months(start, end):
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        if month == 12:
+            year, month = year + 1, 1
+        else:
+            month += 1
+
+
+def overlapping_tasks(queryset, start, end):
+    """
+    Filter a task queryset to tasks whose date span overlaps [start, end].
+
+    A task with only one of start_date/end_date set is treated as a
+    single-day task on that date. Tasks without any date are excluded.
+    """
+    return queryset.filter(
+        Q(start_date__lte=end, end_date__gte=start) |
+        Q(start_date__isnull=True, end_date__gte=start, end_date__lte=end) |
+        Q(end_date__isnull=True, start_date__gte=start, start_date__lte=end)
+    )
+
+
+def _load_month(user_id, year, month):
+    first, last = _month_bounds(year, month)
+    rows = overlapping_tasks(Task.objects.filter(user_id=user_id), first, last)
+    return list(rows.order_by().values(*CALENDAR_FIELDS))
+
+
+def get_month_tasks(user_id, year, month):
+    """Return the compact task rows overlapping a month, cached per user."""
+    try:
+        version = _get_version(user_id)
+        key = _month_key(user_id, version, year, month)
+        rows = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Calendar cache unavailable for user {user_id}: {str(e)}")
+        return _load_month(user_id, year, month)
+
+    if rows is None:
+        rows = _load_month(user_id, year, month)
+        try:
+            cache.set(key, rows, _cache_timeout())
+        except Exception as e:
+            logger.warning(f"Could not cache calendar month for user {user_id}: {str(e)}")
+    return rows
+
+
+def build_calendar(user_id, start, end):
+    """
+    Build the bucketed calendar payload for a date window.
+
+    Returns a dict with every overlapping task serialized once under
+    ``tasks`` (keyed by id) and a ``days`` map from ISO date to the ids of
+    the tasks active on that day. Days without tasks are omitted.
+    """
+    tasks = {}
+    days = {}
+
+    for year, month in _iter_months(start, end):
+        for row in get_month_tasks(user_id, year, month):
+            task_id = str(row['id'])
+            if task_id in tasks:
+                continue
+
+            task_start = row['start_date'] or row['end_date']
+            task_end = row['end_date'] or row['start_date']
+            if task_start > end or task_end < start:
+                continue
+
+            tasks[task_id] = {
+                'id': task_id,
+                'title': row['title'],
+                'status': row['status'],
+                'priority': row['priority'],
+                'start_date': row['start_date'].isoformat() if row['start_date'] else None,
+                'end_date': row['end_date'].isoformat() if row['end_date'] else None,
+                'todo_list': str(row['todo_list_id']),
+                'todo_list_color': row['todo_list__color'],
+            }
+
+            day = max(task_start, start)
+            last_day = min(task_end, end)
+            while day <= last_day:
+                days.setdefault(day.isoformat(), []).append(task_id)
+                day += timedelta(days=1)
+
+    return {
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'tasks': tasks,
+        'days': dict(sorted(days.items())),
+    }
@@ -0,0 +1,55 @@
+"""
+Task dashboard queries shared by the sync (DRF) and async dashboard views.
+
+The summary statistics are computed with one conditional aggregate
+instead of a COUNT query per statistic.
+"""
+
+from datetime import date, timedelta
+
+from django.db.models import Count, Q
+
+from .models import Task, TaskStatus
+
+
+def dashboard_querysets(user, today=None):
+    """
+    Return the task querysets behind the dashboard.
+
+    Returns:
+        Dict with 'tasks' (all of the user's tasks), 'today_tasks',
+        'recent_activity' (last 5 updated) and 'upcoming_tasks' (next 7 days)
+    """
+    today = today or date.today()
+    tasks = Task.objects.filter(user=user).select_related('todo_list')
+    open_tasks = tasks.exclude(status=TaskStatus.DONE)
+    return {
+        'tasks': tasks,
+        'today_tasks': open_tasks.filter(end_date=today),
+        'recent_activity': tasks.order_by('-updated_at')[:5],
+        'upcoming_tasks': open_tasks.filter(
+            end_date__gte=today + timedelta(days=1),
+            end_date__lte=today + timedelta(days=7)
+        ),
+    }
+
+
+def dashboard_stat_aggregates(today=None):
+    """Return aggregate() keyword arguments for the dashboard summary_stats."""
+    today = today or date.today()
+    is_open = ~Q(status=TaskStatus.DONE)
+    return {
+        'total_tasks': Count('id'),
+        'completed_tasks': Count('id', filter=Q(status=TaskStatus.DONE)),
+        'ongoing_tasks': Count('id', filter=Q(status=TaskStatus.ONGOING)),
+        'todo_tasks': Count('id', filter=Q(status=TaskStatus.TODO)),
+        'overdue_tasks': Count('id', filter=is_open & Q(end_date__lt=today)),
+        'today_tasks_count': Count('id', filter=is_open & Q(end_date=today)),
+        'upcoming_tasks_count': Count(
+            'id',
+            filter=is_open & Q(
+                end_date__gte=today + timedelta(days=1),
+                end_date__lte=today + timedelta(days=7)
+            )
+        ),
+    }
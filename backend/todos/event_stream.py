@@ -0,0 +1,73 @@
+"""
+Server-Sent Events stream of a user's task, todo list and activity changes.
+
+GET /api/events/?token=<access token>
+
+The stream is served by the ASGI worker only (the ``events`` process in
+the Procfile): under WSGI every open stream would pin a gunicorn worker,
+so the view answers 501 there. The events process listens on $PORT, so on
+a PaaS /api/events/ must be routed to it as its own service; on a VPS
+nginx proxies it to port 8001 (deployment/setup_vps.sh).
+
+EventSource cannot send headers, so the JWT access token may be passed as
+a query parameter; an Authorization header is accepted too.
+
+Events carry ids and changed field names, not full objects; clients
+refetch what they display. Streams end after EVENT_STREAM_MAX_SECONDS and
+the browser reconnects automatically. Events published while a client is
+disconnected are not replayed.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+
+from track_project.async_auth import get_jwt_user, authentication_failed_response
+from track_project.events import get_event_bus
+
+# Idle seconds between keep-alive comments
+HEARTBEAT_SECONDS = 15
+
+# Milliseconds the browser waits before reconnecting
+RECONNECT_MS = 3000
+
+
+async def _event_lines(user_id, max_seconds):
+    deadline = time.monotonic() + max_seconds
+    async with get_event_bus().subscribe(user_id) as subscription:
+        yield f'retry: {RECONNECT_MS}\n: connected\n\n'
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            message = await subscription.get(timeout=min(HEARTBEAT_SECONDS, remaining))
+            if message is None:
+                yield ': keep-alive\n\n'
+            else:
+                yield f'data: {message}\n\n'
+
+
+async def event_stream(request):
+    """Stream the authenticated user's change events."""
+    # require_GET does not support async views before Django 5.0
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'error': 'The event stream is only served by the ASGI worker.'}, status=501
+        )
+
+    user = await get_jwt_user(request, allow_query_token=True)
+    if user is None:
+        return authentication_failed_response()
+
+    max_seconds = getattr(settings, 'EVENT_STREAM_MAX_SECONDS', 300)
+    response = StreamingHttpResponse(
+        _event_lines(user.id, max_seconds), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering events
+    response['X-Accel-Buffering'] = 'no'
+    return response
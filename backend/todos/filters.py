@@ -16,13 +16,15 @@ class TodoListFilter(django_filters.FilterSet):
     
     Provides filtering by:
     - color: Exact match on hex color code
-    - name: Case-insensitive contains search
+    - name: Case-insensitive contains search (trigram-indexed on PostgreSQL)
+    - name_prefix: Case-insensitive prefix search (indexed on all backends)
     - created_after: Todo lists created after specified date
     - created_before: Todo lists created before specified date
     - has_tasks: Todo lists with/without tasks
     """
     
     name = django_filters.CharFilter(lookup_expr='icontains')
+    name_prefix = django_filters.CharFilter(field_name='name', lookup_expr='istartswith')
     color = django_filters.CharFilter(lookup_expr='exact')
     created_after = django_filters.DateFilter(field_name='created_at', lookup_expr='gte')
     created_before = django_filters.DateFilter(field_name='created_at', lookup_expr='lte')
@@ -30,7 +32,7 @@ class TodoListFilter(django_filters.FilterSet):
     
     class Meta:
         model = TodoList
-        fields = ['name', 'color', 'created_after', 'created_before', 'has_tasks']
+        fields = ['name', 'name_prefix', 'color', 'created_after', 'created_before', 'has_tasks']
     
     def filter_has_tasks(self, queryset, name, value):
         """Filter todo lists that have/don't have tasks."""
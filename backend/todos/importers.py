@@ -0,0 +1,195 @@
+"""
+Bulk task import for the todos app.
+
+Rows are parsed lazily from CSV, NDJSON or JSON uploads, validated in
+batches with the task creation rules and inserted with ``bulk_create``.
+A whole import runs in one transaction, so an upload that turns out to
+be malformed part-way through leaves nothing behind, and is logged as a
+single "imported N tasks" activity instead of one activity per task.
+"""
+
+import csv
+import io
+import json
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import TodoList, Task, TaskStatus
+from .activity_models import Activity
+from .calendar_feed import invalidate_user_calendar
+from .serializers import TaskImportSerializer
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ('csv', 'ndjson', 'json')
+
+# Rows validated and inserted per batch
+IMPORT_BATCH_SIZE = 500
+
+# Upper bound on per-row errors kept in the result
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportFormatError(ValueError):
+    """Raised when an upload cannot be parsed in the requested format."""
+
+
+def detect_import_format(filename, default='csv'):
+    """Guess the import format from a file name extension."""
+    extension = filename.rsplit('.', 1)[-1].lower() if filename and '.' in filename else ''
+    if extension in ('jsonl', 'ndjson'):
+        return 'ndjson'
+    if extension in IMPORT_FORMATS:
+        return extension
+    return default
+
+
+def _text_stream(fileobj):
+    if isinstance(fileobj, io.TextIOBase):
+        return fileobj
+    return io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+
+
+def iter_rows(fileobj, import_format):
+    """
+    Yield one dict per row of an upload.
+
+    CSV and NDJSON are read line by line. JSON must be an array of
+    objects and is loaded in one go, so prefer NDJSON for large files.
+    """
+    stream = _text_stream(fileobj)
+
+    if import_format == 'csv':
+        yield from csv.DictReader(stream)
+    elif import_format == 'ndjson':
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                raise ImportFormatError(f'Line {line_number} is not valid JSON.')
+    elif import_format == 'json':
+        try:
+            rows = json.load(stream)
+        except ValueError:
+            raise ImportFormatError('File is not valid JSON.')
+        if not isinstance(rows, list):
+            raise ImportFormatError('JSON imports must be an array of task objects.')
+        yield from rows
+    else:
+        raise ImportFormatError(f"Unsupported import format '{import_format}'.")
+
+
+def _clean_row(row, todo_lists_by_name, default_todo_list):
+    """Drop blank values and resolve todo_list_name / the default list."""
+    cleaned = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ('', None):
+            continue
+        cleaned[key] = value
+
+    if 'todo_list' not in cleaned:
+        name = cleaned.pop('todo_list_name', None)
+        if name is not None:
+            todo_list = todo_lists_by_name.get(name)
+            # Unknown names fall through to the field's "does not exist" error
+            cleaned['todo_list'] = str(todo_list.id) if todo_list else name
+        elif default_todo_list is not None:
+            cleaned['todo_list'] = str(default_todo_list.id)
+    return cleaned
+
+
+def _build_task(user, validated_data, now):
+    task = Task(user=user, **validated_data)
+    # bulk_create bypasses Task.save(), so mirror its completed_at handling
+    if task.status == TaskStatus.DONE:
+        task.completed_at = now
+    return task
+
+
+def import_tasks(user, rows, default_todo_list=None, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """
+    Validate and insert task rows for a user.
+
+    Args:
+        user: Owner of the imported tasks
+        rows: Iterable of row dicts (see iter_rows)
+        default_todo_list: TodoList used for rows without todo_list/todo_list_name
+        batch_size: Rows validated and inserted per bulk_create
+        dry_run: Validate only, without inserting anything
+
+    Returns:
+        Dict with 'created', 'error_count' and up to MAX_REPORTED_ERRORS
+        per-row 'errors' ({'row': n, 'errors': {...}}, rows are 1-based)
+
+    Raises:
+        ImportFormatError (or the reader's decoding errors) if the rows
+        cannot be parsed; nothing is inserted in that case
+    """
+    todo_lists = {
+        str(todo_list.id): todo_list
+        for todo_list in TodoList.objects.filter(user=user)
+    }
+    todo_lists_by_name = {todo_list.name: todo_list for todo_list in todo_lists.values()}
+    context = {'user': user, 'todo_lists': todo_lists}
+
+    created = 0
+    error_count = 0
+    errors = []
+    used_todo_list_ids = set()
+    now = timezone.now()
+
+    def flush(batch):
+        if batch and not dry_run:
+            Task.objects.bulk_create(batch, batch_size=batch_size)
+
+    # One transaction for the whole file: a parse error in a later batch
+    # rolls back the batches already inserted
+    with transaction.atomic():
+        batch = []
+        for row_number, row in enumerate(rows, start=1):
+            if not isinstance(row, dict):
+                row_errors = {'non_field_errors': ['Row must be an object.']}
+            else:
+                data = _clean_row(row, todo_lists_by_name, default_todo_list)
+                serializer = TaskImportSerializer(data=data, context=context)
+                if serializer.is_valid():
+                    task = _build_task(user, serializer.validated_data, now)
+                    used_todo_list_ids.add(str(task.todo_list_id))
+                    batch.append(task)
+                    created += 1
+                    if len(batch) >= batch_size:
+                        flush(batch)
+                        batch = []
+                    continue
+                row_errors = serializer.errors
+
+            error_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({'row': row_number, 'errors': row_errors})
+        flush(batch)
+
+        if created and not dry_run:
+            Activity.log_tasks_imported(
+                user=user,
+                count=created,
+                todo_lists=[todo_lists[todo_list_id] for todo_list_id in sorted(used_todo_list_ids)]
+            )
+            transaction.on_commit(lambda: invalidate_user_calendar(user.id))
+
+    if created and not dry_run:
+        logger.info(f"Imported {created} tasks for user {user.id} ({error_count} rows rejected)")
+
+    return {
+        'created': created,
+        'error_count': error_count,
+        'errors': errors,
+        'dry_run': dry_run,
+    }
@@ -0,0 +1,121 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from accounts.outbox import deliver_due_emails
+from todos.models import TodoList, Task, TaskPriority, TaskStatus
+from todos.reminders import collect_digests, queue_digests
+
+User = get_user_model()
+
+# Rows inserted per statement while seeding
+SEED_BATCH_SIZE = 10000
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed synthetic users and tasks inside a transaction, time the deadline '
+        'digest scan, grouping and queueing plus rendering and sending every digest '
+        'through the outbox (to the in-memory email backend), then roll everything '
+        'back. Fails if the digest run exceeds --budget seconds.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100000, help='Users to create')
+        parser.add_argument('--tasks', type=int, default=1000000, help='Tasks to create, spread over the users')
+        parser.add_argument(
+            '--budget',
+            type=float,
+            default=300,
+            help='Seconds allowed for scanning, queueing and sending the digests'
+        )
+        parser.add_argument('--chunk-size', type=int, help='Tasks read per query')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic data')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['tasks'] < 1:
+            raise CommandError('--users and --tasks must be at least 1.')
+
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write('Rolled back the synthetic data')
+
+    def _run(self, options):
+        today = date.today()
+        started = time.perf_counter()
+        self._seed(options['users'], options['tasks'], today, random.Random(options['seed']))
+        self.stdout.write(
+            f"Seeded {options['users']} users and {options['tasks']} tasks "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+        # Not send_deadline_digests: its per-day run key is not rolled back
+        # and would make the day's real digest run skip everyone
+        started = time.perf_counter()
+        digests, scanned = collect_digests(today, chunk_size=options['chunk_size'])
+        queued = queue_digests(digests, today)
+        queued_in = time.perf_counter() - started
+        self.stdout.write(
+            f"Scanned {scanned} tasks and queued {queued} digests "
+            f"in {queued_in:.1f}s ({scanned / queued_in:.0f} tasks/s)"
+        )
+
+        started = time.perf_counter()
+        with override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'):
+            mail.outbox = []
+            sent = deliver_due_emails()
+            mail.outbox = []
+        sent_in = time.perf_counter() - started
+        self.stdout.write(f"Rendered and sent {sent} digests in {sent_in:.1f}s ({sent / sent_in:.0f} emails/s)")
+
+        total = queued_in + sent_in
+        if total > options['budget']:
+            raise CommandError(f"Digest run took {total:.1f}s, over the {options['budget']:.0f}s budget")
+        self.stdout.write(self.style.SUCCESS(f"Digest run took {total:.1f}s of the {options['budget']:.0f}s budget"))
+
+    def _seed(self, user_count, task_count, today, rng):
+        """Create users with one todo list each and tasks due from two weeks ago to two weeks ahead."""
+        for start in range(0, user_count, SEED_BATCH_SIZE):
+            User.objects.bulk_create([
+                User(email=f'reminder-bench-{i}@example.com', password='!')
+                for i in range(start, min(start + SEED_BATCH_SIZE, user_count))
+            ])
+        user_ids = list(
+            User.objects.filter(email__startswith='reminder-bench-').order_by('pk').values_list('pk', flat=True)
+        )
+        for start in range(0, user_count, SEED_BATCH_SIZE):
+            TodoList.objects.bulk_create([
+                TodoList(user_id=user_id, name='Benchmark') for user_id in user_ids[start:start + SEED_BATCH_SIZE]
+            ])
+        list_ids = dict(
+            TodoList.objects.filter(user_id__in=user_ids, name='Benchmark').values_list('user_id', 'id')
+        )
+
+        statuses = list(TaskStatus.values)
+        priorities = list(TaskPriority.values)
+        for start in range(0, task_count, SEED_BATCH_SIZE):
+            batch = []
+            for i in range(start, min(start + SEED_BATCH_SIZE, task_count)):
+                user_id = user_ids[i % user_count]
+                batch.append(Task(
+                    title=f'Task {i}',
+                    user_id=user_id,
+                    todo_list_id=list_ids[user_id],
+                    status=rng.choice(statuses),
+                    priority=rng.choice(priorities),
+                    end_date=today + timedelta(days=rng.randint(-14, 14)),
+                ))
+            Task.objects.bulk_create(batch)
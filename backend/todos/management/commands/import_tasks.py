@@ -0,0 +1,98 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+
+from todos.models import TodoList
+from todos.importers import (
+    import_tasks, iter_rows, detect_import_format, ImportFormatError,
+    IMPORT_FORMATS, IMPORT_BATCH_SIZE
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Bulk import tasks for a user from a CSV, NDJSON or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            type=str,
+            help='Path to the file to import'
+        )
+        parser.add_argument(
+            '--user-email',
+            type=str,
+            required=True,
+            help='Email of the user who will own the imported tasks'
+        )
+        parser.add_argument(
+            '--format',
+            type=str,
+            choices=IMPORT_FORMATS,
+            help='File format (default: guessed from the file extension)'
+        )
+        parser.add_argument(
+            '--todo-list',
+            type=str,
+            help='Name of the todo list used for rows without todo_list/todo_list_name'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Rows validated and inserted per batch'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate the file without creating tasks'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['user_email'])
+        except User.DoesNotExist:
+            raise CommandError(f"User with email {options['user_email']} not found.")
+
+        default_todo_list = None
+        if options['todo_list']:
+            try:
+                default_todo_list = TodoList.objects.get(user=user, name=options['todo_list'])
+            except TodoList.DoesNotExist:
+                raise CommandError(f"Todo list '{options['todo_list']}' not found for {user.email}.")
+
+        path = options['path']
+        import_format = options['format'] or detect_import_format(path)
+
+        try:
+            with open(path, 'rb') as fileobj:
+                result = import_tasks(
+                    user,
+                    iter_rows(fileobj, import_format),
+                    default_todo_list=default_todo_list,
+                    batch_size=options['batch_size'],
+                    dry_run=options['dry_run']
+                )
+        except OSError as e:
+            raise CommandError(f'Could not read {path}: {e}')
+        except ImportFormatError as e:
+            raise CommandError(str(e))
+
+        for error in result['errors']:
+            self.stdout.write(
+                self.style.WARNING(f"Row {error['row']}: {error['errors']}")
+            )
+        if result['error_count'] > len(result['errors']):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"... {result['error_count'] - len(result['errors'])} more rows rejected"
+                )
+            )
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {result['created']} tasks for {user.email} "
+                f"({result['error_count']} rows rejected)"
+            )
+        )
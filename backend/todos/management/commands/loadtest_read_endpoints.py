@@ -0,0 +1,167 @@
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = [
+    '/api/tasks/dashboard/',
+    '/api/tasks/summary/',
+    '/api/todolists/summary/',
+    '/api/activities/recent/',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Load test the read-heavy endpoints against one or more running servers, '
+        'e.g. --target sync=http://127.0.0.1:8000 --target async=http://127.0.0.1:8001 '
+        'to compare the WSGI deployment with SERVER_MODE=asgi. These endpoints share '
+        'the per-user "reads" throttle, so start the servers with READS_THROTTLE_RATE= '
+        '(empty, no limit) or the run measures the limiter; the command fails if any '
+        'request gets a 429.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target',
+            action='append',
+            required=True,
+            help='label=base URL of a running server (repeatable)'
+        )
+        parser.add_argument(
+            '--email',
+            type=str,
+            required=True,
+            help='Email of the user to log in as'
+        )
+        parser.add_argument(
+            '--password',
+            type=str,
+            required=True,
+            help='Password of the user to log in as'
+        )
+        parser.add_argument(
+            '--path',
+            action='append',
+            dest='paths',
+            help=f'Endpoint path to test (repeatable, default: {", ".join(DEFAULT_PATHS)})'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=20,
+            help='Concurrent client connections'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Requests per endpoint and target'
+        )
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['target']:
+            label, sep, base_url = target.partition('=')
+            if not sep or not base_url:
+                raise CommandError(f"--target must look like label=http://host:port, got '{target}'")
+            targets.append((label, base_url.rstrip('/')))
+
+        paths = options['paths'] or DEFAULT_PATHS
+        self.stdout.write(
+            f"{'target':<10} {'endpoint':<28} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'errors':>7} {'429s':>6}"
+        )
+        throttled = 0
+        for label, base_url in targets:
+            token = self._login(base_url, options['email'], options['password'])
+            for path in paths:
+                result = self._run(base_url + path, token, options['concurrency'], options['requests'])
+                self.stdout.write(
+                    f"{label:<10} {path:<28} {result['throughput']:>9.1f} {result['p50']:>8.1f} "
+                    f"{result['p95']:>8.1f} {result['p99']:>8.1f} {result['errors']:>7} {result['throttled']:>6}"
+                )
+                throttled += result['throttled']
+
+        if throttled:
+            raise CommandError(
+                f'{throttled} requests were throttled (429), so the results measure the rate '
+                f'limiter. Restart the servers with READS_THROTTLE_RATE= to disable it.'
+            )
+
+    def _login(self, base_url, email, password):
+        request = urllib.request.Request(
+            f'{base_url}/api/auth/login/',
+            data=json.dumps({'email': email, 'password': password}).encode(),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                body = json.load(response)
+        except (urllib.error.URLError, ValueError) as e:
+            raise CommandError(f'Could not log in at {base_url}: {e}')
+        token = body.get('access')
+        if not token:
+            raise CommandError(f'Login at {base_url} returned no access token.')
+        return token
+
+    def _run(self, url, token, concurrency, total):
+        """Send ``total`` GETs over ``concurrency`` threads; return throughput and latencies."""
+        latencies = []
+        errors = 0
+        throttled = 0
+        lock = threading.Lock()
+        remaining = iter(range(total))
+
+        def worker():
+            nonlocal errors, throttled
+            request = urllib.request.Request(url, headers={'Authorization': f'Bearer {token}'})
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        return
+                started = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(request, timeout=60) as response:
+                        response.read()
+                    outcome = 'ok'
+                except urllib.error.HTTPError as e:
+                    outcome = 'throttled' if e.code == 429 else 'error'
+                except (urllib.error.URLError, OSError):
+                    outcome = 'error'
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    if outcome == 'ok':
+                        latencies.append(elapsed)
+                    elif outcome == 'throttled':
+                        throttled += 1
+                    else:
+                        errors += 1
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for _ in range(concurrency):
+                executor.submit(worker)
+        duration = time.perf_counter() - started
+
+        latencies.sort()
+
+        def percentile(fraction):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+        return {
+            'throughput': len(latencies) / duration if duration else 0.0,
+            'p50': statistics.median(latencies) if latencies else 0.0,
+            'p95': percentile(0.95),
+            'p99': percentile(0.99),
+            'errors': errors,
+            'throttled': throttled,
+        }
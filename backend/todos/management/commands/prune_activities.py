@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from todos.retention import (
+    ActivityArchive, prune_activities_older_than, prune_activities_over_cap,
+    RETENTION_CHUNK_SIZE
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete old activities in id-range chunks, optionally archiving them to '
+        'gzipped NDJSON first. Intended to run daily from cron or a scheduler.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=getattr(settings, 'ACTIVITY_RETENTION_DAYS', 90),
+            help='Delete activities older than this many days (0 disables)'
+        )
+        parser.add_argument(
+            '--keep-per-user',
+            type=int,
+            default=getattr(settings, 'ACTIVITY_MAX_PER_USER', None),
+            help='Keep at most this many recent activities per user'
+        )
+        parser.add_argument(
+            '--archive-dir',
+            type=str,
+            help='Write deleted activities to a .ndjson.gz file in this directory first'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=RETENTION_CHUNK_SIZE,
+            help='Activities read and deleted per chunk'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report how many activities would be deleted without deleting them'
+        )
+
+    def handle(self, *args, **options):
+        days = options['days']
+        keep = options['keep_per_user']
+        if days < 0:
+            raise CommandError('--days must be 0 or greater.')
+        if keep is not None and keep < 1:
+            raise CommandError('--keep-per-user must be at least 1.')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1.')
+
+        archive = None
+        if options['archive_dir'] and not options['dry_run']:
+            archive = ActivityArchive(options['archive_dir'])
+
+        kwargs = {
+            'chunk_size': options['chunk_size'],
+            'archive': archive,
+            'dry_run': options['dry_run'],
+        }
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+
+        try:
+            if days:
+                deleted = prune_activities_older_than(days, **kwargs)
+                self.stdout.write(f'{verb} {deleted} activities older than {days} days')
+
+            if keep is not None:
+                deleted_by_user = prune_activities_over_cap(keep, **kwargs)
+                self.stdout.write(
+                    f'{verb} {sum(deleted_by_user.values())} activities beyond the latest '
+                    f'{keep} for {len(deleted_by_user)} users'
+                )
+        except OSError as e:
+            raise CommandError(f'Could not write archive: {e}')
+        finally:
+            if archive is not None:
+                archive.close()
+
+        if archive is not None and archive.row_count:
+            self.stdout.write(f'Archived {archive.row_count} activities to {archive.path}')
+        self.stdout.write(self.style.SUCCESS('Activity retention complete'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from todos.batch import prune_idempotency_records
+from todos.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete delta sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS and '
+        'batch idempotency records older than IDEMPOTENCY_KEY_RETENTION_HOURS. '
+        'Intended to run daily from cron or a scheduler.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Rows deleted per chunk'
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} sync tombstones'))
+        deleted = prune_idempotency_records(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} idempotency records'))
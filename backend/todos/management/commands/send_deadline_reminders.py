@@ -0,0 +1,43 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from todos.reminders import send_deadline_digests
+
+
+class Command(BaseCommand):
+    help = (
+        'Queue one digest email per user with due or overdue open tasks. '
+        'Runs daily from Celery beat (DEADLINE_REMINDER_HOUR), or from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            type=date.fromisoformat,
+            help='Send the digests for this date (YYYY-MM-DD) instead of today'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Tasks read per query (default DEADLINE_REMINDER_CHUNK_SIZE)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Send even if the digests for this date were already sent'
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] is not None and options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1.')
+
+        result = send_deadline_digests(
+            today=options['date'], chunk_size=options['chunk_size'], force=options['force']
+        )
+        if result is None:
+            self.stdout.write('Digests for this date were already sent; use --force to send again')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Queued {result['emails']} digests for {result['users']} users ({result['tasks']} tasks)"
+        ))
@@ -0,0 +1,58 @@
+"""
+Search indexes for TodoList name filtering.
+
+PostgreSQL gets a pg_trgm GIN index on UPPER(name) so the ``icontains``
+lookups used by ``TodoListFilter.name`` and the search filter can avoid a
+sequential scan. SQLite has no trigram support, so it gets a NOCASE
+``(user_id, name)`` index instead, which serves the case-insensitive
+prefix lookups used by ``TodoListFilter.name_prefix``.
+"""
+
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS todo_lists_name_trgm_idx "
+    "ON todo_lists USING gin (UPPER(name) gin_trgm_ops)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS todo_lists_name_trgm_idx",
+]
+
+SQLITE_FORWARD = [
+    "CREATE INDEX IF NOT EXISTS todo_lists_user_name_nocase_idx "
+    "ON todo_lists (user_id, name COLLATE NOCASE)",
+]
+SQLITE_REVERSE = [
+    "DROP INDEX IF EXISTS todo_lists_user_name_nocase_idx",
+]
+
+
+def _run_for_vendor(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_name_search_indexes(apps, schema_editor):
+    _run_for_vendor(schema_editor, {
+        'postgresql': POSTGRES_FORWARD,
+        'sqlite': SQLITE_FORWARD,
+    })
+
+
+def drop_name_search_indexes(apps, schema_editor):
+    _run_for_vendor(schema_editor, {
+        'postgresql': POSTGRES_REVERSE,
+        'sqlite': SQLITE_REVERSE,
+    })
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("todos", "0005_activity"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_name_search_indexes, drop_name_search_indexes),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.17 on 2026-10-19 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("todos", "0006_todolist_name_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "start_date", "end_date"],
+                name="tasks_user_id_0625df_idx",
+            ),
+        ),
+    ]
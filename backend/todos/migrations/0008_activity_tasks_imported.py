@@ -0,0 +1,30 @@
+# Generated by Django 4.2.17 on 2026-10-19 09:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("todos", "0007_task_user_date_range_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="activity",
+            name="activity_type",
+            field=models.CharField(
+                choices=[
+                    ("todo_list_created", "Todo List Created"),
+                    ("todo_list_updated", "Todo List Updated"),
+                    ("todo_list_deleted", "Todo List Deleted"),
+                    ("task_created", "Task Created"),
+                    ("task_updated", "Task Updated"),
+                    ("task_completed", "Task Completed"),
+                    ("task_deleted", "Task Deleted"),
+                    ("tasks_imported", "Tasks Imported"),
+                ],
+                help_text="Type of activity performed",
+                max_length=50,
+            ),
+        ),
+    ]
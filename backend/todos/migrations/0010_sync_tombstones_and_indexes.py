@@ -0,0 +1,64 @@
+# Generated by Django 4.2.17 on 2026-10-19 10:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("todos", "0009_activity_tasks_deleted"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("todo_list", "Todo List"), ("task", "Task")],
+                        help_text="Type of the deleted object",
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.UUIDField(help_text="ID of the deleted object")),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "db_table": "todo_tombstones",
+                "ordering": ["deleted_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "updated_at"], name="tasks_user_id_06c430_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="todolist",
+            index=models.Index(
+                fields=["user", "updated_at"], name="todo_lists_user_id_13b636_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="tombstone",
+            name="user",
+            field=models.ForeignKey(
+                help_text="Owner of the deleted object",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tombstones",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(
+                fields=["user", "deleted_at"], name="todo_tombst_user_id_d51e6e_idx"
+            ),
+        ),
+    ]
@@ -11,6 +11,7 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 
 User = get_user_model()
 
@@ -33,7 +34,86 @@ class TaskStatus(models.TextChoices):
     DONE = 'done', 'Done'
 
 
-class TodoList(models.Model):
+# Sentinel for snapshot values that were never loaded
+_UNKNOWN = object()
+
+
+class ChangeTrackingModel(models.Model):
+    """
+    Abstract model that remembers the field values it was loaded with.
+    
+    Rows read from the database snapshot their values in ``from_db`` (no
+    extra queries). ``save()`` compares the current values with that
+    snapshot, exposes the result as ``last_changes`` to post_save
+    receivers, and skips the write entirely when nothing changed.
+    ``last_changes`` is None for inserts and for instances that were not
+    loaded from the database. ``auto_now`` timestamps are not compared.
+    """
+    
+    class Meta:
+        abstract = True
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot()
+        return instance
+    
+    @classmethod
+    def _tracked_fields(cls):
+        return [
+            field for field in cls._meta.concrete_fields
+            if not field.primary_key and not getattr(field, 'auto_now', False)
+        ]
+    
+    def _snapshot(self, fields=None):
+        """Remember current values of loaded fields (all, or just ``fields``)."""
+        if not hasattr(self, '_loaded_values'):
+            self._loaded_values = {}
+        deferred = self.get_deferred_fields()
+        for field in self._tracked_fields():
+            if field.attname in deferred:
+                continue
+            if fields is not None and field.name not in fields and field.attname not in fields:
+                continue
+            self._loaded_values[field.attname] = getattr(self, field.attname)
+    
+    def get_changes(self):
+        """
+        Return {field name: (old value, new value)} since the row was loaded.
+        
+        Unsaved instances report no changes. Deferred fields that were
+        never loaded are ignored; fields loaded after the snapshot count as
+        changed because their previous value is unknown.
+        """
+        if self._state.adding or not hasattr(self, '_loaded_values'):
+            return {}
+        deferred = self.get_deferred_fields()
+        changes = {}
+        for field in self._tracked_fields():
+            if field.attname in deferred:
+                continue
+            new_value = getattr(self, field.attname)
+            old_value = self._loaded_values.get(field.attname, _UNKNOWN)
+            if old_value is _UNKNOWN or old_value != new_value:
+                changes[field.name] = (None if old_value is _UNKNOWN else old_value, new_value)
+        return changes
+    
+    def save(self, *args, **kwargs):
+        """Save the row unless it was loaded and none of its fields changed."""
+        tracking = not self._state.adding and hasattr(self, '_loaded_values')
+        self.last_changes = self.get_changes() if tracking else None
+        if tracking and not self.last_changes:
+            return
+        super().save(*args, **kwargs)
+        self._snapshot()
+    
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._snapshot(fields)
+
+
+class TodoList(ChangeTrackingModel):
     """
     A todo list that contains multiple tasks.
     
@@ -77,6 +157,7 @@ class TodoList(models.Model):
         indexes = [
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['user', 'name']),
+            models.Index(fields=['user', 'updated_at']),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -91,11 +172,15 @@ class TodoList(models.Model):
     @property
     def task_count(self):
         """Total number of tasks in this todo list."""
+        if hasattr(self, 'annotated_task_count'):
+            return self.annotated_task_count
         return self.tasks.count()
     
     @property
     def completed_tasks(self):
         """Number of completed tasks in this todo list."""
+        if hasattr(self, 'annotated_completed_tasks'):
+            return self.annotated_completed_tasks
         return self.tasks.filter(status=TaskStatus.DONE).count()
     
     @property
@@ -108,11 +193,34 @@ class TodoList(models.Model):
     @property
     def overdue_count(self):
         """Number of overdue tasks in this todo list."""
+        if hasattr(self, 'annotated_overdue_count'):
+            return self.annotated_overdue_count
         today = date.today()
         return self.tasks.filter(
             end_date__lt=today,
             status__in=[TaskStatus.TODO, TaskStatus.ONGOING]
         ).count()
+    
+    @staticmethod
+    def annotate_task_stats(queryset):
+        """
+        Annotate a TodoList queryset with the counts behind task_count,
+        completed_tasks, progress_percentage and overdue_count, so those
+        properties need no per-list queries.
+        """
+        return queryset.annotate(
+            annotated_task_count=models.Count('tasks'),
+            annotated_completed_tasks=models.Count(
+                'tasks', filter=models.Q(tasks__status=TaskStatus.DONE)
+            ),
+            annotated_overdue_count=models.Count(
+                'tasks',
+                filter=models.Q(
+                    tasks__end_date__lt=date.today(),
+                    tasks__status__in=[TaskStatus.TODO, TaskStatus.ONGOING]
+                )
+            ),
+        )
 
     def clean(self):
         """Validate the todo list data."""
@@ -123,7 +231,7 @@ class TodoList(models.Model):
             raise ValidationError({'color': 'Color must be a 7-character hex code (e.g., #3B82F6)'})
 
 
-class Task(models.Model):
+class Task(ChangeTrackingModel):
     """
     A single task within a todo list.
     
@@ -193,6 +301,8 @@ class Task(models.Model):
             models.Index(fields=['end_date', 'status']),
             models.Index(fields=['user', 'status']),
             models.Index(fields=['user', 'priority']),
+            models.Index(fields=['user', 'start_date', 'end_date']),
+            models.Index(fields=['user', 'updated_at']),
         ]
     
     def __str__(self):
@@ -252,3 +362,83 @@ class Task(models.Model):
             self.completed_at = None
             
         super().save(*args, **kwargs)
+
+
+class TombstoneKind(models.TextChoices):
+    """Kinds of deleted objects tracked for delta sync."""
+    TODO_LIST = 'todo_list', 'Todo List'
+    TASK = 'task', 'Task'
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted todo list or task.
+    
+    Lets the delta sync endpoint tell clients which objects to drop since
+    their last sync. Tombstones are pruned after
+    SYNC_TOMBSTONE_RETENTION_DAYS; older sync tokens get a full resync.
+    """
+    
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='tombstones',
+        help_text="Owner of the deleted object"
+    )
+    kind = models.CharField(
+        max_length=20,
+        choices=TombstoneKind.choices,
+        help_text="Type of the deleted object"
+    )
+    object_id = models.UUIDField(help_text="ID of the deleted object")
+    deleted_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'todo_tombstones'
+        ordering = ['deleted_at']
+        indexes = [
+            models.Index(fields=['user', 'deleted_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted at {self.deleted_at}"
+
+
+class IdempotencyRecord(models.Model):
+    """
+    Stored result of a mutation sent with an idempotency key.
+    
+    Written in the same transaction as the mutation, so a replayed batch
+    operation returns the original result instead of applying it twice.
+    Records are pruned after IDEMPOTENCY_KEY_RETENTION_HOURS.
+    """
+    
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='idempotency_records',
+        help_text="User who sent the key"
+    )
+    key = models.CharField(max_length=255, help_text="Client-supplied idempotency key")
+    status_code = models.PositiveSmallIntegerField(help_text="Status of the original result")
+    response = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        null=True,
+        blank=True,
+        help_text="Body of the original result"
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'todo_idempotency_records'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_user_idempotency_key'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.key} ({self.status_code})"
@@ -0,0 +1,204 @@
+"""
+Daily deadline reminder digests.
+
+Open tasks (todo or ongoing) that are overdue by up to
+DEADLINE_REMINDER_OVERDUE_DAYS or due within DEADLINE_REMINDER_DAYS_AHEAD
+are read from the ``(end_date, status)`` index in keyset-paginated
+chunks ordered by (end_date, status, id), so each chunk is an index
+range scan and no OFFSET is ever used. Only the columns the email needs
+are fetched.
+
+Tasks are grouped per user while scanning; per user only the counts and
+the DEADLINE_DIGEST_MAX_TASKS earliest tasks are kept, so memory grows
+with the number of users, not tasks. Each active user then gets one
+digest email, queued in bulk through the outbox (accounts/outbox.py)
+in one transaction, which renders them from compiled templates and
+sends them in batches over one connection.
+
+A digest run is recorded in the cache per day, so a second run on the
+same day (a retried job, two schedulers) does not email everyone twice.
+"""
+
+import logging
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils.translation import ngettext
+
+from accounts.outbox import queue_many
+
+from .models import Task, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+DIGEST_TEMPLATE = 'emails/deadline_digest'
+
+OPEN_STATUSES = (TaskStatus.TODO, TaskStatus.ONGOING)
+
+# Defaults for the DEADLINE_REMINDER_* and DEADLINE_DIGEST_MAX_TASKS settings
+DEFAULT_DAYS_AHEAD = 1
+DEFAULT_OVERDUE_DAYS = 7
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_MAX_TASKS = 10
+
+# Users looked up per query when building the emails
+USER_CHUNK_SIZE = 1000
+
+TASK_FIELDS = ('id', 'end_date', 'status', 'title', 'priority', 'user_id')
+
+
+class UserDigest:
+    """One user's due and overdue task counts and most urgent tasks."""
+
+    __slots__ = ('overdue', 'due_today', 'due_soon', 'tasks')
+
+    def __init__(self):
+        self.overdue = 0
+        self.due_today = 0
+        self.due_soon = 0
+        self.tasks = []
+
+    @property
+    def total(self):
+        return self.overdue + self.due_today + self.due_soon
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def iter_due_tasks(start, end, chunk_size=None):
+    """
+    Yield open tasks with start <= end_date <= end, in (end_date, status, id) order.
+
+    Each chunk continues after the last row of the previous one (keyset
+    pagination) rather than using OFFSET.
+    """
+    chunk_size = chunk_size or _setting('DEADLINE_REMINDER_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    base = Task.objects.filter(end_date__lte=end, status__in=OPEN_STATUSES).order_by('end_date', 'status', 'id')
+    rows = list(base.filter(end_date__gte=start).values_list(*TASK_FIELDS)[:chunk_size])
+    while rows:
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last_id, last_end, last_status = rows[-1][0], rows[-1][1], rows[-1][2]
+        rows = list(
+            base.filter(end_date__gte=last_end)
+            .filter(
+                Q(end_date__gt=last_end)
+                | Q(end_date=last_end, status__gt=last_status)
+                | Q(end_date=last_end, status=last_status, id__gt=last_id)
+            )
+            .values_list(*TASK_FIELDS)[:chunk_size]
+        )
+
+
+def collect_digests(today, chunk_size=None):
+    """
+    Group the due and overdue tasks for ``today`` per user.
+
+    Returns:
+        Tuple of (dict of user id to UserDigest, number of tasks scanned)
+    """
+    start = today - timedelta(days=_setting('DEADLINE_REMINDER_OVERDUE_DAYS', DEFAULT_OVERDUE_DAYS))
+    end = today + timedelta(days=_setting('DEADLINE_REMINDER_DAYS_AHEAD', DEFAULT_DAYS_AHEAD))
+    max_tasks = _setting('DEADLINE_DIGEST_MAX_TASKS', DEFAULT_MAX_TASKS)
+
+    digests = {}
+    scanned = 0
+    for task_id, end_date, status, title, priority, user_id in iter_due_tasks(start, end, chunk_size):
+        scanned += 1
+        digest = digests.get(user_id)
+        if digest is None:
+            digest = digests[user_id] = UserDigest()
+        if end_date < today:
+            digest.overdue += 1
+        elif end_date == today:
+            digest.due_today += 1
+        else:
+            digest.due_soon += 1
+        # Rows arrive by end_date, so the first ones kept are the most urgent
+        if len(digest.tasks) < max_tasks:
+            digest.tasks.append({
+                'id': str(task_id),
+                'title': title,
+                'end_date': end_date.isoformat(),
+                'status': status,
+                'priority': priority,
+                'overdue': end_date < today,
+            })
+    return digests, scanned
+
+
+def _digest_messages(digests, today):
+    """Yield outbox messages for the digests of active users."""
+    site_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')
+    user_ids = list(digests)
+    for i in range(0, len(user_ids), USER_CHUNK_SIZE):
+        users = User.objects.filter(pk__in=user_ids[i:i + USER_CHUNK_SIZE], is_active=True).values_list('pk', 'email')
+        for user_id, email in users:
+            digest = digests[user_id]
+            subject = ngettext(
+                '%(count)d task is due or overdue', '%(count)d tasks are due or overdue', digest.total
+            ) % {'count': digest.total}
+            context = {
+                'site_name': 'Track',
+                'site_url': site_url,
+                'date': today.isoformat(),
+                'overdue': digest.overdue,
+                'due_today': digest.due_today,
+                'due_soon': digest.due_soon,
+                'tasks': digest.tasks,
+                'more': digest.total - len(digest.tasks),
+            }
+            yield subject, email, context, user_id
+
+
+def queue_digests(digests, today):
+    """
+    Queue the digest emails of active users in one transaction, so a
+    failed run leaves no digests behind to be sent twice by a retry.
+
+    Returns:
+        Number of emails queued
+    """
+    with transaction.atomic():
+        return queue_many(DIGEST_TEMPLATE, _digest_messages(digests, today))
+
+
+def send_deadline_digests(today=None, chunk_size=None, force=False):
+    """
+    Queue one deadline digest email per user with due or overdue tasks.
+
+    Args:
+        today: Date to send the digests for (defaults to today)
+        chunk_size: Tasks read per query
+        force: Send even if digests were already sent for this date
+
+    Returns:
+        Dict with the number of tasks scanned, users and emails queued,
+        or None if the digests for this date were already sent
+    """
+    today = today or date.today()
+    run_key = f'deadline_digest:{today.isoformat()}'
+    if force:
+        cache.set(run_key, True, 2 * 86400)
+    elif not cache.add(run_key, True, 2 * 86400):
+        logger.info(f"Deadline digests for {today} were already sent")
+        return None
+
+    try:
+        digests, scanned = collect_digests(today, chunk_size)
+        queued = queue_digests(digests, today)
+    except Exception:
+        cache.delete(run_key)
+        raise
+
+    logger.info(f"Queued {queued} deadline digests for {len(digests)} users ({scanned} tasks)")
+    return {'tasks': scanned, 'users': len(digests), 'emails': queued}
@@ -0,0 +1,156 @@
+"""
+Activity retention for the todos app.
+
+Old activities are deleted in primary-key range chunks: each chunk reads
+the next ``chunk_size`` ids in order and deletes that id range in its own
+short transaction, so no single statement locks or rewrites a large part
+of the table. Rows can be archived to gzip-compressed NDJSON files before
+they are deleted.
+"""
+
+import gzip
+import json
+import logging
+import os
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .activity_models import Activity
+
+logger = logging.getLogger(__name__)
+
+# Activities read and deleted per chunk
+RETENTION_CHUNK_SIZE = 5000
+
+ARCHIVE_FIELDS = (
+    'id', 'user_id', 'activity_type', 'title', 'description',
+    'todo_list_id', 'todo_list_name', 'task_id', 'task_title',
+    'timestamp', 'context',
+)
+
+
+class ActivityArchive:
+    """
+    Gzip-compressed NDJSON file of deleted activities, one row per line.
+
+    The file is created on the first write, so runs that delete nothing
+    leave no empty archives behind.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(
+            directory, f"activities-{timezone.now():%Y%m%d-%H%M%S}.ndjson.gz"
+        )
+        self.row_count = 0
+        self._file = None
+
+    def write(self, rows):
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = gzip.open(self.path, 'wt', encoding='utf-8')
+        self._file.writelines(json.dumps(row, cls=DjangoJSONEncoder) + '\n' for row in rows)
+        # Flush before the rows are deleted so a crash cannot lose them
+        self._file.flush()
+        self.row_count += len(rows)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def delete_in_pk_chunks(queryset, chunk_size=RETENTION_CHUNK_SIZE, archive=None, dry_run=False):
+    """
+    Delete (or with dry_run, count) a queryset in id-range chunks.
+
+    Works for any model with an integer ``id`` primary key; archiving
+    expects Activity rows.
+
+    Args:
+        queryset: Rows to delete
+        chunk_size: Rows per chunk
+        archive: Optional ActivityArchive that receives each chunk first
+        dry_run: Count matching rows without deleting or archiving
+
+    Returns:
+        Number of activities deleted (or that would be deleted)
+    """
+    if dry_run:
+        return queryset.count()
+
+    deleted = 0
+    last_id = 0
+    while True:
+        chunk = queryset.filter(id__gt=last_id).order_by('id')
+        if archive is not None:
+            rows = list(chunk.values(*ARCHIVE_FIELDS)[:chunk_size])
+            ids = [row['id'] for row in rows]
+        else:
+            ids = list(chunk.values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+
+        if archive is not None:
+            archive.write(rows)
+        with transaction.atomic():
+            count, _ = queryset.filter(id__gt=last_id, id__lte=ids[-1]).delete()
+        deleted += count
+        last_id = ids[-1]
+
+
+def prune_activities_older_than(days, chunk_size=RETENTION_CHUNK_SIZE, archive=None, dry_run=False):
+    """Delete activities older than ``days`` days. Returns the count."""
+    cutoff = timezone.now() - timezone.timedelta(days=days)
+    deleted = delete_in_pk_chunks(
+        Activity.objects.filter(timestamp__lt=cutoff),
+        chunk_size=chunk_size,
+        archive=archive,
+        dry_run=dry_run
+    )
+    logger.info(f"Pruned {deleted} activities older than {days} days (dry_run={dry_run})")
+    return deleted
+
+
+def prune_activities_over_cap(keep, chunk_size=RETENTION_CHUNK_SIZE, archive=None, dry_run=False):
+    """
+    Keep only the ``keep`` most recent activities of each user.
+
+    Returns:
+        Dict mapping user id to the number of activities deleted
+    """
+    over_cap = (
+        Activity.objects.order_by()
+        .values('user_id')
+        .annotate(total=Count('id'))
+        .filter(total__gt=keep)
+        .values_list('user_id', flat=True)
+    )
+
+    deleted = {}
+    for user_id in list(over_cap):
+        user_activities = Activity.objects.filter(user_id=user_id)
+        # Oldest activity that is still kept; everything older goes
+        boundary = user_activities.order_by('-timestamp', '-id').values('timestamp', 'id')[keep - 1]
+        older = user_activities.filter(
+            Q(timestamp__lt=boundary['timestamp']) |
+            Q(timestamp=boundary['timestamp'], id__lt=boundary['id'])
+        )
+        deleted[user_id] = delete_in_pk_chunks(
+            older, chunk_size=chunk_size, archive=archive, dry_run=dry_run
+        )
+
+    logger.info(
+        f"Capped activities at {keep} per user: {sum(deleted.values())} deleted "
+        f"for {len(deleted)} users (dry_run={dry_run})"
+    )
+    return deleted
@@ -7,6 +7,7 @@ providing API serialization/deserialization for the simplified todo system.
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from .models import TodoList, Task, TaskPriority, TaskStatus
 from .activity_models import Activity, ActivityType
 
@@ -53,28 +54,37 @@ class TodoListSerializer(serializers.ModelSerializer):
         return value
     
     def validate_name(self, value):
-        """Validate todo list name."""
+        """
+        Validate todo list name.
+        
+        Duplicate names are not checked here; the unique_user_todolist_name
+        constraint rejects them on save, which saves a query per write.
+        """
         if len(value.strip()) < 1:
             raise serializers.ValidationError("Name cannot be empty")
-        
-        # Check for duplicate name for the same user
-        user = self.context['request'].user
-        name = value.strip()
-        
-        # Exclude current instance if updating
-        queryset = TodoList.objects.filter(user=user, name=name)
-        if self.instance:
-            queryset = queryset.exclude(pk=self.instance.pk)
-        
-        if queryset.exists():
-            raise serializers.ValidationError("A todo list with this name already exists.")
-        
-        return name
+        return value.strip()
+    
+    def _duplicate_name_error(self):
+        return serializers.ValidationError({
+            'name': ["A todo list with this name already exists."]
+        })
     
     def create(self, validated_data):
         """Create todo list for the authenticated user."""
         validated_data['user'] = self.context['request'].user
-        return super().create(validated_data)
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise self._duplicate_name_error()
+    
+    def update(self, instance, validated_data):
+        """Update todo list, mapping name collisions to a validation error."""
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            raise self._duplicate_name_error()
 
 
 class TaskSerializer(serializers.ModelSerializer):
@@ -229,21 +239,62 @@ class TaskCreateSerializer(serializers.ModelSerializer):
         # Validate todo list ownership during creation
         if 'todo_list' in data:
             todo_list = data['todo_list']
-            user = self.context['request'].user
+            user = self._get_user()
             
-            if todo_list.user != user:
+            if todo_list.user_id != user.id:
                 raise serializers.ValidationError({
                     'todo_list': 'You can only create tasks in your own todo lists.'
                 })
         
         return data
     
+    def _get_user(self):
+        """Return the acting user from the request, or an explicit 'user' context entry."""
+        request = self.context.get('request')
+        if request is not None:
+            return request.user
+        return self.context['user']
+    
     def create(self, validated_data):
         """Create task for the authenticated user."""
-        validated_data['user'] = self.context['request'].user
+        validated_data['user'] = self._get_user()
         return super().create(validated_data)
 
 
+class PreloadedTodoListField(serializers.Field):
+    """
+    Resolve a todo list id against lists preloaded into the serializer context.
+    
+    Avoids the per-row primary key lookup of PrimaryKeyRelatedField when
+    validating many rows at once. Expects context['todo_lists'] to map
+    str(id) -> TodoList.
+    """
+    
+    default_error_messages = {
+        'does_not_exist': 'Todo list "{value}" does not exist.',
+    }
+    
+    def to_internal_value(self, data):
+        todo_list = self.context['todo_lists'].get(str(data))
+        if todo_list is None:
+            self.fail('does_not_exist', value=data)
+        return todo_list
+    
+    def to_representation(self, value):
+        return str(value.pk)
+
+
+class TaskImportSerializer(TaskCreateSerializer):
+    """
+    TaskCreateSerializer variant used to validate bulk imports.
+    
+    Applies the same rules as task creation but resolves todo lists from
+    the preloaded context so a batch of rows validates without queries.
+    """
+    
+    todo_list = PreloadedTodoListField()
+
+
 class TaskSummarySerializer(serializers.ModelSerializer):
     """
     Lightweight serializer for task summaries in lists.
@@ -3,12 +3,30 @@ Django signals for the todos app.
 
 This module contains signal handlers that automatically log user activities
 when todo lists and tasks are created, updated, or deleted.
+
+Deleting a todo list cascades to its tasks. Rather than logging one
+activity per task, the list's pre_delete handler summarizes the tasks in
+a single bulk insert, and the per-task delete handlers skip their work
+when the deletion originated from a todo list.
+
+Changes are also published as per-user live events (see
+track_project.events) for the Server-Sent Events stream.
 """
 
-from django.db.models.signals import post_save, pre_delete
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, pre_delete, post_delete
 from django.dispatch import receiver
-from .models import TodoList, Task, TaskStatus
+from .models import TodoList, Task, TaskStatus, Tombstone, TombstoneKind
 from .activity_models import Activity
+from .calendar_feed import invalidate_user_calendar
+from track_project.events import publish_event
+
+
+def _changed_field_names(instance):
+    """Names of the fields changed by the save that fired post_save, if known."""
+    changes = getattr(instance, 'last_changes', None)
+    return list(changes) if changes else None
 
 
 @receiver(post_save, sender=TodoList)
@@ -21,23 +39,62 @@ def log_todo_list_activity(sender, instance, created, **kwargs):
             todo_list=instance
         )
     else:
-        # Log todo list update
-        # Note: We can't easily detect what changed without tracking 
-        # previous values, so we'll log a generic update
+        # No-op saves never reach here (see ChangeTrackingModel.save)
         Activity.log_todo_list_updated(
             user=instance.user,
-            todo_list=instance
+            todo_list=instance,
+            changes=_changed_field_names(instance)
         )
 
 
+def _origin_is(origin, model):
+    if isinstance(origin, QuerySet):
+        return origin.model is model
+    return isinstance(origin, model)
+
+
+def is_todo_list_cascade(origin):
+    """Return True if a delete signal's origin is a todo list (or queryset of them)."""
+    return _origin_is(origin, TodoList)
+
+
+def is_user_cascade(origin):
+    """
+    Return True if the delete started from a user.
+    
+    Nothing may be written for the user then: rows inserted during the
+    delete would reference the user row being removed.
+    """
+    return _origin_is(origin, get_user_model())
+
+
 @receiver(pre_delete, sender=TodoList)
 def log_todo_list_deletion(sender, instance, **kwargs):
-    """Log activity when a todo list is deleted."""
+    """
+    Log activity when a todo list is deleted, summarizing its tasks, and
+    leave sync tombstones for the list and its tasks.
+    """
+    if is_user_cascade(kwargs.get('origin')):
+        return
+    deleted_tasks = list(
+        Task.objects.filter(todo_list_id=instance.id).values_list('id', 'title', 'user_id')
+    )
     Activity.log_todo_list_deleted(
         user=instance.user,
         todo_list_name=instance.name,
-        todo_list_id=instance.id
+        todo_list_id=instance.id,
+        deleted_tasks=deleted_tasks
     )
+    Tombstone.objects.bulk_create(
+        [Tombstone(user_id=instance.user_id, kind=TombstoneKind.TODO_LIST, object_id=instance.id)] +
+        [
+            Tombstone(user_id=user_id, kind=TombstoneKind.TASK, object_id=task_id)
+            for task_id, _, user_id in deleted_tasks
+        ]
+    )
+    # The owner's calendar is invalidated on post_delete; cover everyone else
+    for user_id in {user_id for _, _, user_id in deleted_tasks} - {instance.user_id}:
+        invalidate_user_calendar(user_id)
 
 
 @receiver(post_save, sender=Task)
@@ -49,41 +106,84 @@ def log_task_activity(sender, instance, created, **kwargs):
             user=instance.user,
             task=instance
         )
+        return
+    
+    changes = getattr(instance, 'last_changes', None) or {}
+    if 'status' in changes and instance.status == TaskStatus.DONE:
+        # The status changed to done in this save
+        Activity.log_task_completed(
+            user=instance.user,
+            task=instance
+        )
     else:
-        # Check if task was completed
-        if instance.status == TaskStatus.DONE and instance.completed_at:
-            # Check if this is a new completion (not just an update)
-            # We'll assume if completed_at is recent, it's a new completion
-            from django.utils import timezone
-            from datetime import timedelta
-            
-            recent_threshold = timezone.now() - timedelta(minutes=1)
-            if instance.completed_at >= recent_threshold:
-                Activity.log_task_completed(
-                    user=instance.user,
-                    task=instance
-                )
-            else:
-                # Regular update
-                Activity.log_task_updated(
-                    user=instance.user,
-                    task=instance
-                )
-        else:
-            # Regular task update
-            Activity.log_task_updated(
-                user=instance.user,
-                task=instance
-            )
+        # Regular task update
+        Activity.log_task_updated(
+            user=instance.user,
+            task=instance,
+            changes=_changed_field_names(instance)
+        )
 
 
 @receiver(pre_delete, sender=Task)
 def log_task_deletion(sender, instance, **kwargs):
-    """Log activity when a task is deleted."""
+    """Log activity and leave a sync tombstone when a task is deleted."""
+    origin = kwargs.get('origin')
+    if is_todo_list_cascade(origin) or is_user_cascade(origin):
+        # Summarized and tombstoned by log_todo_list_deletion, or owner deleted
+        return
     Activity.log_task_deleted(
         user=instance.user,
         task_title=instance.title,
         task_id=instance.id,
         todo_list_name=instance.todo_list.name,
         todo_list_id=instance.todo_list.id
-    )
\ No newline at end of file
+    )
+    Tombstone.objects.create(user_id=instance.user_id, kind=TombstoneKind.TASK, object_id=instance.id)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=TodoList)
+@receiver(post_delete, sender=TodoList)
+def invalidate_calendar_cache(sender, instance, **kwargs):
+    """Drop the owner's cached calendar months when tasks or lists change."""
+    if sender is Task and is_todo_list_cascade(kwargs.get('origin')):
+        # Invalidated once per owner when the todo list itself is deleted
+        return
+    invalidate_user_calendar(instance.user_id)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=TodoList)
+@receiver(post_delete, sender=TodoList)
+def publish_change_event(sender, instance, **kwargs):
+    """Publish a live event when a task or todo list changes."""
+    if sender is Task and is_todo_list_cascade(kwargs.get('origin')):
+        # Clients refetch the list's tasks on todo_list.deleted
+        return
+    
+    if 'created' not in kwargs:
+        action = 'deleted'
+    else:
+        action = 'created' if kwargs['created'] else 'updated'
+    
+    data = {'id': instance.id}
+    if sender is Task:
+        data['todo_list_id'] = instance.todo_list_id
+    if action == 'updated':
+        data['changes'] = _changed_field_names(instance) or []
+    
+    prefix = 'task' if sender is Task else 'todo_list'
+    publish_event(instance.user_id, f'{prefix}.{action}', data)
+
+
+@receiver(post_save, sender=Activity)
+def publish_activity_event(sender, instance, created, **kwargs):
+    """Publish a live event when an activity is logged or coalesced."""
+    publish_event(instance.user_id, 'activity.created' if created else 'activity.updated', {
+        'id': instance.id,
+        'activity_type': instance.activity_type,
+        'todo_list_id': instance.todo_list_id,
+        'task_id': instance.task_id,
+    })
@@ -0,0 +1,111 @@
+"""
+Delta sync for offline-capable clients.
+
+GET /api/sync/ returns everything plus a sync token; GET
+/api/sync/?since=<token> returns only the todo lists and tasks created or
+updated after the token was issued (read from the ``(user, updated_at)``
+indexes) and the ids of those deleted since (from tombstones).
+
+Tokens are signed timestamps. Each new token is backdated by
+SYNC_TOKEN_OVERLAP_SECONDS so rows saved by transactions that were still
+in flight are picked up by the next sync; clients must treat the
+payload as idempotent upserts. A token older than the tombstone
+retention window, or older than a completed "clear my data" job, gets a
+full resync (``reset: true``).
+"""
+
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import TodoList, Task, Tombstone, TombstoneKind
+
+SYNC_TOKEN_SALT = 'todos.sync'
+
+# Defaults for the SYNC_* settings
+DEFAULT_TOKEN_OVERLAP_SECONDS = 5
+DEFAULT_TOMBSTONE_RETENTION_DAYS = 30
+
+
+class InvalidSyncToken(ValueError):
+    """Raised when a sync token was not issued by this server."""
+
+
+def make_sync_token(moment):
+    return signing.dumps(moment.isoformat(), salt=SYNC_TOKEN_SALT, compress=True)
+
+
+def read_sync_token(token):
+    try:
+        return datetime.fromisoformat(signing.loads(token, salt=SYNC_TOKEN_SALT))
+    except (signing.BadSignature, TypeError, ValueError):
+        raise InvalidSyncToken('Invalid sync token.')
+
+
+def tombstone_cutoff():
+    """Tombstones older than this are pruned and tokens older than this reset."""
+    days = getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', DEFAULT_TOMBSTONE_RETENTION_DAYS)
+    return timezone.now() - timedelta(days=days)
+
+
+def _needs_reset(user, since):
+    if since < tombstone_cutoff():
+        return True
+    # Clearing user data uses raw deletes that leave no tombstones
+    from accounts.models import DataClearJob
+    return DataClearJob.objects.filter(
+        user=user, status=DataClearJob.STATUS_COMPLETED, finished_at__gt=since
+    ).exists()
+
+
+def get_changes(user, since=None):
+    """
+    Collect the user's changes since a token timestamp.
+
+    Args:
+        user: User to sync
+        since: Datetime read from the client's token, or None for a full sync
+
+    Returns:
+        Dict with 'token' (datetime for the next token), 'reset', 'todo_lists'
+        and 'tasks' querysets, and 'deleted' ({'todo_lists': [...], 'tasks': [...]})
+    """
+    now = timezone.now()
+    overlap = getattr(settings, 'SYNC_TOKEN_OVERLAP_SECONDS', DEFAULT_TOKEN_OVERLAP_SECONDS)
+
+    reset = since is None or _needs_reset(user, since)
+    todo_lists = TodoList.annotate_task_stats(TodoList.objects.filter(user=user))
+    tasks = Task.objects.filter(user=user).select_related('todo_list')
+    deleted = {'todo_lists': [], 'tasks': []}
+
+    if not reset:
+        tasks = tasks.filter(updated_at__gt=since)
+        # Lists whose task counts changed are resent along with edited lists
+        todo_lists = todo_lists.filter(
+            Q(updated_at__gt=since) |
+            Exists(Task.objects.filter(todo_list=OuterRef('pk'), updated_at__gt=since))
+        )
+        for kind, object_id in Tombstone.objects.filter(
+            user=user, deleted_at__gt=since
+        ).values_list('kind', 'object_id'):
+            key = 'todo_lists' if kind == TombstoneKind.TODO_LIST else 'tasks'
+            deleted[key].append(object_id)
+
+    return {
+        'token': now - timedelta(seconds=overlap),
+        'reset': reset,
+        'todo_lists': todo_lists.order_by('updated_at'),
+        'tasks': tasks.order_by('updated_at'),
+        'deleted': deleted,
+    }
+
+
+def prune_tombstones(chunk_size=5000):
+    """Delete tombstones past the retention window in id-range chunks."""
+    from .retention import delete_in_pk_chunks
+    return delete_in_pk_chunks(
+        Tombstone.objects.filter(deleted_at__lt=tombstone_cutoff()), chunk_size=chunk_size
+    )
@@ -0,0 +1,19 @@
+"""
+Background jobs for the todos app.
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def send_deadline_reminders():
+    """Celery entry point for the daily deadline digests (see todos/reminders.py)."""
+    from .reminders import send_deadline_digests
+
+    result = send_deadline_digests()
+    if result is not None:
+        logger.info(f"Deadline reminders: {result}")
@@ -5,9 +5,12 @@ This module defines the API endpoints for TodoList and Task operations
 using DRF router for consistent RESTful routing.
 """
 
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TodoListViewSet, TaskViewSet, ActivityViewSet
+from .views import TodoListViewSet, TaskViewSet, ActivityViewSet, SyncView, BatchView
+from .event_stream import event_stream
+from . import async_views
 
 # Create a router and register our viewsets
 router = DefaultRouter()
@@ -18,4 +21,19 @@ router.register(r'activities', ActivityViewSet, basename='activity')
 urlpatterns = [
     # Include all router URLs
     path('', include(router.urls)),
-]
\ No newline at end of file
+    # Delta sync for offline clients
+    path('sync/', SyncView.as_view(), name='sync'),
+    # Batched mutations from offline clients' write queues
+    path('batch/', BatchView.as_view(), name='batch'),
+    # Server-Sent Events (ASGI worker only)
+    path('events/', event_stream, name='event-stream'),
+]
+
+if getattr(settings, 'ASYNC_READ_VIEWS', False):
+    # Async versions of the read-heavy actions take precedence over the router
+    urlpatterns = [
+        path('tasks/dashboard/', async_views.task_dashboard, name='task-dashboard-async'),
+        path('tasks/summary/', async_views.task_summary, name='task-summary-async'),
+        path('todolists/summary/', async_views.todo_list_summary, name='todolist-summary-async'),
+        path('activities/recent/', async_views.recent_activities, name='activity-recent-async'),
+    ] + urlpatterns
@@ -5,13 +5,21 @@ This module contains DRF ViewSets for the TodoList and Task models,
 providing full CRUD operations with filtering, search, and pagination.
 """
 
+import csv
+
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
+from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
 from django.db.models import Q, Count, Case, When, IntegerField
-from datetime import date, timedelta
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.core.exceptions import ValidationError as DjangoValidationError
+from datetime import date, datetime, time, timedelta
 
 from .models import TodoList, Task, TaskStatus
 from .activity_models import Activity
@@ -20,6 +28,15 @@ from .serializers import (
     TodoListSummarySerializer, TaskSummarySerializer, ActivitySerializer
 )
 from .filters import TodoListFilter, TaskFilter
+from .calendar_feed import build_calendar, MAX_CALENDAR_RANGE_DAYS
+from .dashboard import dashboard_querysets, dashboard_stat_aggregates
+from .batch import run_batch, DEFAULT_MAX_OPERATIONS
+from .sync import get_changes, make_sync_token, read_sync_token, InvalidSyncToken
+from .importers import (
+    import_tasks, iter_rows, detect_import_format, ImportFormatError, IMPORT_FORMATS
+)
+from track_project.exports import stream_export, get_export_format, invalid_export_format_response
+from track_project.idempotency import idempotent
 
 
 class TodoListViewSet(viewsets.ModelViewSet):
@@ -38,6 +55,7 @@ class TodoListViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'description']
     ordering_fields = ['name', 'created_at', 'updated_at', 'task_count', 'progress_percentage']
     ordering = ['-created_at']  # Default ordering: newest first
+    throttle_scopes = {'summary': 'reads'}
     
     def get_queryset(self):
         """Return todo lists for the authenticated user only."""
@@ -54,7 +72,9 @@ class TodoListViewSet(viewsets.ModelViewSet):
         
         Returns lightweight serialization suitable for overview displays.
         """
-        queryset = self.get_queryset()
+        queryset = TodoList.annotate_task_stats(
+            self.get_queryset().prefetch_related(None)
+        ).order_by('-created_at')
         serializer = TodoListSummarySerializer(queryset, many=True)
         return Response(serializer.data)
     
@@ -104,6 +124,21 @@ class TaskViewSet(viewsets.ModelViewSet):
         'created_at', 'updated_at', 'completed_at'
     ]
     ordering = ['-created_at']  # Default ordering: newest first
+    throttle_scopes = {'dashboard': 'reads', 'summary': 'reads', 'calendar': 'reads'}
+    export_fields = [
+        ('id', 'id'),
+        ('title', 'title'),
+        ('description', 'description'),
+        ('priority', 'priority'),
+        ('status', 'status'),
+        ('start_date', 'start_date'),
+        ('end_date', 'end_date'),
+        ('todo_list', 'todo_list_id'),
+        ('todo_list_name', 'todo_list__name'),
+        ('completed_at', 'completed_at'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    ]
     
     def get_queryset(self):
         """Return tasks for the authenticated user only."""
@@ -117,6 +152,11 @@ class TaskViewSet(viewsets.ModelViewSet):
             return TaskSummarySerializer
         return TaskSerializer
     
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        """Create a task; retries with the same Idempotency-Key are replayed."""
+        return super().create(request, *args, **kwargs)
+    
     def perform_create(self, serializer):
         """Create task for the authenticated user."""
         serializer.save(user=self.request.user)
@@ -134,44 +174,60 @@ class TaskViewSet(viewsets.ModelViewSet):
         """
         if not request.user.is_authenticated:
             return Response({'error': 'Authentication required'}, status=401)
-            
+        
         today = date.today()
-        tomorrow = today + timedelta(days=1)
-        week_end = today + timedelta(days=7)
-        
-        # Get tasks for the authenticated user
-        tasks = Task.objects.filter(user=request.user).select_related('todo_list')
-        
-        # Categorize tasks
-        today_tasks = tasks.filter(end_date=today).exclude(status=TaskStatus.DONE)
-        recent_activity = tasks.order_by('-updated_at')[:5]
-        upcoming_tasks = tasks.filter(
-            end_date__gte=tomorrow,
-            end_date__lte=week_end
-        ).exclude(status=TaskStatus.DONE)
-        overdue_tasks = tasks.filter(
-            end_date__lt=today
-        ).exclude(status=TaskStatus.DONE)
+        querysets = dashboard_querysets(request.user, today)
         
         # Serialize the data
         context = {'request': request}
         dashboard_data = {
-            'today_tasks': TaskSummarySerializer(today_tasks, many=True, context=context).data,
-            'recent_activity': TaskSummarySerializer(recent_activity, many=True, context=context).data,
-            'upcoming_tasks': TaskSummarySerializer(upcoming_tasks, many=True, context=context).data,
-            'summary_stats': {
-                'total_tasks': tasks.count(),
-                'completed_tasks': tasks.filter(status=TaskStatus.DONE).count(),
-                'ongoing_tasks': tasks.filter(status=TaskStatus.ONGOING).count(),
-                'todo_tasks': tasks.filter(status=TaskStatus.TODO).count(),
-                'overdue_tasks': overdue_tasks.count(),
-                'today_tasks_count': today_tasks.count(),
-                'upcoming_tasks_count': upcoming_tasks.count(),
-            }
+            'today_tasks': TaskSummarySerializer(querysets['today_tasks'], many=True, context=context).data,
+            'recent_activity': TaskSummarySerializer(querysets['recent_activity'], many=True, context=context).data,
+            'upcoming_tasks': TaskSummarySerializer(querysets['upcoming_tasks'], many=True, context=context).data,
+            'summary_stats': querysets['tasks'].order_by().aggregate(**dashboard_stat_aggregates(today)),
         }
         
         return Response(dashboard_data)
     
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        Get tasks overlapping a date window, bucketed per day.
+        
+        Query parameters:
+        - from: First day of the window (YYYY-MM-DD, default: first of this month)
+        - to: Last day of the window (YYYY-MM-DD, default: last of this month)
+        
+        Returns each task once under 'tasks' and a 'days' map of
+        date -> task ids. Months are cached per user.
+        """
+        today = date.today()
+        try:
+            start = date.fromisoformat(request.query_params.get('from', today.replace(day=1).isoformat()))
+            if 'to' in request.query_params:
+                end = date.fromisoformat(request.query_params['to'])
+            else:
+                next_month = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+                end = next_month - timedelta(days=1)
+        except ValueError:
+            return Response(
+                {'detail': 'from and to must be dates in YYYY-MM-DD format.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if end < start:
+            return Response(
+                {'detail': 'to must be on or after from.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if (end - start).days + 1 > MAX_CALENDAR_RANGE_DAYS:
+            return Response(
+                {'detail': f'Date range cannot exceed {MAX_CALENDAR_RANGE_DAYS} days.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response(build_calendar(request.user.id, start, end))
+    
     @action(detail=False, methods=['get'])
     def summary(self, request):
         """
@@ -210,7 +266,81 @@ class TaskViewSet(viewsets.ModelViewSet):
         
         return Response(status_data)
     
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream all matching tasks as a file download.
+        
+        Accepts the same filters as the list endpoint.
+        
+        Query parameters:
+        - export_format: 'csv' (default) or 'ndjson'
+        """
+        export_format = get_export_format(request)
+        if export_format is None:
+            return invalid_export_format_response()
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        return stream_export(queryset, self.export_fields, 'tasks', export_format)
+    
+    @action(
+        detail=False, methods=['post'], url_path='import',
+        parser_classes=[MultiPartParser, FormParser]
+    )
+    def import_tasks(self, request):
+        """
+        Bulk import tasks from an uploaded CSV, NDJSON or JSON file.
+        
+        Form fields:
+        - file: The upload (required)
+        - import_format: 'csv', 'ndjson' or 'json' (default: from file extension)
+        - todo_list: Todo list id for rows without todo_list/todo_list_name
+        - dry_run: Validate without creating tasks
+        
+        Valid rows are created even when other rows fail validation;
+        per-row errors are returned alongside the created count. A file
+        that cannot be parsed returns 400 and creates nothing.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': ['No file was submitted.']}, status=status.HTTP_400_BAD_REQUEST)
+        
+        import_format = request.data.get('import_format') or detect_import_format(upload.name)
+        if import_format not in IMPORT_FORMATS:
+            return Response(
+                {'import_format': [f"Must be one of: {', '.join(IMPORT_FORMATS)}"]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        default_todo_list = None
+        todo_list_id = request.data.get('todo_list')
+        if todo_list_id:
+            try:
+                default_todo_list = TodoList.objects.filter(user=request.user, pk=todo_list_id).first()
+            except DjangoValidationError:
+                default_todo_list = None
+            if default_todo_list is None:
+                return Response(
+                    {'todo_list': ['Todo list not found.']},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('true', '1')
+        try:
+            result = import_tasks(
+                request.user,
+                iter_rows(upload, import_format),
+                default_todo_list=default_todo_list,
+                dry_run=dry_run
+            )
+        except (ImportFormatError, UnicodeDecodeError, csv.Error) as e:
+            return Response({'file': [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response_status = status.HTTP_201_CREATED if result['created'] and not dry_run else status.HTTP_200_OK
+        return Response(result, status=response_status)
+    
     @action(detail=True, methods=['post'])
+    @idempotent
     def mark_complete(self, request, pk=None):
         """
         Mark a task as complete.
@@ -260,6 +390,19 @@ class ActivityViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['timestamp']
     ordering = ['-timestamp']  # Default ordering: newest first
+    throttle_scopes = {'recent': 'reads'}
+    export_fields = [
+        ('id', 'id'),
+        ('activity_type', 'activity_type'),
+        ('title', 'title'),
+        ('description', 'description'),
+        ('todo_list_id', 'todo_list_id'),
+        ('todo_list_name', 'todo_list_name'),
+        ('task_id', 'task_id'),
+        ('task_title', 'task_title'),
+        ('timestamp', 'timestamp'),
+        ('context', 'context'),
+    ]
     
     def get_queryset(self):
         """Return activities for the authenticated user only."""
@@ -287,6 +430,60 @@ class ActivityViewSet(viewsets.ReadOnlyModelViewSet):
             'count': len(serializer.data)
         })
     
+    @action(detail=False, methods=['get'])
+    def daily(self, request):
+        """
+        Get daily rollups of the user's activity.
+        
+        One entry per day with activity, newest first, counting activities
+        by type instead of returning every row.
+        
+        Query parameters:
+        - days: Number of days to cover, including today (default: 7, max: 90)
+        """
+        try:
+            days = int(request.query_params.get('days', 7))
+            days = max(1, min(days, 90))
+        except (ValueError, TypeError):
+            days = 7
+        
+        start = timezone.localdate() - timedelta(days=days - 1)
+        rows = (
+            self.get_queryset()
+            .filter(timestamp__gte=timezone.make_aware(datetime.combine(start, time.min)))
+            .annotate(day=TruncDate('timestamp'))
+            .order_by()
+            .values('day', 'activity_type')
+            .annotate(count=Count('id'))
+        )
+        
+        rollups = {}
+        for row in rows:
+            rollup = rollups.setdefault(row['day'], {'date': row['day'], 'total': 0, 'counts': {}})
+            rollup['counts'][row['activity_type']] = row['count']
+            rollup['total'] += row['count']
+        
+        results = sorted(rollups.values(), key=lambda rollup: rollup['date'], reverse=True)
+        return Response({
+            'results': results,
+            'days': days,
+        })
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream the user's full activity history as a file download.
+        
+        Query parameters:
+        - export_format: 'csv' (default) or 'ndjson'
+        """
+        export_format = get_export_format(request)
+        if export_format is None:
+            return invalid_export_format_response()
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        return stream_export(queryset, self.export_fields, 'activities', export_format)
+    
     @action(detail=False, methods=['post'])
     def cleanup_old(self, request):
         """
@@ -313,3 +510,75 @@ class ActivityViewSet(viewsets.ReadOnlyModelViewSet):
             'deleted_count': deleted_count,
             'days_kept': days
         })
+
+
+class SyncView(APIView):
+    """
+    Delta sync of the user's todo lists and tasks.
+    
+    GET /api/sync/?since=<token>
+    
+    Without since (or when reset is true) the response holds every list
+    and task; otherwise only those changed since the token, plus the ids
+    of deleted ones. Store the returned token for the next call.
+    """
+    
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'reads'
+    
+    def get(self, request):
+        since = None
+        if request.query_params.get('since'):
+            try:
+                since = read_sync_token(request.query_params['since'])
+            except InvalidSyncToken as e:
+                return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        changes = get_changes(request.user, since)
+        context = {'request': request}
+        return Response({
+            'token': make_sync_token(changes['token']),
+            'reset': changes['reset'],
+            'todo_lists': TodoListSerializer(changes['todo_lists'], many=True, context=context).data,
+            'tasks': TaskSerializer(changes['tasks'], many=True, context=context).data,
+            'deleted': changes['deleted'],
+        })
+
+
+class BatchView(APIView):
+    """
+    Apply an ordered batch of task and todo list mutations.
+    
+    POST /api/batch/ with {"operations": [...], "atomic": true}; see
+    todos/batch.py for the operation format. Returns a result per
+    operation. A rolled-back atomic batch answers with the status of the
+    operation that failed.
+    """
+    
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        operations = request.data.get('operations') if isinstance(request.data, dict) else None
+        if not isinstance(operations, list) or not operations:
+            return Response(
+                {'operations': 'Provide a non-empty list of operations.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        max_operations = getattr(settings, 'BATCH_MAX_OPERATIONS', DEFAULT_MAX_OPERATIONS)
+        if len(operations) > max_operations:
+            return Response(
+                {'operations': f'A batch can hold at most {max_operations} operations.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        atomic = request.data.get('atomic', True)
+        if not isinstance(atomic, bool):
+            return Response({'atomic': 'Must be true or false.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        results, committed = run_batch(request, operations, atomic=atomic)
+        response_status = status.HTTP_200_OK
+        if not committed:
+            response_status = next(
+                result['status'] for result in results
+                if result['status'] != status.HTTP_424_FAILED_DEPENDENCY
+            )
+        return Response({'committed': committed, 'results': results}, status=response_status)
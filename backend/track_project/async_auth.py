@@ -0,0 +1,48 @@
+"""
+JWT authentication for plain async Django views.
+
+DRF views and authentication classes are synchronous, so the async
+endpoints (the SSE stream and the async read views) validate the
+simplejwt access token themselves and resolve the user through the same
+cache as CachedJWTAuthentication.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.authentication import user_for_token
+
+
+def _raw_token(request, allow_query_token):
+    header = request.headers.get('Authorization', '')
+    if header.startswith('Bearer '):
+        return header[len('Bearer '):]
+    if allow_query_token:
+        return request.GET.get('token')
+    return None
+
+
+async def get_jwt_user(request, allow_query_token=False):
+    """
+    Return the active user for the request's access token, or None.
+
+    The token is read from the Authorization header, or with
+    allow_query_token from ``?token=`` (EventSource cannot send headers).
+    """
+    raw_token = _raw_token(request, allow_query_token)
+    if not raw_token:
+        return None
+    try:
+        token = AccessToken(raw_token)
+    except TokenError:
+        return None
+    return await sync_to_async(user_for_token)(token)
+
+
+def authentication_failed_response():
+    """401 response matching DRF's body for missing or invalid credentials."""
+    return JsonResponse(
+        {'detail': 'Authentication credentials were not provided or are invalid.'}, status=401
+    )
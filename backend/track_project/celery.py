@@ -0,0 +1,16 @@
+"""
+Celery application for track_project.
+
+Background jobs live in each app's ``tasks.py`` and are discovered
+automatically. Workers are started with ``celery -A track_project worker``.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "track_project.settings")
+
+app = Celery("track_project")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
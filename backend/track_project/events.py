@@ -0,0 +1,161 @@
+"""
+Per-user change events for live clients.
+
+Model signals publish small JSON events (``{"type": "task.updated", ...}``)
+after the surrounding transaction commits. Server-Sent Events streams
+subscribe to a user's events and forward them to the browser, so open
+tabs can refetch only what changed instead of polling.
+
+Two buses are available, selected by ``EVENT_BUS_URL``:
+
+- ``redis://...``: Redis pub/sub, one channel per user. Required in
+  production, where events are published by the gunicorn (WSGI) workers
+  and consumed by a separate ASGI worker.
+- ``memory://``: in-process fan-out, for development and tests where the
+  publisher and the stream share a process.
+
+Publishing never raises: a bus outage must not break writes.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = 'user-events'
+
+# Events buffered per in-process subscriber before new ones are dropped
+LOCAL_QUEUE_SIZE = 100
+
+# Seconds a publish waits on Redis, so a hung server cannot stall the request
+PUBLISH_TIMEOUT = 0.5
+
+
+def _channel(user_id):
+    return f'{CHANNEL_PREFIX}:{user_id}'
+
+
+class _LocalSubscription:
+    def __init__(self, queue):
+        self.queue = queue
+
+    async def get(self, timeout):
+        """Return the next event, or None after ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalEventBus:
+    """In-process bus; publishers may run in any thread."""
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, user_id, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(str(user_id), ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._offer, queue, message)
+
+    @staticmethod
+    def _offer(queue, message):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A stalled client misses events and refetches on reconnect
+            pass
+
+    @asynccontextmanager
+    async def subscribe(self, user_id):
+        entry = (asyncio.get_running_loop(), asyncio.Queue(maxsize=LOCAL_QUEUE_SIZE))
+        with self._lock:
+            self._subscribers[str(user_id)].add(entry)
+        try:
+            yield _LocalSubscription(entry[1])
+        finally:
+            with self._lock:
+                self._subscribers[str(user_id)].discard(entry)
+                if not self._subscribers[str(user_id)]:
+                    del self._subscribers[str(user_id)]
+
+
+class _RedisSubscription:
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    async def get(self, timeout):
+        """Return the next event, or None after ``timeout`` seconds."""
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        data = message['data']
+        return data.decode() if isinstance(data, bytes) else data
+
+
+class RedisEventBus:
+    """Redis pub/sub bus shared by all processes."""
+
+    def __init__(self, url):
+        self.url = url
+        self._client = None
+
+    def publish(self, user_id, message):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(
+                self.url, socket_timeout=PUBLISH_TIMEOUT, socket_connect_timeout=PUBLISH_TIMEOUT
+            )
+        self._client.publish(_channel(user_id), message)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id):
+        import redis.asyncio as aioredis
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(_channel(user_id))
+            yield _RedisSubscription(pubsub)
+        finally:
+            await pubsub.close()
+            await client.close()
+
+
+@lru_cache(maxsize=None)
+def _bus_for_url(url):
+    if url.startswith('memory://'):
+        return LocalEventBus()
+    return RedisEventBus(url)
+
+
+def get_event_bus():
+    """Return the bus configured by ``EVENT_BUS_URL`` (one per URL per process)."""
+    return _bus_for_url(getattr(settings, 'EVENT_BUS_URL', 'memory://'))
+
+
+def publish_event(user_id, event_type, data=None):
+    """
+    Publish an event to a user's subscribers once the transaction commits.
+
+    Events from rolled-back transactions are never sent.
+    """
+    event = {'type': event_type, **(data or {})}
+
+    def send():
+        try:
+            get_event_bus().publish(user_id, json.dumps(event, cls=DjangoJSONEncoder))
+        except Exception as e:
+            logger.warning(f"Could not publish {event_type} event for user {user_id}: {e}")
+
+    transaction.on_commit(send)
@@ -0,0 +1,107 @@
+"""
+Idempotency-Key support for POST endpoints that create or change objects.
+
+A client that may retry a request sends a unique ``Idempotency-Key``
+header. The first response is stored in the cache for
+IDEMPOTENCY_KEY_TTL seconds, keyed by user, endpoint and key; retries
+with the same key get the stored response back, marked with an
+``Idempotent-Replayed: true`` header, instead of running the view again.
+
+- A retry that arrives while the first request is still running gets 409.
+- Reusing a key with a different request body gets 422.
+- Server errors (5xx) and 429s are not stored, so those can be retried.
+- If the cache is unreachable the view runs without deduplication.
+
+Batched mutations (/api/batch/) keep their per-operation keys in the
+database instead, in the same transaction as the writes.
+"""
+
+import hashlib
+import json
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+# Default for the IDEMPOTENCY_KEY_TTL setting (seconds)
+DEFAULT_KEY_TTL = 24 * 60 * 60
+
+# Seconds before an in-flight marker expires if its worker died
+IN_FLIGHT_TIMEOUT = 60
+
+MAX_KEY_LENGTH = 255
+
+
+def _cache_key(request, key):
+    scope = f'{request.user.pk}:{request.method}:{request.path}:{key}'
+    return 'idempotency:' + hashlib.sha256(scope.encode()).hexdigest()
+
+
+def _fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def idempotent(view_method):
+    """Replay the stored response for requests repeating an Idempotency-Key."""
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return view_method(self, request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'detail': f'{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        cache_key = _cache_key(request, key)
+        fingerprint = _fingerprint(request)
+        in_flight_key = f'{cache_key}:in-flight'
+        try:
+            stored = cache.get(cache_key)
+            claimed = stored is None and cache.add(in_flight_key, 1, IN_FLIGHT_TIMEOUT)
+        except Exception as e:
+            # A cache outage must not fail the write; run it without deduplication
+            logger.warning(f"Could not read idempotency key for user {request.user.pk}: {str(e)}")
+            return view_method(self, request, *args, **kwargs)
+
+        if stored is not None:
+            if stored['fingerprint'] != fingerprint:
+                return Response(
+                    {'detail': f'This {IDEMPOTENCY_HEADER} was already used with a different request.'},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                )
+            return Response(stored['data'], status=stored['status'], headers={REPLAYED_HEADER: 'true'})
+        if not claimed:
+            return Response(
+                {'detail': f'A request with this {IDEMPOTENCY_HEADER} is still being processed.'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        try:
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code < 500 and response.status_code != status.HTTP_429_TOO_MANY_REQUESTS:
+                try:
+                    cache.set(cache_key, {
+                        'fingerprint': fingerprint,
+                        'status': response.status_code,
+                        'data': response.data,
+                    }, getattr(settings, 'IDEMPOTENCY_KEY_TTL', DEFAULT_KEY_TTL))
+                except Exception as e:
+                    logger.warning(f"Could not store idempotent response for user {request.user.pk}: {str(e)}")
+            return response
+        finally:
+            try:
+                cache.delete(in_flight_key)
+            except Exception as e:
+                logger.warning(f"Could not release idempotency key for user {request.user.pk}: {str(e)}")
+    return wrapper
@@ -0,0 +1,187 @@
+"""
+Sliding-window rate limiter shared by the DRF throttles and async views.
+
+Each limit is approximated with two fixed-window counters: a request is
+allowed while ``previous * (1 - elapsed fraction) + current`` stays below
+the limit, which smooths out the burst a plain fixed window allows at
+window boundaries.
+
+Two limiters are available, selected by ``RATE_LIMIT_URL``:
+
+- ``redis://...``: counters shared by all workers. A check is one Lua
+  script call (one round-trip) that reads both counters, increments the
+  current one if allowed, and counts rejections per scope in the
+  ``ratelimit:rejections`` hash.
+- ``memory://``: per-process counters, for development and tests.
+
+When Redis is unreachable the Redis limiter falls back to per-process
+counters for REDIS_RETRY_SECONDS instead of failing requests.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'ratelimit'
+REJECTIONS_KEY = f'{KEY_PREFIX}:rejections'
+
+# Seconds to use the local fallback after a Redis error before retrying
+REDIS_RETRY_SECONDS = 5
+
+# Local counters are swept of expired windows past this many keys
+LOCAL_MAX_KEYS = 100000
+
+# KEYS: current window counter, previous window counter, rejections hash
+# ARGV: limit, window seconds, elapsed fraction of the current window, scope
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local estimate = previous * (1 - tonumber(ARGV[3])) + current
+if estimate + 1 > tonumber(ARGV[1]) then
+    redis.call('HINCRBY', KEYS[3], ARGV[4], 1)
+    return {0, current, previous}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]) * 2)
+end
+return {1, current, previous}
+"""
+
+
+def _windows(window, now):
+    index = int(now // window)
+    return index, (now - index * window) / window
+
+
+def _retry_after(limit, window, fraction, current, previous):
+    """Seconds until the estimate drops enough to allow one more request."""
+    if current + 1 > limit or previous == 0:
+        # Only the next window can help
+        return math.ceil((1 - fraction) * window)
+    # previous * (1 - f) + current + 1 <= limit  =>  f >= 1 - (limit - current - 1) / previous
+    needed = 1 - (limit - current - 1) / previous
+    return max(1, math.ceil((needed - fraction) * window))
+
+
+class LocalRateLimiter:
+    """Per-process sliding-window counters."""
+
+    def __init__(self):
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._rejections = Counter()
+
+    def hit(self, scope, key, limit, window):
+        """
+        Count a request against ``limit`` per ``window`` seconds.
+
+        Returns:
+            Tuple of (allowed, seconds to wait before retrying)
+        """
+        index, fraction = _windows(window, time.time())
+        counter_key = f'{scope}:{key}:{window}'
+        with self._lock:
+            if len(self._counters) > LOCAL_MAX_KEYS:
+                self._sweep()
+            counts = self._counters.get(counter_key)
+            if counts is None or counts[0] < index - 1:
+                counts = [index, 0, 0]
+            elif counts[0] == index - 1:
+                counts = [index, 0, counts[1]]
+            _, current, previous = counts
+            if previous * (1 - fraction) + current + 1 > limit:
+                self._counters[counter_key] = counts
+                self._rejections[scope] += 1
+                return False, _retry_after(limit, window, fraction, current, previous)
+            counts[1] += 1
+            self._counters[counter_key] = counts
+        return True, 0
+
+    def _sweep(self):
+        now = time.time()
+        for counter_key, counts in list(self._counters.items()):
+            window = int(counter_key.rsplit(':', 1)[1])
+            if counts[0] < int(now // window) - 1:
+                del self._counters[counter_key]
+
+    def rejection_counts(self):
+        with self._lock:
+            return dict(self._rejections)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._rejections.clear()
+
+
+class RedisRateLimiter:
+    """Sliding-window counters in Redis, one round-trip per check."""
+
+    def __init__(self, url):
+        self.url = url
+        self._script = None
+        self._fallback = LocalRateLimiter()
+        self._retry_at = 0
+
+    def _get_script(self):
+        if self._script is None:
+            import redis
+            client = redis.Redis.from_url(self.url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            self._script = client.register_script(SLIDING_WINDOW_SCRIPT)
+        return self._script
+
+    def hit(self, scope, key, limit, window):
+        """See LocalRateLimiter.hit."""
+        if time.monotonic() < self._retry_at:
+            return self._fallback.hit(scope, key, limit, window)
+
+        import redis
+        now = time.time()
+        index, fraction = _windows(window, now)
+        base = f'{KEY_PREFIX}:{scope}:{key}:{window}'
+        try:
+            allowed, current, previous = self._get_script()(
+                keys=[f'{base}:{index}', f'{base}:{index - 1}', REJECTIONS_KEY],
+                args=[limit, window, fraction, scope],
+            )
+        except redis.RedisError as e:
+            logger.warning(f'Rate limiter falling back to local counters for {REDIS_RETRY_SECONDS}s: {e}')
+            self._retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+            return self._fallback.hit(scope, key, limit, window)
+
+        if allowed:
+            return True, 0
+        return False, _retry_after(limit, window, fraction, int(current), int(previous))
+
+    def rejection_counts(self):
+        """Rejections per scope across all workers."""
+        import redis
+        try:
+            client = self._get_script().registered_client
+            counts = client.hgetall(REJECTIONS_KEY)
+        except redis.RedisError:
+            return self._fallback.rejection_counts()
+        return {scope.decode(): int(count) for scope, count in counts.items()}
+
+    def reset(self):
+        self._fallback.reset()
+
+
+@lru_cache(maxsize=None)
+def _limiter_for_url(url):
+    if url.startswith('memory://'):
+        return LocalRateLimiter()
+    return RedisRateLimiter(url)
+
+
+def get_rate_limiter():
+    """Return the limiter configured by ``RATE_LIMIT_URL`` (one per URL per process)."""
+    return _limiter_for_url(getattr(settings, 'RATE_LIMIT_URL', 'memory://'))
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 from decouple import config
+from celery.schedules import crontab
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -44,7 +46,6 @@ INSTALLED_APPS = [
     "rest_framework",
     "rest_framework_simplejwt",
     "corsheaders",
-    "django_ratelimit",
     "django_filters",
     
     # Local apps
@@ -69,12 +70,22 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "track_project.urls"
 
+# Compiled templates are cached per process (and warmed with the email
+# templates at startup, see accounts/email_rendering.py)
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [],
-        "APP_DIRS": True,
         "OPTIONS": {
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
@@ -143,14 +154,33 @@ AUTH_USER_MODEL = 'accounts.CustomUser'
 
 # Authentication Backends
 AUTHENTICATION_BACKENDS = [
+    # Extends ModelBackend, so it also answers permission checks
     'accounts.backends.EmailAuthenticationBackend',
-    'django.contrib.auth.backends.ModelBackend',  # Fallback to default backend
 ]
 
+# Password hashing: PASSWORD_HASHER picks the hasher for new passwords
+# ('pbkdf2', 'argon2' or 'bcrypt'; the last two need argon2-cffi or bcrypt
+# installed). Hashes made by the others are still accepted and upgraded on
+# the next login. PASSWORD_HASH_THREADS caps concurrent hashing per worker
+# process (0 hashes inline, see accounts/hashing.py)
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+}
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='pbkdf2')
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+PASSWORD_HASH_THREADS = config('PASSWORD_HASH_THREADS', default=2, cast=int)
+
 # Django REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -161,6 +191,27 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # Proxies in front of the app (nginx in deployment/setup_vps.sh). Anonymous
+    # requests are throttled by the X-Forwarded-For address this many hops from
+    # the right, which the proxy appended; addresses the client sent are ignored
+    'NUM_PROXIES': config('NUM_PROXIES', default=1, cast=int),
+    # Views opt in with throttle_scope / throttle_scopes
+    'DEFAULT_THROTTLE_CLASSES': [
+        'track_project.throttling.SlidingWindowThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'register': '5/m',
+        'login': '5/m',
+        'token_refresh': '10/m',
+        'password_reset': '3/h',
+        'password_reset_confirm': '5/h',
+        'change_password': '3/h',
+        'project_create': '10/m',
+        'feature_create': '20/m',
+        # Per user on the dashboard/summary reads. Empty disables it, e.g. for
+        # servers under the loadtest_read_endpoints command, which fails on 429s
+        'reads': config('READS_THROTTLE_RATE', default='600/m') or None,
+    },
 }
 
 # JWT Configuration
@@ -185,8 +236,16 @@ SIMPLE_JWT = {
     
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+    
+    # Tokens carry the user's token_version; changing the password revokes
+    # them, rehashing it on login does not (see accounts/tokens.py)
+    'CHECK_REVOKE_TOKEN': True,
 }
 
+# Seconds authenticated users are cached in Redis and in each process
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=300, cast=int)
+AUTH_USER_LOCAL_CACHE_TTL = config('AUTH_USER_LOCAL_CACHE_TTL', default=5, cast=int)
+
 # CORS Configuration for frontend-backend communication
 CORS_ALLOWED_ORIGINS = config(
     "CORS_ALLOWED_ORIGINS", 
@@ -196,6 +255,9 @@ CORS_ALLOWED_ORIGINS = config(
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Let clients send Idempotency-Key on retried POSTs (see track_project/idempotency.py)
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+
 # Security Configuration
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -210,9 +272,10 @@ SESSION_COOKIE_SECURE = config('SESSION_COOKIE_SECURE', default=False, cast=bool
 CSRF_COOKIE_SECURE = config('CSRF_COOKIE_SECURE', default=False, cast=bool)
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 
-# Rate limiting configuration
-RATELIMIT_ENABLE = True
-RATELIMIT_USE_CACHE = 'default'
+# Rate limiting (see track_project/ratelimit.py and throttling.py): shared
+# sliding-window counters in Redis, or memory:// for per-process counters.
+# Rates per endpoint group are REST_FRAMEWORK's DEFAULT_THROTTLE_RATES
+RATE_LIMIT_URL = config('RATE_LIMIT_URL', default=config('REDIS_URL', default='redis://127.0.0.1:6379/1'))
 
 # Cache configuration
 CACHES = {
@@ -227,6 +290,82 @@ CACHES = {
     }
 }
 
+# Celery configuration (background jobs)
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://127.0.0.1:6379/0')
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=False, cast=bool)
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_IGNORE_RESULT = True
+
+# Seconds a running data clear job may go without progress before it is
+# considered abandoned by a dead worker (see accounts.models.DataClearJob)
+DATA_CLEAR_JOB_STALE_SECONDS = config('DATA_CLEAR_JOB_STALE_SECONDS', default=600, cast=int)
+
+# Periodic jobs, run by ``celery -A track_project beat``
+CELERY_BEAT_SCHEDULE = {
+    'deliver-emails': {
+        'task': 'accounts.tasks.deliver_emails',
+        'schedule': 60,
+    },
+    'deadline-reminders': {
+        'task': 'todos.tasks.send_deadline_reminders',
+        'schedule': crontab(minute=0, hour=config('DEADLINE_REMINDER_HOUR', default=7, cast=int)),
+    },
+}
+
+# Serve the read-heavy endpoints with async views (enable when running under
+# ASGI, see start_gunicorn.sh and todos/async_views.py)
+ASYNC_READ_VIEWS = config('ASYNC_READ_VIEWS', default=False, cast=bool)
+
+# Live change events (see track_project/events.py). memory:// keeps events
+# in-process; production needs Redis so WSGI workers can reach the ASGI worker
+EVENT_BUS_URL = config('EVENT_BUS_URL', default=config('REDIS_URL', default='redis://127.0.0.1:6379/1'))
+EVENT_STREAM_MAX_SECONDS = config('EVENT_STREAM_MAX_SECONDS', default=300, cast=int)
+
+# Delta sync (see todos/sync.py): overlap between consecutive sync windows
+# and how long deletions are remembered before clients must fully resync
+SYNC_TOKEN_OVERLAP_SECONDS = config('SYNC_TOKEN_OVERLAP_SECONDS', default=5, cast=int)
+SYNC_TOMBSTONE_RETENTION_DAYS = config('SYNC_TOMBSTONE_RETENTION_DAYS', default=30, cast=int)
+
+# Batched mutations (see todos/batch.py): operations per request and how
+# long idempotency keys are remembered
+BATCH_MAX_OPERATIONS = config('BATCH_MAX_OPERATIONS', default=100, cast=int)
+IDEMPOTENCY_KEY_RETENTION_HOURS = config('IDEMPOTENCY_KEY_RETENTION_HOURS', default=24, cast=int)
+
+# Seconds the Idempotency-Key header replays a POST's first response (see
+# track_project/idempotency.py)
+IDEMPOTENCY_KEY_TTL = config('IDEMPOTENCY_KEY_TTL', default=86400, cast=int)
+
+# Password reset tokens (see accounts/reset_tokens.py): lifetime, and
+# where they are stored: 'database' (rows swept by the sweep_reset_tokens
+# management command) or 'cache' (Redis keys expiring with the token)
+PASSWORD_RESET_TOKEN_HOURS = config('PASSWORD_RESET_TOKEN_HOURS', default=1, cast=int)
+PASSWORD_RESET_TOKEN_STORE = config('PASSWORD_RESET_TOKEN_STORE', default='database')
+
+# Deadline reminder digests (see todos/reminders.py): open tasks overdue by
+# up to DEADLINE_REMINDER_OVERDUE_DAYS or due within
+# DEADLINE_REMINDER_DAYS_AHEAD, tasks read per query, and tasks listed
+# per email
+DEADLINE_REMINDER_DAYS_AHEAD = config('DEADLINE_REMINDER_DAYS_AHEAD', default=1, cast=int)
+DEADLINE_REMINDER_OVERDUE_DAYS = config('DEADLINE_REMINDER_OVERDUE_DAYS', default=7, cast=int)
+DEADLINE_REMINDER_CHUNK_SIZE = config('DEADLINE_REMINDER_CHUNK_SIZE', default=5000, cast=int)
+DEADLINE_DIGEST_MAX_TASKS = config('DEADLINE_DIGEST_MAX_TASKS', default=10, cast=int)
+
+# Seconds a user's project dashboard summary stays cached; project and
+# team changes evict it sooner (see projects/summary.py)
+PROJECT_SUMMARY_CACHE_TIMEOUT = config('PROJECT_SUMMARY_CACHE_TIMEOUT', default=86400, cast=int)
+
+# Seconds a user's accessible project ids stay cached; project and team
+# changes evict them sooner (see projects/access.py)
+PROJECT_ACCESS_CACHE_TIMEOUT = config('PROJECT_ACCESS_CACHE_TIMEOUT', default=86400, cast=int)
+
+# Activity feed: seconds within which repeated updates to the same task or
+# list are merged into one activity (0 disables), and retention (see the
+# prune_activities management command)
+ACTIVITY_COALESCE_WINDOW = config('ACTIVITY_COALESCE_WINDOW', default=300, cast=int)
+ACTIVITY_RETENTION_DAYS = config('ACTIVITY_RETENTION_DAYS', default=90, cast=int)
+ACTIVITY_MAX_PER_USER = config('ACTIVITY_MAX_PER_USER', default=None, cast=lambda v: int(v) if v else None)
+
 # Password validation with enhanced security
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -258,6 +397,12 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@track.com')
 
+# Email outbox (see accounts/outbox.py): emails sent per connection, and
+# retries with the delay doubling from EMAIL_OUTBOX_RETRY_SECONDS
+EMAIL_OUTBOX_BATCH_SIZE = config('EMAIL_OUTBOX_BATCH_SIZE', default=50, cast=int)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_OUTBOX_RETRY_SECONDS = config('EMAIL_OUTBOX_RETRY_SECONDS', default=60, cast=int)
+
 # Logging Configuration
 LOGGING = {
     'version': 1,
@@ -0,0 +1,83 @@
+"""
+DRF throttling on the sliding-window rate limiter (track_project/ratelimit.py).
+
+Views opt in per endpoint group with a scope whose rate is set in
+REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']:
+
+    throttle_scope = 'login'                        # every action of the view
+    throttle_scopes = {'create': 'project_create'}  # per viewset action
+
+Authenticated requests are counted per user, anonymous ones per client
+IP, taken from X-Forwarded-For past REST_FRAMEWORK['NUM_PROXIES'] trusted
+proxies so clients cannot pick their own. Rejections answer 429 with Retry-After, are logged, and are sent as
+the ``request_throttled`` signal for metrics backends to count.
+"""
+
+import logging
+
+from django.core.exceptions import ImproperlyConfigured
+from django.dispatch import Signal
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .ratelimit import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Sent with scope, ident and request (None from async views) on each rejection
+request_throttled = Signal()
+
+_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """Parse a DRF rate such as '5/m' into (requests, seconds)."""
+    num, period = rate.split('/')
+    return int(num), _PERIODS[period[0]]
+
+
+def check_scope(scope, ident, request=None):
+    """
+    Count a request from ``ident`` against the rate of ``scope``.
+
+    Returns:
+        Tuple of (allowed, seconds to wait before retrying)
+    """
+    try:
+        rate = api_settings.DEFAULT_THROTTLE_RATES[scope]
+    except KeyError:
+        raise ImproperlyConfigured(f"No default throttle rate set for '{scope}' scope")
+    if rate is None:
+        return True, 0
+
+    limit, window = parse_rate(rate)
+    allowed, wait = get_rate_limiter().hit(scope, ident, limit, window)
+    if not allowed:
+        logger.info(f'Rate limit exceeded: scope={scope} ident={ident} rate={rate}')
+        request_throttled.send(sender=None, scope=scope, ident=ident, request=request)
+    return allowed, wait
+
+
+def get_throttle_scope(view):
+    """Return the view's throttle scope for the current action, or None."""
+    scopes = getattr(view, 'throttle_scopes', None) or {}
+    return scopes.get(getattr(view, 'action', None), getattr(view, 'throttle_scope', None))
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """Throttle requests by the view's scope; views without one are not limited."""
+
+    def __init__(self):
+        self._wait = None
+
+    def allow_request(self, request, view):
+        scope = get_throttle_scope(view)
+        if scope is None:
+            return True
+        user = getattr(request, 'user', None)
+        ident = f'user:{user.pk}' if user is not None and user.is_authenticated else f'ip:{self.get_ident(request)}'
+        allowed, self._wait = check_scope(scope, ident, request)
+        return allowed
+
+    def wait(self):
+        return self._wait
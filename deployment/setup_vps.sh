@@ -76,6 +76,18 @@ server {
         proxy_buffering off;
     }
 
+    # Server-Sent Events, served by the ASGI worker
+    location /api/events/ {
+        proxy_pass http://127.0.0.1:8001;
+        proxy_http_version 1.1;
+        proxy_set_header Connection '';
+        proxy_set_header Host \$host;
+        proxy_set_header X-Forwarded-For \$proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto \$scheme;
+        proxy_buffering off;
+        proxy_read_timeout 600s;
+    }
+
     # Static files
     location /static/ {
         alias /var/www/track/staticfiles/;
@@ -121,6 +133,18 @@ stdout_logfile_maxbytes=10MB
 stdout_logfile_backups=5
 environment=PATH="/home/trackapp/venv/bin",DJANGO_SETTINGS_MODULE="track_project.settings"
 
+[program:track_events]
+command=/home/trackapp/venv/bin/gunicorn track_project.asgi:application -k uvicorn.workers.UvicornWorker --bind 127.0.0.1:8001
+directory=/home/jimit/production-projects/track/backend
+user=trackapp
+autostart=true
+autorestart=true
+redirect_stderr=true
+stdout_logfile=/var/log/track/events.log
+stdout_logfile_maxbytes=10MB
+stdout_logfile_backups=5
+environment=PATH="/home/trackapp/venv/bin",DJANGO_SETTINGS_MODULE="track_project.settings"
+
 [program:track_celery]
 command=/home/trackapp/venv/bin/celery -A track_project worker -l info
 directory=/home/jimit/production-projects/track/backend
@@ -6,7 +6,13 @@ import ExportModal from '../export/ExportModal';
 import ImportModal from '../export/ImportModal';
 import { useNotifications } from '../../hooks/useNotifications';
 import { useToast } from '../ui/Toast';
-import { todoApiService } from '../../services/todoApi';
+import { todoApiService, DataClearJob } from '../../services/todoApi';
+
+// How often the data clear job is polled, and for how long at most
+const CLEAR_JOB_POLL_INTERVAL_MS = 1000;
+const CLEAR_JOB_POLL_TIMEOUT_MS = 10 * 60 * 1000;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
 
 interface SettingsModalProps {
   isOpen: boolean;
@@ -30,6 +36,15 @@ const SettingsModal: React.FC<SettingsModalProps> = memo(({ isOpen, onClose }) =
   } = useNotifications();
   const { showToast } = useToast();
 
+  const waitForDataClearJob = async (job: DataClearJob): Promise<DataClearJob> => {
+    const deadline = Date.now() + CLEAR_JOB_POLL_TIMEOUT_MS;
+    while ((job.status === 'pending' || job.status === 'running') && Date.now() < deadline) {
+      await sleep(CLEAR_JOB_POLL_INTERVAL_MS);
+      job = (await todoApiService.getDataClearJob(job.job_id)).data;
+    }
+    return job;
+  };
+
   const handleClearData = async () => {
     if (!password.trim()) {
       showToast({
@@ -43,18 +58,34 @@ const SettingsModal: React.FC<SettingsModalProps> = memo(({ isOpen, onClose }) =
     setIsClearing(true);
     try {
       const response = await todoApiService.clearUserData(password);
-      
+      const job = await waitForDataClearJob(response.data);
+
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'The data clearing job failed.');
+      }
+      if (job.status !== 'completed') {
+        showToast({
+          type: 'info',
+          title: 'Still Clearing Data',
+          message: 'Your data is still being cleared in the background. Check back in a few minutes.',
+        });
+        setShowPasswordPrompt(false);
+        setPassword('');
+        return;
+      }
+
+      const counts = job.deleted_counts;
       showToast({
         type: 'success',
         title: 'Data Cleared Successfully',
-        message: `Deleted ${response.data.deleted_counts.todo_lists} todo lists, ${response.data.deleted_counts.tasks} tasks, and ${response.data.deleted_counts.activities} activities.`,
+        message: `Deleted ${counts.todo_lists ?? 0} todo lists, ${counts.tasks ?? 0} tasks, and ${counts.activities ?? 0} activities.`,
       });
       
       setShowPasswordPrompt(false);
       setPassword('');
       onClose();
       
-      // Optionally reload the page to show empty state
+      // Reload the page to show the empty state now that the job has finished
       setTimeout(() => {
         window.location.reload();
       }, 1000);
@@ -64,7 +95,7 @@ const SettingsModal: React.FC<SettingsModalProps> = memo(({ isOpen, onClose }) =
       showToast({
         type: 'error',
         title: 'Failed to Clear Data',
-        message: error.response?.data?.error || 'An error occurred while clearing your data.',
+        message: error.response?.data?.error || error.message || 'An error occurred while clearing your data.',
       });
     } finally {
       setIsClearing(false);
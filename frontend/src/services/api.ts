@@ -577,8 +577,16 @@ class ApiService {
     old_password: string;
     new_password: string;
     new_password_confirm: string;
-  }): Promise<AxiosResponse<{ message: string }>> {
-    return this.client.post<{ message: string }>('/api/auth/change-password/', data);
+  }): Promise<AxiosResponse<{ message: string } & AuthTokens>> {
+    const response = await this.client.post<{ message: string } & AuthTokens>('/api/auth/change-password/', data);
+    // Changing the password revokes the old tokens
+    if (response.data?.access) {
+      this.setTokens({
+        access: response.data.access,
+        refresh: response.data.refresh,
+      });
+    }
+    return response;
   }
 
   // Utility methods
@@ -118,6 +118,16 @@ export interface RecentActivity {
   timestamp: string;
 }
 
+export interface DataClearJob {
+  job_id: string;
+  status: 'pending' | 'running' | 'completed' | 'failed';
+  deleted_counts: Partial<Record<'todo_lists' | 'tasks' | 'activities' | 'workflow_history' | 'projects' | 'features', number>>;
+  error: string | null;
+  started_at: string | null;
+  finished_at: string | null;
+  user_preserved: boolean;
+}
+
 // API Configuration
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8001';
 
@@ -414,21 +424,14 @@ class TodoApiService {
     return this.client.get('/api/todos/health/');
   }
 
-  // User data management
-  async clearUserData(password: string): Promise<AxiosResponse<{
-    message: string;
-    deleted_counts: {
-      todo_lists: number;
-      tasks: number;
-      activities: number;
-      workflow_history: number;
-      projects: number;
-      features: number;
-    };
-    user_preserved: boolean;
-  }>> {
+  // User data management: clearing runs as a background job (202), polled until it finishes
+  async clearUserData(password: string): Promise<AxiosResponse<DataClearJob & { message: string }>> {
     return this.client.post('/api/auth/clear-data/', { password });
   }
+
+  async getDataClearJob(jobId: string): Promise<AxiosResponse<DataClearJob>> {
+    return this.client.get(`/api/auth/clear-data/${jobId}/`);
+  }
 }
 
 export const todoApiService = new TodoApiService();